@@ -1,5 +1,8 @@
-from .func.polling_func import TelegramPollingBot, polling_func
-from .func.webhook_func import webhook_func
-from .func.methods import TelegramBot
+from .func import polling_func, webhook_func
+from .func.polling_func import TelegramPollingBot, TelegramBot
+from .func.webhook_func import WebhookServer
+from .func.host_func import BotHost
+from .func.router_func import CallbackData
+from .func.offload_func import offload, OffloadPool
 
-__all__ = ["polling_func", "webhook_func", "TelegramBot", "TelegramPollingBot"]
+__all__ = ["polling_func", "webhook_func", "TelegramBot", "TelegramPollingBot", "WebhookServer", "BotHost", "CallbackData", "offload", "OffloadPool"]
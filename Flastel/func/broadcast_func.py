@@ -0,0 +1,197 @@
+import time
+import asyncio
+import logging
+import aiohttp
+from .checkpoint_func import OffsetCheckpointer
+from .retry_func import RetryPolicy
+from .limiter_func import SendScheduler, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+class BlockedChats:
+    def __init__(self, path='blocked_chats.txt'):
+        self.path = path
+        self.chats = None
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return {line.strip() for line in f if line.strip()}
+        except OSError:
+            return set()
+
+    def _append(self, chat_id):
+        with open(self.path, 'a') as f:
+            f.write(f"{chat_id}\n")
+
+    async def load(self):
+        if self.chats is None:
+            loop = asyncio.get_running_loop()
+            self.chats = await loop.run_in_executor(None, self._load)
+        return self.chats
+
+    def __contains__(self, chat_id):
+        return self.chats is not None and str(chat_id) in self.chats
+
+    async def add(self, chat_id):
+        chats = await self.load()
+        if str(chat_id) not in chats:
+            chats.add(str(chat_id))
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._append, chat_id)
+
+class BroadcastProgress:
+    def __init__(self, total=None, resumed_from=0):
+        self.total = total
+        self.resumed_from = resumed_from
+        self.sent = 0
+        self.failed = 0
+        self.blocked = 0
+        self.skipped = 0
+        self.started = time.monotonic()
+
+    @property
+    def done(self):
+        return self.sent + self.failed + self.blocked + self.skipped
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        if self.total is None or not self.rate:
+            return None
+        return max(0, self.total - self.resumed_from - self.done) / self.rate
+
+    def __str__(self):
+        eta = f"{self.eta:.0f} с" if self.eta is not None else "?"
+        total = self.total if self.total is not None else "?"
+        return (f"{self.resumed_from + self.done}/{total}: надіслано {self.sent}, заблоковано {self.blocked}, "
+                f"помилок {self.failed}, пропущено {self.skipped} | {self.rate:.1f} повідомлень/с, ETA {eta}")
+
+class Broadcast:
+    def __init__(self, bot, name="broadcast", concurrency=20, store=None, blocked=None,
+                 report_every=10.0, on_progress=None, retries=3, limiter=None):
+        self.bot = bot
+        # Розсилка без ліміту впирається в 429 від Telegram, тож без ліміту бота створюємо власний
+        self.limiter = limiter or bot.limiter or SendScheduler()
+        self.name = name
+        self.concurrency = concurrency
+        # Ключ з id бота: під BotHost кілька ботів ділять одне сховище
+        self.checkpointer = OffsetCheckpointer(store or bot.checkpointer.store,
+                                               key=f"broadcast:{bot.bot_token.split(':')[0]}:{name}",
+                                               interval=5.0, every=100)
+        self.blocked = blocked or BlockedChats()
+        self.report_every = report_every
+        self.on_progress = on_progress
+        self.retries = retries
+        self.progress = None
+
+    async def _chat_ids(self, chat_ids, start):
+        index = 0
+        if hasattr(chat_ids, "__aiter__"):
+            async for chat_id in chat_ids:
+                if index >= start:
+                    yield index, chat_id
+                index += 1
+        else:
+            for chat_id in chat_ids:
+                if index >= start:
+                    yield index, chat_id
+                index += 1
+
+    async def _send(self, method, payload):
+        retry = RetryPolicy(max_delay=30)
+        # Ліміт бота api_request застосовує сам, а власний ліміт розсилки — тут
+        own = self.limiter is not self.bot.limiter
+        chat_id = payload.get("chat_id")
+        throttled = 0
+        while True:
+            if own:
+                await self.limiter.acquire(chat_id)
+            try:
+                status, data = await self.bot.api_request(method, payload)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status, data = None, None
+            retry_after = parse_retry_after(data) if own and status == 429 else None
+            if retry_after is not None and throttled < self.retries:
+                self.limiter.retry_after(chat_id, retry_after)
+                throttled += 1
+                continue
+            if status is not None and status < 500 or retry.attempt >= self.retries:
+                return status
+            await asyncio.sleep(retry.next_delay(status))
+
+    async def _deliver(self, chat_id, method, payload):
+        progress = self.progress
+        if chat_id in self.blocked:
+            progress.skipped += 1
+            return
+        status = await self._send(method, dict(payload, chat_id=chat_id))
+        if status == 200:
+            progress.sent += 1
+        elif status == 403:
+            # Бот заблокований або акаунт видалено — наступного разу пропускаємо
+            progress.blocked += 1
+            await self.blocked.add(chat_id)
+        else:
+            progress.failed += 1
+            logger.warning(f"Розсилка {self.name}: чат {chat_id} — помилка {status}")
+
+    async def _worker(self, source, lock, method, payload):
+        while True:
+            async with lock:
+                try:
+                    index, chat_id = await source.__anext__()
+                except StopAsyncIteration:
+                    return
+                self.checkpointer.begin(index)
+            # Після винятку позиція лишається незавершеною, і перезапуск повторить цей чат
+            await self._deliver(chat_id, method, payload)
+            self.checkpointer.done(index)
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_every)
+            self._emit()
+
+    def _emit(self):
+        logger.info(f"Розсилка {self.name}: {self.progress}")
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+
+    async def run(self, chat_ids, text=None, method="sendMessage", payload=None):
+        payload = dict(payload or {})
+        if text is not None:
+            payload["text"] = text
+        start = await self.checkpointer.load_async()
+        await self.blocked.load()
+        total = len(chat_ids) if hasattr(chat_ids, "__len__") else None
+        self.progress = BroadcastProgress(total=total, resumed_from=start)
+        if start:
+            logger.info(f"Розсилка {self.name}: продовжуємо з позиції {start}")
+
+        source = self._chat_ids(chat_ids, start)
+        lock = asyncio.Lock()
+        self.checkpointer.start()
+        reporter = asyncio.create_task(self._report())
+        workers = [asyncio.ensure_future(self._worker(source, lock, method, payload)) for _ in range(self.concurrency)]
+        completed = False
+        try:
+            await asyncio.gather(*workers)
+            completed = True
+        finally:
+            # Після помилки в одному воркері інші не мають слати далі, коли checkpointer уже закрито
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+            await self.checkpointer.close()
+        if completed:
+            # Позиція потрібна лише перерваній розсилці; нова з тим самим name починає спочатку
+            await self.checkpointer.reset()
+        self._emit()
+        return self.progress
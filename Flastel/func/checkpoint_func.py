@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+def atomic_write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class FileCheckpointStore:
+    def __init__(self, path='last_update_id.json'):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        # Файл замінюється через os.replace, тож flock тримаємо на окремому .lock-файлі.
+        # Без fcntl (Windows) захист лише між потоками — кільком процесам краще SqliteCheckpointStore
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, key='last_update_id'):
+        with self._locked():
+            return self._read().get(key, 0)
+
+    def save(self, key, value):
+        # Читаємо весь файл, щоб не затерти значення інших ботів, зокрема з інших процесів
+        with self._locked():
+            data = self._read()
+            data[key] = value
+            atomic_write_json(self.path, data)
+
+    def close(self):
+        pass
+
+class SqliteCheckpointStore:
+    def __init__(self, path='flastel.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def load(self, key='last_update_id'):
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM checkpoints WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else 0
+
+    def save(self, key, value):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO checkpoints (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class OffsetCheckpointer:
+    def __init__(self, store=None, key='last_update_id', interval=5.0, every=100):
+        self.store = store or FileCheckpointStore()
+        self.key = key
+        self.interval = interval
+        self.every = every
+        self.committed = None
+        self._pending = set()
+        self._highest = None
+        self._since_flush = 0
+        self._flushed_at = time.monotonic()
+        self._flush_task = None
+        self._timer_task = None
+        self._flush_lock = None
+
+    def load(self):
+        value = self.store.load(self.key)
+        self.committed = value
+        return value
+
+    async def load_async(self):
+        loop = asyncio.get_running_loop()
+        value = await loop.run_in_executor(None, self.store.load, self.key)
+        self.committed = value
+        return value
+
+    @property
+    def offset(self):
+        # Наступний offset, до якого всі оновлення вже оброблено
+        if self._pending:
+            return min(self._pending)
+        if self._highest is None:
+            return self.committed
+        return self._highest + 1
+
+    def begin(self, update_id):
+        self._pending.add(update_id)
+        if self._highest is None or update_id > self._highest:
+            self._highest = update_id
+
+    def done(self, update_id):
+        if update_id not in self._pending:
+            return
+        self._pending.discard(update_id)
+        self._since_flush += 1
+        if self._since_flush >= self.every:
+            self.schedule_flush()
+
+    def schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self.flush())
+
+    async def flush(self):
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            offset = self.offset
+            self._since_flush = 0
+            self._flushed_at = time.monotonic()
+            if offset is None or offset == self.committed:
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self.store.save, self.key, offset)
+                self.committed = offset
+            except Exception as e:
+                logger.error(f"Не вдалося зберегти offset {offset}: {e}")
+
+    async def reset(self):
+        # Наступний запуск почнеться з нуля, а не з останнього збереженого offset
+        self._pending.clear()
+        self._highest = None
+        self._since_flush = 0
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.store.save, self.key, 0)
+        self.committed = 0
+
+    async def _timer(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if time.monotonic() - self._flushed_at >= self.interval:
+                await self.flush()
+
+    def start(self):
+        if self._timer_task is None:
+            self._timer_task = asyncio.create_task(self._timer())
+
+    async def close(self):
+        timer, self._timer_task = self._timer_task, None
+        if timer is not None:
+            timer.cancel()
+            await asyncio.gather(timer, return_exceptions=True)
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        await self.flush()
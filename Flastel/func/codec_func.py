@@ -0,0 +1,78 @@
+import json
+from types import SimpleNamespace
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+DECODE_ERRORS = (ValueError, msgspec.DecodeError) if msgspec is not None else (ValueError,)
+
+def to_namespace(obj):
+    if isinstance(obj, dict):
+        return SimpleNamespace(**{key: to_namespace(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return [to_namespace(item) for item in obj]
+    return obj
+
+class StdlibCodec:
+    name = "json"
+
+    def dumps(self, obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self, raw):
+        return json.loads(raw)
+
+    def loads_namespace(self, raw):
+        # object_hook будує SimpleNamespace одразу під час розбору байтів
+        return json.loads(raw, object_hook=lambda d: SimpleNamespace(**d))
+
+class OrjsonCodec(StdlibCodec):
+    name = "orjson"
+
+    def dumps(self, obj):
+        return orjson.dumps(obj)
+
+    def loads(self, raw):
+        return orjson.loads(raw)
+
+    def loads_namespace(self, raw):
+        return to_namespace(orjson.loads(raw))
+
+class MsgspecCodec(StdlibCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj)
+
+    def loads(self, raw):
+        return self._decoder.decode(raw)
+
+    def loads_namespace(self, raw):
+        return to_namespace(self._decoder.decode(raw))
+
+CODECS = {"orjson": OrjsonCodec, "msgspec": MsgspecCodec, "json": StdlibCodec}
+
+def get_codec(name=None):
+    if name is not None:
+        if name == "orjson" and orjson is None or name == "msgspec" and msgspec is None:
+            raise ImportError(f"JSON бекенд {name} не встановлено")
+        return CODECS[name]()
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecCodec()
+    return StdlibCodec()
+
+codec = get_codec()
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+CHAT_UPDATE_TYPES = ("message", "edited_message", "channel_post", "edited_channel_post",
+                     "business_message", "edited_business_message")
+USER_UPDATE_TYPES = ("callback_query", "pre_checkout_query", "shipping_query", "inline_query",
+                     "chosen_inline_result", "poll_answer", "my_chat_member", "chat_member", "chat_join_request")
+
+def update_chat_key(update):
+    for kind in CHAT_UPDATE_TYPES:
+        data = update.get(kind)
+        if data is not None:
+            return data.get("chat", {}).get("id")
+    for kind in USER_UPDATE_TYPES:
+        data = update.get(kind)
+        if data is not None:
+            message = data.get("message")
+            if message and "chat" in message:
+                return message["chat"]["id"]
+            chat = data.get("chat")
+            if chat:
+                return chat.get("id")
+            return data.get("from", data.get("user", {})).get("id")
+    return None
+
+class _Group:
+    __slots__ = ("ready", "pending", "scheduled")
+
+    def __init__(self):
+        self.ready = deque()
+        self.pending = 0
+        self.scheduled = False
+
+class UpdateDispatcher:
+    def __init__(self, workers=8, max_pending=100, group_pending=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        # Ліміт на одну групу (бота), щоб зайнятий бот не забирав усю чергу
+        self.group_pending = group_pending
+        self.pending = 0
+        self._lanes = {}
+        self._groups = {}
+        self._ready = None
+        self._space = None
+        self._idle = None
+        self._tasks = []
+
+    @property
+    def started(self):
+        return bool(self._tasks)
+
+    def start(self):
+        if self._tasks:
+            return
+        self._ready = asyncio.Queue()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    @property
+    def full(self):
+        return self.pending >= self.max_pending
+
+    def has_space(self, group=None):
+        if self.pending >= self.max_pending:
+            return False
+        if self.group_pending is not None:
+            g = self._groups.get(group)
+            if g is not None and g.pending >= self.group_pending:
+                return False
+        return True
+
+    def depth(self, group=None):
+        if group is None:
+            return self.pending
+        g = self._groups.get(group)
+        return g.pending if g is not None else 0
+
+    async def submit(self, key, func, *args, group=None):
+        # Backpressure: чекаємо, доки в черзі не звільниться місце
+        while not self.has_space(group):
+            self._space.clear()
+            await self._space.wait()
+        self._enqueue(key, func, args, group)
+
+    def submit_nowait(self, key, func, *args, group=None):
+        if not self.has_space(group):
+            return False
+        self._enqueue(key, func, args, group)
+        return True
+
+    def _schedule(self, group, g):
+        if not g.scheduled:
+            g.scheduled = True
+            self._ready.put_nowait(group)
+
+    def _enqueue(self, key, func, args, group):
+        if key is None:
+            key = object()
+        g = self._groups.get(group)
+        if g is None:
+            g = self._groups[group] = _Group()
+        g.pending += 1
+        self.pending += 1
+        self._idle.clear()
+        lane_key = (group, key)
+        lane = self._lanes.get(lane_key)
+        if lane is None:
+            self._lanes[lane_key] = deque([(func, args)])
+            g.ready.append(key)
+            self._schedule(group, g)
+        else:
+            lane.append((func, args))
+
+    async def _worker(self):
+        while True:
+            group = await self._ready.get()
+            g = self._groups[group]
+            key = g.ready.popleft()
+            # Групи обслуговуються по колу: по одному оновленню за раз
+            if g.ready:
+                self._ready.put_nowait(group)
+            else:
+                g.scheduled = False
+            lane_key = (group, key)
+            lane = self._lanes[lane_key]
+            func, args = lane.popleft()
+            try:
+                await func(*args)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Помилка в обробнику оновлення: {e}")
+            finally:
+                g.pending -= 1
+                self.pending -= 1
+                self._space.set()
+                if lane:
+                    # Той самий чат — у кінець черги, щоб не блокувати інші чати
+                    g.ready.append(key)
+                    self._schedule(group, g)
+                else:
+                    del self._lanes[lane_key]
+                    if not g.pending:
+                        del self._groups[group]
+                if not self.pending:
+                    self._idle.set()
+
+    async def join(self):
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def close(self, wait=True):
+        if wait:
+            await self.join()
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
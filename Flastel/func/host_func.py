@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from .session_func import SessionManager
+from .dispatch_func import UpdateDispatcher
+from .shard_func import ShardedDispatcher
+from .webhook_func import WebhookServer
+
+logger = logging.getLogger(__name__)
+
+class BotHost:
+    def __init__(self, connector_limit=100, dns_cache_ttl=300, keepalive_timeout=30,
+                 workers=32, max_pending=1000, bot_pending=100, checkpoint_store=None,
+                 webhook_host="0.0.0.0", webhook_port=8080, base_url=None, path_prefix="",
+                 shards=0, shard_target=None):
+        self.connector_limit = connector_limit
+        self.http = SessionManager(connector_limit=connector_limit, dns_cache_ttl=dns_cache_ttl,
+                                   keepalive_timeout=keepalive_timeout)
+        # Один планувальник на всіх: бот отримує воркер по черзі, не більше bot_pending оновлень у черзі
+        if shards:
+            # workers тут — на кожен процес; shard_target вказує на цей BotHost для spawn
+            self.dispatcher = ShardedDispatcher(processes=shards, workers=workers, max_pending=max_pending,
+                                                group_pending=bot_pending, target=shard_target)
+        else:
+            self.dispatcher = UpdateDispatcher(workers=workers, max_pending=max_pending, group_pending=bot_pending)
+        self.checkpoint_store = checkpoint_store
+        self.webhook = WebhookServer(host=webhook_host, port=webhook_port, base_url=base_url, path_prefix=path_prefix)
+        self.polling_bots = []
+        self.webhook_bots = []
+        self._tasks = []
+
+    @property
+    def bots(self):
+        return self.polling_bots + self.webhook_bots
+
+    def _attach(self, bot):
+        bot.host = self
+        bot.http = self.http
+        if isinstance(self.dispatcher, ShardedDispatcher):
+            self.dispatcher.attach(bot)
+        else:
+            bot.dispatcher = self.dispatcher
+        checkpointer = bot.checkpointer
+        if self.checkpoint_store is not None:
+            checkpointer.store = self.checkpoint_store
+        if checkpointer.key == 'last_update_id':
+            # Окремий ключ для кожного бота, щоб offset'и не перетирали один одного
+            checkpointer.key = f"last_update_id:{bot.bot_token.split(':')[0]}"
+        if bot.scheduler.prefix == "timer:":
+            bot.scheduler.prefix = f"timer:{bot.bot_token.split(':')[0]}:"
+        return bot
+
+    def add_polling(self, bot):
+        self.polling_bots.append(self._attach(bot))
+        return bot
+
+    def add_webhook(self, bot, secret_token=None):
+        self.webhook_bots.append(self._attach(bot))
+        return self.webhook.register(bot, secret_token)
+
+    async def start(self):
+        # Кожен long-poll тримає з'єднання, тож пул має вмістити їх усі плюс відправку
+        self.http.connector_limit = max(self.connector_limit, 2 * len(self.polling_bots) + 10)
+        # Процеси-шарди форкаються до відкриття сесії, щоб не успадкувати її з'єднання
+        self.dispatcher.start()
+        await self.http.open()
+        for bot in self.polling_bots:
+            await bot.startup()
+            bot.checkpointer.start()
+            self._tasks.append(asyncio.create_task(self._poll(bot)))
+        if self.webhook_bots:
+            await self.webhook.start()
+        logger.info(f"BotHost: {len(self.polling_bots)} polling, {len(self.webhook_bots)} webhook ботів")
+
+    async def _poll(self, bot):
+        try:
+            await bot._polling_loop()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"BotHost: polling бота зупинився: {e}")
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for bot in self.polling_bots:
+            bot.stop()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.webhook_bots:
+            await self.webhook.stop()
+        await self.dispatcher.join()
+        for bot in self.polling_bots:
+            await bot.shutdown()
+        await self.dispatcher.close(wait=False)
+        await self.http.close()
+
+    async def run(self):
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("block", "drop_oldest", "coalesce")
+
+def is_payment(update):
+    if "pre_checkout_query" in update:
+        return True
+    message = update.get("message")
+    return message is not None and "successful_payment" in message
+
+def callback_key(update):
+    # Повторне натискання тієї ж кнопки тим самим користувачем
+    query = update.get("callback_query")
+    if query is None:
+        return None
+    message = query.get("message") or {}
+    return (query.get("from", {}).get("id"), message.get("message_id", query.get("inline_message_id")), query.get("data"))
+
+class IngestQueue:
+    def __init__(self, maxsize=1000, policy="block", on_drop=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Невідома політика черги: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.on_drop = on_drop
+        self.dropped = 0
+        self.coalesced = 0
+        self._items = deque()
+        self._callbacks = {}
+        # Як у asyncio.Queue: join() чекає, доки кожне взяте оновлення не передадуть далі
+        self._unfinished = 0
+        # Події створюються вже в циклі подій: на Python 3.7–3.9 вони прив'язуються до циклу при створенні
+        self._not_empty = None
+        self._not_full = None
+        self._finished = None
+
+    def _events(self):
+        if self._not_empty is None:
+            self._not_empty = asyncio.Event()
+            self._not_full = asyncio.Event()
+            self._finished = asyncio.Event()
+            if self._items:
+                self._not_empty.set()
+            if not self.full():
+                self._not_full.set()
+            if not self._unfinished:
+                self._finished.set()
+
+    def qsize(self):
+        return len(self._items)
+
+    def full(self):
+        return len(self._items) >= self.maxsize
+
+    def _drop(self, update, reason):
+        self.dropped += 1
+        if self.on_drop is not None:
+            self.on_drop(update, reason)
+
+    def _drop_oldest(self):
+        # Платежі ніколи не відкидаються: шукаємо найстаріше звичайне оновлення
+        for index, update in enumerate(self._items):
+            if not is_payment(update):
+                del self._items[index]
+                self._forget(update)
+                self._drop(update, "drop_oldest")
+                self.task_done()
+                return True
+        return False
+
+    def _forget(self, update):
+        key = callback_key(update)
+        if key is not None and self._callbacks.get(key) is update:
+            del self._callbacks[key]
+
+    async def put(self, update):
+        self._events()
+        if self.policy == "coalesce":
+            key = callback_key(update)
+            if key is not None:
+                if key in self._callbacks:
+                    # Таке саме натискання вже чекає в черзі — друге не потрібне
+                    self.coalesced += 1
+                    self._drop(update, "coalesce")
+                    return False
+                self._callbacks[key] = update
+        while self.full():
+            if self.policy == "drop_oldest" and self._drop_oldest():
+                break
+            self._not_full.clear()
+            await self._not_full.wait()
+        self._items.append(update)
+        self._unfinished += 1
+        self._finished.clear()
+        self._not_empty.set()
+        return True
+
+    async def get(self):
+        self._events()
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        update = self._items.popleft()
+        self._forget(update)
+        self._not_full.set()
+        return update
+
+    def task_done(self):
+        self._unfinished -= 1
+        if not self._unfinished and self._finished is not None:
+            self._finished.set()
+
+    async def join(self):
+        self._events()
+        await self._finished.wait()
@@ -0,0 +1,131 @@
+import time
+import asyncio
+import logging
+from .metrics_func import registry
+
+logger = logging.getLogger(__name__)
+
+# Методи, які Telegram лімітує як надсилання повідомлень у чат
+SEND_METHODS = frozenset({
+    "sendMessage", "forwardMessage", "copyMessage", "sendPhoto", "sendAudio", "sendDocument",
+    "sendVideo", "sendAnimation", "sendVoice", "sendVideoNote", "sendMediaGroup", "sendLocation",
+    "sendVenue", "sendContact", "sendPoll", "sendDice", "sendSticker", "sendInvoice", "sendGame",
+})
+
+def parse_retry_after(data):
+    if isinstance(data, dict):
+        return (data.get("parameters") or {}).get("retry_after")
+    return getattr(getattr(data, "parameters", None), "retry_after", None)
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, now=None):
+        # Резервує токен і повертає, скільки секунд чекати до нього
+        now = time.monotonic() if now is None else now
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        self.tokens -= 1
+        wait = self.updated - now
+        if self.tokens < 0:
+            wait += -self.tokens / self.rate
+        return wait
+
+    def block(self, seconds, now=None):
+        now = time.monotonic() if now is None else now
+        until = now + seconds
+        if until > self.updated:
+            self.updated = until
+            self.tokens = min(self.tokens, 0)
+
+    def idle(self, now):
+        return now > self.updated and self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+class SendScheduler:
+    def __init__(self, global_rate=30, private_rate=1, group_rate=20 / 60, max_buckets=10000):
+        self.global_bucket = TokenBucket(global_rate)
+        self.private_rate = private_rate
+        self.group_rate = group_rate
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.waiting = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def bucket(self, chat_id):
+        bucket = self.buckets.get(chat_id)
+        if bucket is None:
+            if len(self.buckets) >= self.max_buckets:
+                self._prune()
+            # Від'ємний id — група або канал, додатний — приватний чат
+            rate = self.group_rate if str(chat_id).startswith(("-", "@")) else self.private_rate
+            bucket = self.buckets[chat_id] = TokenBucket(rate)
+        return bucket
+
+    def _prune(self):
+        now = time.monotonic()
+        for chat_id in [chat_id for chat_id, bucket in self.buckets.items() if bucket.idle(now)]:
+            del self.buckets[chat_id]
+
+    async def acquire(self, chat_id=None):
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            # Спершу чекаємо на чат, щоб не тримати глобальний токен під час паузи
+            if chat_id is not None:
+                wait = self.bucket(chat_id).reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            wait = self.global_bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        if waited > self.max_wait:
+            self.max_wait = waited
+        return waited
+
+    def retry_after(self, chat_id, seconds):
+        # 429 стосується лише цього чату; решта розсилки триває
+        self.throttled += 1
+        if chat_id is None:
+            self.global_bucket.block(seconds)
+        else:
+            self.bucket(chat_id).block(seconds)
+        logger.warning(f"429 для чату {chat_id}: пауза {seconds} с")
+
+    def export(self, bot_id, registry=registry):
+        # Лічильники читаються лише під час scrape, acquire() їх не чіпає
+        registry.gauge("flastel_limiter_waiting", "Відправки, що чекають ліміту", ("bot",)).set_function(
+            lambda: self.waiting, bot=bot_id)
+        registry.counter("flastel_limiter_acquired_total", "Відправки, що пройшли ліміт", ("bot",)).set_function(
+            lambda: self.acquired, bot=bot_id)
+        registry.counter("flastel_limiter_throttled_total", "Відповіді 429 від Bot API", ("bot",)).set_function(
+            lambda: self.throttled, bot=bot_id)
+        registry.counter("flastel_limiter_wait_seconds_total", "Сумарне очікування ліміту", ("bot",)).set_function(
+            lambda: self.total_wait, bot=bot_id)
+        registry.gauge("flastel_limiter_wait_seconds_max", "Найдовше очікування ліміту", ("bot",)).set_function(
+            lambda: self.max_wait, bot=bot_id)
+
+    def metrics(self):
+        return {
+            "queue_depth": self.waiting,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_seconds_total": self.total_wait,
+            "wait_seconds_max": self.max_wait,
+            "wait_seconds_avg": self.total_wait / self.acquired if self.acquired else 0.0,
+            "buckets": len(self.buckets),
+        }
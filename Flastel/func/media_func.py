@@ -0,0 +1,176 @@
+import os
+import json
+import atexit
+import asyncio
+import hashlib
+import logging
+import aiohttp
+from collections import OrderedDict
+from types import SimpleNamespace
+from .codec_func import codec, JSON_HEADERS
+from .checkpoint_func import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+async def read_chunks(path, chunk_size=CHUNK_SIZE):
+    # Файл читається шматками в executor'і, цикл подій не блокується
+    loop = asyncio.get_running_loop()
+    f = await loop.run_in_executor(None, open, path, 'rb')
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, f.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await loop.run_in_executor(None, f.close)
+
+def hash_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def extract_file_id(result, field):
+    media = getattr(result, field, None)
+    if isinstance(media, list):
+        # Для фото Telegram повертає кілька розмірів; найбільший — останній
+        media = media[-1] if media else None
+    return getattr(media, "file_id", None)
+
+class FileIdCache:
+    def __init__(self, path='file_id_cache.json', max_entries=10000, save_delay=1.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        self.entries = None
+        self._digests = {}
+        self._save_handle = None
+        self._save_task = None
+        self._dirty = False
+        self._at_exit = False
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return OrderedDict(json.load(f))
+        except (OSError, ValueError):
+            return OrderedDict()
+
+    async def load(self):
+        if self.entries is None:
+            loop = asyncio.get_running_loop()
+            self.entries = await loop.run_in_executor(None, self._load)
+        return self.entries
+
+    async def digest(self, path):
+        # Хеш рахуємо заново лише якщо файл змінився (розмір/mtime)
+        loop = asyncio.get_running_loop()
+        stat = await loop.run_in_executor(None, os.stat, path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        digest = await loop.run_in_executor(None, hash_file, path)
+        self._digests[path] = (signature, digest)
+        return digest
+
+    async def get(self, key):
+        entries = await self.load()
+        file_id = entries.get(key)
+        if file_id is not None:
+            entries.move_to_end(key)
+        return file_id
+
+    async def put(self, key, file_id):
+        entries = await self.load()
+        entries[key] = file_id
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        self.schedule_save()
+
+    async def discard(self, key):
+        entries = await self.load()
+        if entries.pop(key, None) is not None:
+            self.schedule_save()
+
+    def schedule_save(self):
+        self._dirty = True
+        if not self._at_exit:
+            # Якщо цикл подій зупинять без flush(), відкладений запис не виконається
+            self._at_exit = True
+            atexit.register(self._flush_at_exit)
+        if self._save_handle is None:
+            loop = asyncio.get_running_loop()
+            self._save_handle = loop.call_later(self.save_delay, self._start_save)
+
+    def _start_save(self):
+        self._save_handle = None
+        self._save_task = asyncio.ensure_future(self.save())
+
+    async def save(self):
+        if self.entries is None:
+            return
+        self._dirty = False
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, atomic_write_json, self.path, list(self.entries.items()))
+        except OSError as e:
+            self._dirty = True
+            logger.error(f"Не вдалося зберегти кеш file_id: {e}")
+
+    async def flush(self):
+        # Записує зміни одразу, не чекаючи save_delay; викликається при зупинці
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._save_task is not None:
+            await asyncio.gather(self._save_task, return_exceptions=True)
+            self._save_task = None
+        if self._dirty:
+            await self.save()
+
+    def _flush_at_exit(self):
+        if not self._dirty or self.entries is None:
+            return
+        try:
+            atomic_write_json(self.path, list(self.entries.items()))
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Не вдалося зберегти кеш file_id: {e}")
+
+def _form_value(value):
+    return value if isinstance(value, str) else codec.dumps(value).decode()
+
+async def send_media(session, url, field, path, fields, cache=None, cache_prefix=""):
+    key = None
+    if cache is not None:
+        # file_id дійсний лише для бота, який його отримав
+        key = f"{cache_prefix}:{field}:{await cache.digest(path)}"
+        file_id = await cache.get(key)
+        if file_id is not None:
+            # Файл уже є на серверах Telegram — надсилаємо лише file_id
+            payload = {name: value for name, value in fields.items() if value is not None}
+            payload[field] = file_id
+            async with session.post(url, data=codec.dumps(payload), headers=JSON_HEADERS) as response:
+                if response.status != 400:
+                    return response.status, codec.loads_namespace(await response.read())
+            logger.warning(f"file_id для {path} більше не дійсний, завантажуємо файл повторно")
+            await cache.discard(key)
+
+    form = aiohttp.FormData()
+    for name, value in fields.items():
+        if value is not None:
+            form.add_field(name, _form_value(value))
+    form.add_field(field, read_chunks(path), filename=os.path.basename(path))
+    async with session.post(url, data=form) as response:
+        data = codec.loads_namespace(await response.read())
+        if response.status == 200 and key is not None:
+            file_id = extract_file_id(getattr(data, "result", SimpleNamespace()), field)
+            if file_id:
+                await cache.put(key, file_id)
+        return response.status, data
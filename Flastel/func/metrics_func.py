@@ -0,0 +1,273 @@
+import os
+import time
+import bisect
+import asyncio
+import logging
+import psutil
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help="", labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = {}
+        self.functions = {}
+
+    def _key(self, labels):
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name}: очікуються мітки {self.labels}")
+        return tuple(labels[name] for name in self.labels)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def set_function(self, func, **labels):
+        # Значення рахується лише під час scrape, а не на кожному оновленні
+        self.functions[self._key(labels)] = func
+
+    def samples(self):
+        for key, value in self.values.items():
+            yield self.name + _format_labels(self.labels, key), value
+        for key, func in list(self.functions.items()):
+            try:
+                value = func()
+            except Exception as e:
+                logger.error(f"Не вдалося обчислити {self.name}: {e}")
+                continue
+            yield self.name + _format_labels(self.labels, key), value
+
+    def render(self):
+        lines = self.header()
+        lines.extend(f"{name} {_format_value(value)}" for name, value in self.samples())
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, value=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + value
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self.values[self._key(labels)] = value
+
+    def remove(self, **labels):
+        key = self._key(labels)
+        self.values.pop(key, None)
+        self.functions.pop(key, None)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help="", labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        series = self.values.get(key)
+        if series is None:
+            # [лічильники по кошиках..., +Inf], сума
+            series = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self):
+        lines = self.header()
+        bounds = self.buckets + (float("inf"),)
+        for key, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(self.labels, key, (("le", _format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+
+    def _get(self, cls, name, help, labels, **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, help, labels, **kwargs)
+        elif not isinstance(metric, cls) or metric.labels != tuple(labels):
+            raise ValueError(f"Метрика {name} вже зареєстрована з іншим типом або мітками")
+        return metric
+
+    def counter(self, name, help="", labels=()):
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name, help="", labels=()):
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name, help="", labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+class LoopLagMonitor:
+    def __init__(self, registry=registry, interval=0.25):
+        self.interval = interval
+        self.lag = registry.gauge("flastel_event_loop_lag_last_seconds", "Остання затримка циклу подій")
+        self.histogram = registry.histogram("flastel_event_loop_lag_seconds", "Розподіл затримки циклу подій")
+        self.users = 0
+        self.beat = time.monotonic()
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            # beat читає watchdog з іншого потоку
+            self.beat = time.monotonic()
+            self.lag.set(lag)
+            self.histogram.observe(lag)
+
+    def start(self):
+        self.users += 1
+        if self._task is None:
+            self.beat = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self.users -= 1
+        if self.users > 0:
+            return
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+_lag_monitor = None
+
+def get_lag_monitor():
+    global _lag_monitor
+    if _lag_monitor is None:
+        _lag_monitor = LoopLagMonitor(registry)
+    return _lag_monitor
+
+class MetricsServer:
+    def __init__(self, registry=registry, host="127.0.0.1", port=9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.users = 0
+        self.monitor = get_lag_monitor()
+        self._runner = None
+        process = psutil.Process(os.getpid())
+        registry.gauge("flastel_process_rss_bytes", "Резидентна пам'ять процесу").set_function(
+            lambda: process.memory_info().rss)
+        registry.gauge("flastel_process_uptime_seconds", "Час роботи процесу").set_function(
+            lambda: time.time() - process.create_time())
+
+    async def handle_metrics(self, request):
+        return web.Response(text=self.registry.render(), content_type="text/plain",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    async def start(self):
+        self.users += 1
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError as e:
+            # Порт уже зайнятий, напр. іншим процесом з ботом; бот працює далі без /metrics
+            logger.error(f"Не вдалося відкрити метрики на {self.host}:{self.port}: {e}; змініть metrics_port")
+            await runner.cleanup()
+            return
+        self._runner = runner
+        self.monitor.start()
+        logger.info(f"Метрики доступні на http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        self.users -= 1
+        if self.users > 0 or self._runner is None:
+            return
+        await self.monitor.stop()
+        runner, self._runner = self._runner, None
+        await runner.cleanup()
+
+_servers = {}
+
+def get_server(host="127.0.0.1", port=9108):
+    # Кілька ботів в одному процесі ділять один порт метрик
+    server = _servers.get((host, port))
+    if server is None:
+        server = _servers[(host, port)] = MetricsServer(registry, host, port)
+    return server
+
+class BotMetrics:
+    def __init__(self, bot_id, registry=registry):
+        self.bot_id = bot_id
+        self.updates = registry.counter("flastel_updates_total", "Отримані оновлення", ("bot", "type"))
+        self.errors = registry.counter("flastel_errors_total", "Помилки", ("bot", "kind"))
+        self.handler_seconds = registry.histogram("flastel_handler_seconds", "Час виконання обробників",
+                                                  ("bot", "handler"))
+        self.api_seconds = registry.histogram("flastel_api_request_seconds", "Час запитів до Bot API",
+                                              ("bot", "method"))
+        self.api_responses = registry.counter("flastel_api_responses_total", "Відповіді Bot API",
+                                              ("bot", "method", "status"))
+        self.queue_depth = registry.gauge("flastel_queue_depth", "Оновлення в черзі диспетчера", ("bot",))
+        self.ingest_depth = registry.gauge("flastel_ingest_depth", "Оновлення в черзі прийому", ("bot",))
+        self.dropped = registry.counter("flastel_updates_dropped_total", "Відкинуті оновлення", ("bot", "reason"))
+
+    def update(self, kind):
+        self.updates.inc(bot=self.bot_id, type=kind)
+
+    def drop(self, reason):
+        self.dropped.inc(bot=self.bot_id, reason=reason)
+
+    def error(self, kind):
+        self.errors.inc(bot=self.bot_id, kind=kind)
+
+    def handler(self, name, seconds):
+        self.handler_seconds.observe(seconds, bot=self.bot_id, handler=name)
+
+    def api(self, method, status, seconds):
+        self.api_seconds.observe(seconds, bot=self.bot_id, method=method)
+        self.api_responses.inc(bot=self.bot_id, method=method, status=status)
+
+    def watch_queue(self, func):
+        self.queue_depth.set_function(func, bot=self.bot_id)
+
+    def watch_ingest(self, func):
+        self.ingest_depth.set_function(func, bot=self.bot_id)
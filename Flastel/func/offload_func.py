@@ -0,0 +1,167 @@
+import os
+import time
+import asyncio
+import inspect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .metrics_func import registry
+
+logger = logging.getLogger(__name__)
+
+class OffloadSpec:
+    __slots__ = ("pool", "limit", "timeout", "semaphore")
+
+    def __init__(self, process=False, limit=None, timeout=None):
+        self.pool = "process" if process else "thread"
+        self.limit = limit
+        self.timeout = timeout
+        # Семафор створюється вже в циклі подій, при першому виклику
+        self.semaphore = None
+
+def offload(func=None, process=False, limit=None, timeout=None):
+    # @offload або @offload(process=True, limit=2, timeout=10) під декоратором бота
+    def mark(func):
+        func._offload = OffloadSpec(process, limit, timeout)
+        return func
+    return mark(func) if func is not None else mark
+
+def is_async(func):
+    # Декоратор з functools.wraps ховає корутинну функцію за синхронною обгорткою
+    try:
+        func = inspect.unwrap(func)
+    except ValueError:
+        pass
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, "__call__", None))
+
+def _run_timed(func, args, submitted):
+    # Виконується в потоці чи процесі пулу; повертає ще й час очікування в черзі
+    return time.time() - submitted, func(*args)
+
+class OffloadPool:
+    def __init__(self, threads=None, processes=None, registry=registry):
+        self.threads = threads or min(32, (os.cpu_count() or 1) + 4)
+        self.processes = processes or os.cpu_count() or 1
+        self.users = 0
+        self.in_flight = {"thread": 0, "process": 0}
+        self._executors = {}
+        self._specs = {}
+        self._lock = threading.Lock()
+        self.workers = registry.gauge("flastel_offload_workers", "Розмір пулу для блокуючих обробників", ("pool",))
+        self.busy = registry.gauge("flastel_offload_in_flight", "Завдання в пулі: виконуються або чекають", ("pool",))
+        self.queued = registry.gauge("flastel_offload_queued", "Завдання, яким не вистачило вільного воркера", ("pool",))
+        self.wait_seconds = registry.histogram("flastel_offload_wait_seconds", "Очікування вільного воркера в пулі",
+                                               ("pool",))
+        self.timeouts = registry.counter("flastel_offload_timeouts_total", "Блокуючі обробники, що не вклалися в timeout",
+                                         ("handler",))
+        for pool, size in (("thread", self.threads), ("process", self.processes)):
+            self.workers.set(size, pool=pool)
+            self.busy.set_function(lambda pool=pool: self.in_flight[pool], pool=pool)
+            self.queued.set_function(lambda pool=pool, size=size: max(0, self.in_flight[pool] - size), pool=pool)
+
+    def spec(self, func):
+        # Звичайна (не async) функція — блокуюча, навіть якщо її не позначили @offload
+        try:
+            return self._specs[func]
+        except KeyError:
+            pass
+        except TypeError:
+            return getattr(func, "_offload", None)
+        spec = getattr(func, "_offload", None)
+        if spec is None and not is_async(func):
+            spec = OffloadSpec()
+        self._specs[func] = spec
+        return spec
+
+    def _executor(self, pool):
+        executor = self._executors.get(pool)
+        if executor is None:
+            with self._lock:
+                executor = self._executors.get(pool)
+                if executor is None:
+                    if pool == "process":
+                        executor = ProcessPoolExecutor(max_workers=self.processes)
+                    else:
+                        executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="flastel-offload")
+                    self._executors[pool] = executor
+        return executor
+
+    def _threadsafe(self, loop, callback, *args):
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Цикл подій уже закрито: обробник після timeout завершився під час зупинки
+            pass
+
+    def _release(self, pool):
+        self.in_flight[pool] -= 1
+
+    async def run(self, func, *args, process=False, timeout=None, name=None):
+        return await self.call(func, args, OffloadSpec(process, None, timeout), name)
+
+    async def _execute(self, func, args, spec, state):
+        if is_async(func):
+            # async-обробник лише обмежуємо лімітом і timeout, у потік його переносити нема сенсу
+            result = func(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        loop = asyncio.get_running_loop()
+        pool = spec.pool
+        future = self._executor(pool).submit(_run_timed, func, args, time.time())
+        state.append(future)
+        self.in_flight[pool] += 1
+        future.add_done_callback(lambda _: self._threadsafe(loop, self._release, pool))
+        waited, result = await asyncio.wrap_future(future)
+        self.wait_seconds.observe(waited, pool=pool)
+        if inspect.isawaitable(result):
+            # Синхронний обробник може повернути корутину, наприклад bot.send_message(...)
+            result = await result
+        return result
+
+    async def call(self, func, args, spec, name=None):
+        loop = asyncio.get_running_loop()
+        semaphore = None
+        if spec.limit is not None:
+            if spec.semaphore is None:
+                spec.semaphore = asyncio.Semaphore(spec.limit)
+            semaphore = spec.semaphore
+            await semaphore.acquire()
+        state = []
+        try:
+            # Ліміт і timeout охоплюють увесь виклик, разом із поверненою корутиною
+            return await asyncio.wait_for(self._execute(func, args, spec, state), spec.timeout)
+        except asyncio.TimeoutError:
+            name = name or getattr(func, "__qualname__", "unknown")
+            self.timeouts.inc(handler=name)
+            busy = state and not state[0].done()
+            logger.warning(f"Обробник {name} не вклався в {spec.timeout} с"
+                           + (f"; {'потік' if spec.pool == 'thread' else 'процес'} пулу ще зайнятий" if busy else ""))
+            raise
+        finally:
+            if semaphore is not None:
+                if state and not state[0].done():
+                    # Місце в ліміті звільняється, коли пул справді завершив роботу, а не коли минув timeout
+                    state[0].add_done_callback(lambda _: self._threadsafe(loop, semaphore.release))
+                else:
+                    semaphore.release()
+
+    def start(self):
+        self.users += 1
+
+    async def stop(self):
+        self.users -= 1
+        if self.users > 0:
+            return
+        executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            # Не чекаємо: завислий після timeout обробник не має блокувати зупинку
+            executor.shutdown(wait=False)
+
+_pool = None
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = OffloadPool(registry=registry)
+    return _pool
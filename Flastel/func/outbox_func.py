@@ -0,0 +1,245 @@
+import time
+import uuid
+import random
+import asyncio
+import sqlite3
+import logging
+import threading
+import aiohttp
+from .codec_func import codec
+
+logger = logging.getLogger(__name__)
+
+class SqliteOutbox:
+    def __init__(self, path='outbox.db', workers=4, commit_delay=0.01, max_attempts=10,
+                 base_delay=1.0, max_delay=300.0, batch=100, poll_interval=None):
+        self.path = path
+        self.workers = workers
+        self.commit_delay = commit_delay
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch = batch
+        # Записи з інших процесів не будять loader, тож за потреби перевіряємо базу періодично
+        self.poll_interval = poll_interval
+        self.bots = {}
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._ops = []
+        self._commit_task = None
+        self._queue = None
+        self._wakeup = None
+        self._in_flight = set()
+        self._tasks = []
+        self._users = 0
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL: коміт не чекає fsync на кожну транзакцію, але база не ламається після збою
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, bot TEXT NOT NULL, "
+                "method TEXT NOT NULL, chat_id TEXT, payload BLOB NOT NULL, status TEXT NOT NULL DEFAULT 'pending', "
+                "attempts INTEGER NOT NULL DEFAULT 0, next_at REAL NOT NULL, error TEXT, created REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_chat ON outbox (chat_id, status, id)")
+            self._conn.commit()
+        return self._conn
+
+    def _execute_batch(self, ops):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for sql, params in ops:
+                    conn.execute(sql, params)
+
+    def _fetch_due(self, now, limit, skip):
+        with self._lock:
+            # Лише перший недоставлений запис кожного чату: порядок зберігається навіть після повторів
+            rows = self._connect().execute(
+                "SELECT id, key, bot, method, chat_id, payload, attempts FROM outbox AS o "
+                "WHERE status = 'pending' AND next_at <= ? AND (chat_id IS NULL OR NOT EXISTS ("
+                "SELECT 1 FROM outbox AS p WHERE p.chat_id = o.chat_id AND p.status = 'pending' AND p.id < o.id)) "
+                "ORDER BY id LIMIT ?",
+                (now, limit + len(skip)),
+            ).fetchall()
+        return [row for row in rows if row[0] not in skip][:limit]
+
+    def _next_due(self, skip):
+        # Лише голови чатів, які ще не в роботі: решта стане доступною, коли воркер розбудить loader
+        skip = sorted(skip)
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT MIN(next_at) FROM outbox AS o "
+                f"WHERE status = 'pending' AND id NOT IN ({', '.join('?' * len(skip))}) "
+                "AND (chat_id IS NULL OR NOT EXISTS ("
+                "SELECT 1 FROM outbox AS p WHERE p.chat_id = o.chat_id AND p.status = 'pending' AND p.id < o.id))",
+                skip,
+            ).fetchone()
+        return row[0]
+
+    def _write(self, sql, params):
+        # Групова фіксація: усі записи за commit_delay потрапляють в одну транзакцію
+        future = asyncio.get_running_loop().create_future()
+        self._ops.append((sql, params, future))
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.ensure_future(self._commit())
+        return future
+
+    async def _commit(self):
+        loop = asyncio.get_running_loop()
+        while self._ops:
+            if self.commit_delay:
+                await asyncio.sleep(self.commit_delay)
+            ops, self._ops = self._ops, []
+            try:
+                await loop.run_in_executor(None, self._execute_batch, [(sql, params) for sql, params, _ in ops])
+            except Exception as e:
+                logger.error(f"Outbox: не вдалося записати {len(ops)} змін: {e}")
+                for _, _, future in ops:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for _, _, future in ops:
+                if not future.done():
+                    future.set_result(None)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    async def enqueue(self, bot, method, payload, key=None):
+        # Повертається, щойно запис збережено на диск; надсилання — у фоні
+        key = key or uuid.uuid4().hex
+        bot_id = bot.bot_token.split(':')[0]
+        self.bots.setdefault(bot_id, bot)
+        chat_id = payload.get("chat_id")
+        now = time.time()
+        await self._write(
+            "INSERT OR IGNORE INTO outbox (key, bot, method, chat_id, payload, next_at, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, bot_id, method, None if chat_id is None else str(chat_id), codec.dumps(payload), now, now),
+        )
+        return key
+
+    def _backoff(self, attempts):
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return random.uniform(delay / 2, delay)
+
+    async def _loader(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            rows = await loop.run_in_executor(None, self._fetch_due, time.time(), self.batch, set(self._in_flight))
+            queued = 0
+            for row in rows:
+                self._in_flight.add(row[0])
+                await self._queue.put(row)
+                queued += 1
+            if queued:
+                continue
+            next_due = await loop.run_in_executor(None, self._next_due, set(self._in_flight))
+            timeout = max(0.0, next_due - time.time()) if next_due is not None else None
+            if self.poll_interval is not None:
+                timeout = self.poll_interval if timeout is None else min(timeout, self.poll_interval)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self):
+        while True:
+            row = await self._queue.get()
+            try:
+                await self._deliver(row)
+            except Exception as e:
+                logger.exception(f"Outbox: помилка доставки: {e}")
+            finally:
+                self._in_flight.discard(row[0])
+                self._wakeup.set()
+
+    async def _deliver(self, row):
+        row_id, key, bot_id, method, chat_id, payload, attempts = row
+        bot = self.bots.get(bot_id)
+        if bot is None:
+            # Бот цього запису ще не запущений — спробуємо пізніше
+            await self._write("UPDATE outbox SET next_at = ? WHERE id = ?", (time.time() + self.base_delay, row_id))
+            return
+        try:
+            status, data = await bot.api_request(method, codec.loads(payload))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status, data = None, str(e)
+        if status == 200:
+            self.sent += 1
+            await self._write("DELETE FROM outbox WHERE id = ?", (row_id,))
+            return
+        attempts += 1
+        error = data.get("description") if isinstance(data, dict) else str(data)
+        permanent = status is not None and 400 <= status < 500 and status != 429
+        if permanent or attempts >= self.max_attempts:
+            # Мертва черга: запис лишається в базі для розбору
+            self.failed += 1
+            logger.error(f"Outbox: {method} ({key}) не доставлено: {status} {error}")
+            await self._write("UPDATE outbox SET status = 'failed', attempts = ?, error = ? WHERE id = ?",
+                              (attempts, error, row_id))
+            return
+        self.retried += 1
+        await self._write("UPDATE outbox SET attempts = ?, next_at = ?, error = ? WHERE id = ?",
+                          (attempts, time.time() + self._backoff(attempts), error, row_id))
+
+    def after_fork(self):
+        # У дочірньому процесі: власне з'єднання, без успадкованих задач і блокувань
+        self._lock = threading.Lock()
+        self._conn = None
+        self._ops = []
+        self._commit_task = None
+        self._queue = None
+        self._wakeup = None
+        self._in_flight = set()
+        self._tasks = []
+        self._users = 0
+
+    def register(self, bot):
+        self.bots[bot.bot_token.split(':')[0]] = bot
+
+    def start(self, bot=None):
+        if bot is not None:
+            self.register(bot)
+        self._users += 1
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.workers)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._loader())]
+        self._tasks.extend(asyncio.create_task(self._worker()) for _ in range(self.workers))
+
+    async def stop(self):
+        self._users -= 1
+        if self._users > 0:
+            return
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Недоставлене лишається в базі й буде надіслане після рестарту
+        if self._commit_task is not None:
+            await asyncio.gather(self._commit_task, return_exceptions=True)
+        self._in_flight.clear()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self):
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = dict(rows)
+        return {"pending": counts.get("pending", 0), "failed": counts.get("failed", 0),
+                "sent": self.sent, "retried": self.retried}
@@ -1,12 +1,23 @@
-import json
-import os
-import sys
-import psutil
+import time
 import aiohttp
 import asyncio
-import random
 import logging
+from types import SimpleNamespace
 from typing import List, Callable
+from .session_func import SessionManager
+from .dispatch_func import UpdateDispatcher, update_chat_key
+from .checkpoint_func import OffsetCheckpointer
+from .codec_func import get_codec, JSON_HEADERS, DECODE_ERRORS
+from .limiter_func import SendScheduler, SEND_METHODS, parse_retry_after
+from .retry_func import RetryPolicy
+from .broadcast_func import Broadcast
+from .scheduler_func import TimerScheduler, LogicWatcher, make_schedule
+from .metrics_func import BotMetrics, get_server
+from .watchdog_func import get_watchdog
+from .router_func import CommandRouter, TextMatcher, CallbackRouter
+from .ingest_func import IngestQueue
+from .shard_func import ShardedDispatcher
+from .offload_func import get_pool
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +40,26 @@ def keyboard_create(callback=None, reply_keyboard=None):
 
     return reply_markup
 
+# Порядок = пріоритет, якщо в повідомленні кілька типів вмісту
+CONTENT_TYPES = (
+    ("photo", "photo", "фото"),
+    ("video", "video", "відео"),
+    ("document", "document", "документ"),
+    ("audio", "audio", "аудіо"),
+    ("voice", "voice", "голосове повідомлення"),
+    ("contact", "contact", "контакт"),
+    ("sticker", "sticker", "стікер"),
+    ("location", "location", "місцезнаходження"),
+    ("venue", "venue", "місце"),
+    ("poll", "poll", "опитування"),
+    ("dice", "dice", "кубик"),
+    ("web_app_data", "web_app_data", "дані веб-додатка"),
+    ("game", "game", "гра"),
+    ("auto_delete_timer_changed", "message_auto_delete_timer_changed", "зміна таймера авто-видалення"),
+    ("text", "text", "текст"),
+)
+CONTENT_LABELS = {kind: label for kind, _, label in CONTENT_TYPES}
+
 def convert_time(self, time_str):
         if time_str == "9999w":
             return None
@@ -49,149 +80,366 @@ def convert_time(self, time_str):
             return None
 
 class TelegramPollingBot:
-    def __init__(self, bot_token, refusal_disconnect=False, in_old=True, ram_control=False, logic_on=False, pro_logaut=False):
+    def __init__(self, bot_token, refusal_disconnect=False, in_old=True, ram_control=False, logic_on=False, pro_logaut=False,
+                 connector_limit=100, dns_cache_ttl=300, keepalive_timeout=30, workers=8, max_pending=100,
+                 checkpoint_store=None, checkpoint_key='last_update_id', checkpoint_interval=5.0, checkpoint_every=100,
+                 codec=None, rate_limit=True, limiter=None, send_retries=3, retry_policy=None,
+                 metrics_host="127.0.0.1", metrics_port=9108, watchdog=False, api_base="https://api.telegram.org",
+                 outbox=None, ingest_size=1000, ingest_policy="block", allowed_updates=None,
+                 poll_limit=100, poll_timeout=60, shards=0, shard_target=None, offload=None):
         self.bot_token = bot_token
-        self.api_url = f"https://api.telegram.org/bot{self.bot_token}/"
+        # api_base можна змінити на локальний Bot API сервер або фейковий сервер для бенчмарків
+        self.api_base = api_base.rstrip("/")
+        self.api_url = f"{self.api_base}/bot{self.bot_token}/"
         self.message_handlers = {}
-        self.commands = {}
-        self.param_commands = {}
+        self.content_routes = {}
+        self.router = CommandRouter()
+        self.text_matcher = TextMatcher()
         self.payment_handlers = {}
         self.successful_payment_handlers = {}
-        self.timers = []
+        self.scheduler = TimerScheduler()
         self.logic_handlers = []
-        self.callback_handler = []
+        self.callback_router = CallbackRouter()
+        self.checkpointer = OffsetCheckpointer(checkpoint_store, key=checkpoint_key,
+                                               interval=checkpoint_interval, every=checkpoint_every)
         self.last_update_id = self.def_load_last_update_id()
         self.pro_logaut = pro_logaut
         self.ram_control = ram_control
         self.refusal_disconnect = refusal_disconnect
         self.in_old = in_old
         self.logic_on = logic_on
+        self.codec = codec or get_codec()
+        self.limiter = limiter or (SendScheduler() if rate_limit else None)
+        self.send_retries = send_retries
+        self.retry = retry_policy or RetryPolicy()
+        self.http = SessionManager(connector_limit=connector_limit, dns_cache_ttl=dns_cache_ttl, keepalive_timeout=keepalive_timeout)
+        if shards:
+            # Обробники виконуються в shards процесах, чат закріплений за одним із них
+            self.dispatcher = ShardedDispatcher(processes=shards, workers=workers, max_pending=max_pending,
+                                                target=shard_target)
+        else:
+            self.dispatcher = UpdateDispatcher(workers=workers, max_pending=max_pending)
+        self.metrics = BotMetrics(self.bot_token.split(':')[0])
+        self.metrics_host = metrics_host
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+        self.watchdog = get_watchdog() if watchdog is True else (watchdog or None)
+        # SqliteOutbox: відправка переживає рестарт, а хендлер не чекає на Telegram
+        self.outbox = outbox
+        # Пул для синхронних обробників і позначених @offload; за замовчуванням спільний на процес
+        self.offload = offload or get_pool()
+        if shards:
+            self.dispatcher.attach(self)
+        # Черга між getUpdates і диспетчером; політика вирішує, що робити при переповненні
+        self.ingest = IngestQueue(ingest_size, ingest_policy, on_drop=self._on_drop)
+        self._allowed_updates = allowed_updates
+        self.poll_limit = poll_limit
+        self.poll_timeout = poll_timeout
+        self._fetch = None
+        self.running = False
+        self.host = None
+        self._background = []
+        self._answers = set()
 
     def def_load_last_update_id(self):
-        if os.path.exists('last_update_id.json'):
-            with open('last_update_id.json', 'r') as f:
-                return json.load(f).get('last_update_id', 0)
-            return 0
+        return self.checkpointer.load()
+
+    async def open_session(self):
+        return await self.http.open()
+
+    async def close_session(self):
+        await self.http.close()
+
+    async def api_request(self, method, payload=None, http_method="POST", params=None, namespace=False):
+        limited = self.limiter is not None and method in SEND_METHODS
+        chat_id = payload.get("chat_id") if limited and payload else None
+        attempt = 0
+        while True:
+            if limited:
+                await self.limiter.acquire(chat_id)
+            status, data = await self._api_call(method, payload, http_method, params, namespace)
+            retry_after = parse_retry_after(data) if status == 429 else None
+            if not limited or retry_after is None or attempt >= self.send_retries:
+                return status, data
+            self.limiter.retry_after(chat_id, retry_after)
+            attempt += 1
+
+    async def _api_call(self, method, payload, http_method, params, namespace):
+        session = await self.http.get()
+        url = f"{self.api_url}{method}"
+        body = self.codec.dumps(payload) if payload is not None else None
+        headers = JSON_HEADERS if body is not None else None
+        start = time.perf_counter()
+        try:
+            async with session.request(http_method, url, data=body, headers=headers, params=params) as response:
+                raw = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.metrics.error("network")
+            raise
+        self.metrics.api(method, response.status, time.perf_counter() - start)
+        try:
+            data = (self.codec.loads_namespace(raw) if namespace else self.codec.loads(raw)) if raw else None
+        except DECODE_ERRORS:
+            self.metrics.error("decode")
+            data = None
+        return response.status, data
 
     async def get_me(self):
-        url = f"{self.api_url}getMe"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return TelegramBot(data["result"])
-                else:
-                    logger.error(f"Ошибка получения обновлений: {response.status}")
+        status, data = await self.api_request("getMe", http_method="GET")
+        if status == 200:
+            return TelegramBot(data["result"])
+        else:
+            logger.error(f"Ошибка получения обновлений: {status}")
 
     def save_last_update_id(self, update_id):
-        with open('last_update_id.json', 'w') as f:
-            json.dump({'last_update_id': update_id}, f)
+        self.checkpointer.store.save(self.checkpointer.key, update_id)
+
+    def allowed_updates(self):
+        if self._allowed_updates is not None:
+            return list(self._allowed_updates)
+        # Лише типи, для яких є обробники; successful_payment приходить усередині message
+        allowed = []
+        if (self.router.routes or self.router.exact_routes or self.text_matcher or self.message_handlers
+                or self.successful_payment_handlers):
+            allowed.append("message")
+        if self.callback_router.exact or self.callback_router.trie or self.callback_router.any:
+            allowed.append("callback_query")
+        if self.payment_handlers:
+            allowed.append("pre_checkout_query")
+        # Порожній список Telegram трактує як «усі типи», тому лишаємо хоча б повідомлення
+        return allowed or ["message"]
 
     async def get_updates(self, offset=None):
-        url = f"{self.api_url}getUpdates"
-        params = {"offset": offset, "timeout": 60}
+        payload = {"offset": offset or 0, "limit": self.poll_limit, "timeout": self.poll_timeout,
+                   "allowed_updates": self.allowed_updates()}
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("result", [])
-                    else:
-                        logger.error(f"Ошибка получения обновлений: {response.status}")
-                        await self.handle_server_error(response.status)
-            except aiohttp.ClientError as e:
-                logger.error(f"Ошибка соединения: {str(e)}")
-                if self.refusal_disconnect:
-                    logger.warning("Повторно подключаемся к серверу.")
-                    await self.handle_server_error()
-
-            return []
-
-    async def wait_for_reconnect(self):
-        wait_time = random.choice([60, 120, 1200])
-        logger.info(f"Ожидание {wait_time} секунд перед повторной попыткой...")
-        time.sleep(wait_time)
-
-    async def handle_server_error(self, status_code):
-        await self.wait_for_reconnect()
-
-    async def display_memory_usage(self):
-        while self.ram_control:
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info().rss / 1024 ** 2
-            module_size = self.get_module_size()
-
-            if memory_info > 1024:
-                memory_info_str = f"{memory_info / 1024:.2f} GB"
+        try:
+            status, data = await self.api_request("getUpdates", payload)
+            if status == 200 and data is not None:
+                self.retry.reset()
+                return data.get("result", [])
             else:
-                memory_info_str = f"{memory_info:.2f} MB"
-
-            sys.stdout.write(f"\rMemory usage: {memory_info_str} | Module size: {module_size:.2f} MB\n")
-            
-            await asyncio.sleep(60)
-
-    def get_module_size(self):
-        module_path = os.path.dirname(__file__)
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(module_path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                total_size += os.path.getsize(fp)
-        return total_size / 1024 ** 2
+                logger.error(f"Ошибка получения обновлений: {status}")
+                await self.handle_server_error(status, parse_retry_after(data))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Ошибка соединения: {str(e)}")
+            if self.refusal_disconnect:
+                logger.warning("Повторно подключаемся к серверу.")
+            await self.handle_server_error()
+
+        return []
+
+    async def wait_for_reconnect(self, status_code=None, retry_after=None):
+        wait_time = self.retry.next_delay(status_code, retry_after)
+        logger.info(f"Ожидание {wait_time:.1f} секунд перед повторной попыткой...")
+        await asyncio.sleep(wait_time)
+
+    async def handle_server_error(self, status_code=None, retry_after=None):
+        await self.wait_for_reconnect(status_code, retry_after)
+
+    def stop(self):
+        self.running = False
+        # Long poll може висіти ще poll_timeout секунд; його оновлення не підтверджені, тож скасовувати безпечно
+        if self._fetch is not None and not self._fetch.done():
+            self._fetch.cancel()
+
+    async def startup(self):
+        # Процеси-шарди форкаються до відкриття сесії, щоб не успадкувати її з'єднання
+        self.dispatcher.start()
+        await self.open_session()
+        self.metrics.watch_queue(lambda: self.dispatcher.depth(self))
+        self.metrics.watch_ingest(self.ingest.qsize)
+        self.retry.export(self.metrics.bot_id)
+        if self.limiter is not None:
+            self.limiter.export(self.metrics.bot_id)
+        if self.ram_control:
+            self.metrics_server = get_server(self.metrics_host, self.metrics_port)
+            await self.metrics_server.start()
+        if self.watchdog is not None:
+            self.watchdog.start()
+        if self.outbox is not None:
+            self.outbox.start(self)
+        self.offload.start()
+        # Polling і webhook однаково кладуть оновлення в ingest, звідти їх забирає _pump
+        self._background.append(asyncio.create_task(self._pump()))
+        if self.logic_on:
+            self._background.append(asyncio.create_task(self.check_timers()))
+            self._background.append(asyncio.create_task(self.check_logic_handlers()))
+
+    async def shutdown(self, wait=True):
+        if wait:
+            await self.ingest.join()
+        if wait and self.host is None:
+            await self.dispatcher.join()
+        tasks, self._background = self._background, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.scheduler.close()
+        await self.checkpointer.close()
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+            self.metrics_server = None
+        if self.watchdog is not None:
+            await self.watchdog.stop()
+        if self.outbox is not None:
+            await self.outbox.stop()
+        await self.offload.stop()
+        # Спільні сесію та диспетчер закриває BotHost
+        if self.host is None:
+            await self.dispatcher.close(wait=False)
+            await self.close_session()
+
+    async def feed_update(self, update):
+        return await self.ingest.put(update)
 
     async def run_polling(self):
+        await self.startup()
+        self.checkpointer.start()
+        graceful = False
+        try:
+            await self._polling_loop()
+            graceful = True
+        finally:
+            await self.shutdown(wait=graceful)
+
+    async def identify(self):
         bot_info = await self.get_me()
+        if bot_info is not None:
+            # Потрібно, щоб у групах приймати /command@username лише для цього бота
+            self.router.set_username(bot_info.username)
+        return bot_info
+
+    async def _polling_loop(self):
+        bot_info = await self.identify()
         print(f"Running {bot_info.first_name} in @{bot_info.username}")
         
-        if self.ram_control:
-            asyncio.create_task(self.display_memory_usage())
-        if self.logic_on:
-            asyncio.create_task(self.check_timers())
-            asyncio.create_task(self.check_logic_handlers())
         if self.in_old:
-            offset = self.def_load_last_update_id()
+            offset = await self.checkpointer.load_async()
         else:
             offset = 0
+        self.running = True
+        try:
+            while self.running:
+                try:
+                    if self._fetch is None:
+                        self._fetch = asyncio.create_task(self.get_updates(offset))
+                    # wait не прокидає скасування запиту з stop(), а зовнішнє скасування — прокидає
+                    await asyncio.wait((self._fetch,))
+                    fetch, self._fetch = self._fetch, None
+                    if fetch.cancelled():
+                        continue
+                    updates = fetch.result()
+                    if updates:
+                        offset = updates[-1]["update_id"] + 1
+                    if self.running:
+                        # Наступний long poll уже йде, поки ця пачка передається диспетчеру
+                        self._fetch = asyncio.create_task(self.get_updates(offset))
+                    for update in updates:
+                        # offset фіксується лише після того, як обробник завершився
+                        self.checkpointer.begin(update["update_id"])
+                        await self.ingest.put(update)
+
+                except Exception as e:
+                    logger.error(f"Помилка під час обробки оновлень: {e}")
+                    await self.wait_for_reconnect()
+            await self.ingest.join()
+        finally:
+            fetch, self._fetch = self._fetch, None
+            if fetch is not None:
+                fetch.cancel()
+                await asyncio.gather(fetch, return_exceptions=True)
+
+    async def _pump(self):
         while True:
+            update = await self.ingest.get()
             try:
-                updates = await self.get_updates(offset)
-                for update in updates:
-                    offset = update["update_id"] + 1
-                    message_data = update.get("message")
-                    pre_checkout_query = update.get("pre_checkout_query")
-
-                    if message_data:
-                        successful_payment = update.get("message", {}).get("successful_payment")
-                        if successful_payment:
-                            payment_data = TelegramSuccessfulPayment(successful_payment)
-                            handler = self.successful_payment_handlers.get((payment_data.currency, payment_data.total_amount))
-                            if handler:
-                                await handler(payment_data)
-                            if self.pro_logaut:
-                                logger.info(f"Успішний платіж: {payment_data.total_amount} {payment_data.currency}")
-                        else:
-                            message = TelegramMessage(message_data)
-                            await self.process_message(message, offset)
-                            if self.pro_logaut:
-                                logger.info(f"Получено сообщение: {message.text} от {message.from_user.all_name}")
-
-                    elif pre_checkout_query:
-                        query_data = TelegramPAY(pre_checkout_query)
-                        handler = self.payment_handlers.get((query_data.currency, query_data.total_amount))
-                        if handler:
-                            await handler(query_data)
-                        if self.pro_logaut:
-                            logger.info(f"Перевіряємо оплату.")
-                    elif "callback_query" in update:
-                        await self.handle_callback_query(update)
-
-            except Exception as e:
-                logger.error(f"Помилка під час обробки оновлень: {e}")
-                await self.wait_for_reconnect()
-        await asyncio.sleep(1)
-
-    async def process_message(self, message, offset=0):
+                # Оновлення одного чату йдуть по черзі, різних чатів — паралельно
+                await self.dispatcher.submit(update_chat_key(update), self._run_update, update, group=self)
+            finally:
+                self.ingest.task_done()
+
+    def _on_drop(self, update, reason):
+        logger.warning(f"Оновлення {update['update_id']} відкинуто ({reason})")
+        self.metrics.drop(reason)
+        # Відкинуте вважається обробленим, інакше offset зупиниться на ньому
+        self.checkpointer.done(update["update_id"])
+        if reason == "coalesce":
+            # Без відповіді кнопка в клієнті крутиться, доки не спливе таймаут
+            task = asyncio.ensure_future(self._answer_dropped(update["callback_query"]["id"]))
+            self._answers.add(task)
+            task.add_done_callback(self._answers.discard)
+
+    async def _answer_dropped(self, query_id):
+        try:
+            await self.api_request("answerCallbackQuery", {"callback_query_id": query_id})
+        except Exception as e:
+            logger.error(f"Не вдалося відповісти на callback {query_id}: {e}")
+
+    async def _run_update(self, update):
+        try:
+            await self.process_update(update)
+        finally:
+            self.checkpointer.done(update["update_id"])
+
+    async def _call_handler(self, func, *args):
+        name = getattr(func, "__qualname__", "unknown")
+        watchdog = self.watchdog
+        handle = watchdog.watch(name) if watchdog is not None else None
+        spec = self.offload.spec(func)
+        start = time.perf_counter()
+        try:
+            if spec is not None:
+                return await self.offload.call(func, args, spec, name)
+            return await func(*args)
+        except Exception:
+            self.metrics.error("handler")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.metrics.handler(name, elapsed)
+            if handle is not None:
+                watchdog.finish(handle, name, elapsed)
+
+    async def process_update(self, update, offset=0):
+        self.metrics.update(next((key for key in update if key != "update_id"), "unknown"))
+        message_data = update.get("message")
+        pre_checkout_query = update.get("pre_checkout_query")
+
+        if message_data:
+            successful_payment = message_data.get("successful_payment")
+            if successful_payment:
+                payment_data = TelegramSuccessfulPayment(successful_payment)
+                handler = self.successful_payment_handlers.get((payment_data.currency, payment_data.total_amount))
+                if handler:
+                    await self._call_handler(handler, payment_data)
+                if self.pro_logaut:
+                    logger.info(f"Успішний платіж: {payment_data.total_amount} {payment_data.currency}")
+            else:
+                content_type = None
+                text = message_data.get("text")
+                if not (text and text.startswith("/")):
+                    content_type = self.match_content(message_data)
+                    if content_type is None and "unknown" not in self.message_handlers:
+                        # Ніхто не обробляє цей тип — модель навіть не будуємо
+                        logger.warning("Тип повідомлення не підтримується, обробка невідома.")
+                        return
+                message = TelegramMessage(message_data)
+                await self.process_message(message, offset, content_type=content_type)
+                if self.pro_logaut:
+                    logger.info(f"Получено сообщение: {message.text} от {message.from_user.all_name}")
+
+        elif pre_checkout_query:
+            query_data = TelegramPAY(pre_checkout_query)
+            handler = self.payment_handlers.get((query_data.currency, query_data.total_amount))
+            if handler:
+                await self._call_handler(handler, query_data)
+            if self.pro_logaut:
+                logger.info(f"Перевіряємо оплату.")
+        elif "callback_query" in update:
+            await self.handle_callback_query(update)
+
+    async def process_message(self, message, offset=0, content_type=None):
         text = message.text
         logger.info(f"Обробляється повідомлення: {text or 'не текстове повідомлення'}")
 
@@ -199,78 +447,74 @@ class TelegramPollingBot:
             logger.info("Ігноруємо старе повідомлення.")
             return
 
-        self.save_last_update_id(offset)
         if text and text.startswith("/"):
-            parts = text.split()
-            command = parts[0].lower()
-            params = parts[1:] if len(parts) > 1 else []
-
-            if command in self.param_commands:
-                handler, allowed_params = self.param_commands[command]
-                if params and any(param in allowed_params for param in params):
-                    logger.info(f"Знайдено команду з параметрами: {params}")
-                    await handler(message, params)
-                    return
-
-            if command in self.commands:
-                logger.info(f"Знайдено команду без параметрів: {command}")
-                await self.commands[command](message)
+            route = self.router.match(text)
+            if route is None:
+                logger.info(f"Команда {text.split(None, 1)[0]} не знайдена")
+                return
+            command, handler, args, with_params = route
+            message.command = command
+            message.args = args
+            if with_params:
+                logger.info(f"Знайдено команду з параметрами: {args}")
+                await self._call_handler(handler, message, args)
             else:
-                logger.info(f"Команда {command} не знайдена в {self.commands}")
-    
+                logger.info(f"Знайдено команду без параметрів: {command}")
+                await self._call_handler(handler, message)
+
         else:
-            if message.photo and "photo" in self.message_handlers:
-                logger.info("Обробляється фото")
-                await self.message_handlers["photo"](message)
-            elif message.video and "video" in self.message_handlers:
-                logger.info("Обробляється відео")
-                await self.message_handlers["video"](message)
-            elif message.document and "document" in self.message_handlers:
-                logger.info("Обробляється документ")
-                await self.message_handlers["document"](message)
-            elif message.audio and "audio" in self.message_handlers:
-                logger.info("Обробляється аудіо")
-                await self.message_handlers["audio"](message)
-            elif message.voice and "voice" in self.message_handlers:
-                logger.info("Обробляється голосове повідомлення")
-                await self.message_handlers["voice"](message)
-            elif message.contact and "contact" in self.message_handlers:
-                logger.info("Обробляється контакт")
-                await self.message_handlers["contact"](message)
-            elif message.sticker and "sticker" in self.message_handlers:
-                logger.info("Обробляється стікер")
-                await self.message_handlers["sticker"](message)
-            elif message.location and "location" in self.message_handlers:
-                logger.info("Обробляється місцезнаходження")
-                await self.message_handlers["location"](message)
-            elif message.venue and "venue" in self.message_handlers:
-                logger.info("Обробляється місце")
-                await self.message_handlers["venue"](message)
-            elif message.poll and "poll" in self.message_handlers:
-                logger.info("Обробляється опитування")
-                await self.message_handlers["poll"](message)
-            elif message.dice and "dice" in self.message_handlers:
-                logger.info("Обробляється кубик")
-                await self.message_handlers["dice"](message)
-            elif message.web_app_data and "web_app_data" in self.message_handlers:
-                logger.info("Обробляються дані веб-додатка")
-                await self.message_handlers["web_app_data"](message)
-            elif message.game and "game" in self.message_handlers:
-                logger.info("Обробляється гра")
-                await self.message_handlers["game"](message)
-            elif text and "text" in self.message_handlers:
-                logger.info("Обробляється текст")
-                await self.message_handlers["text"](message)
+            if content_type is None:
+                content_type = self.match_content(message._data)
+            if content_type == "text":
+                await self.process_text(message)
+            elif content_type is not None:
+                logger.info(f"Обробляється {CONTENT_LABELS[content_type]}")
+                await self._call_handler(self.message_handlers[content_type], message)
             else:
                 logger.warning("Тип повідомлення не підтримується, обробка невідома.")
                 if "unknown" in self.message_handlers:
-                    await self.message_handlers["unknown"](message)
+                    await self._call_handler(self.message_handlers["unknown"], message)
+
+    async def process_text(self, message):
+        found = self.text_matcher.match(message.text)
+        if found is not None:
+            handler, match = found
+            message.match = match
+            logger.info(f"Знайдено текстовий хендлер: {message.text}")
+            await self._call_handler(handler, message)
+        elif "text" in self.message_handlers:
+            logger.info(f"Обробляється {CONTENT_LABELS['text']}")
+            await self._call_handler(self.message_handlers["text"], message)
+        else:
+            logger.info(f"Текст без хендлера: {message.text}")
+
+    def rebuild_content_routes(self):
+        # Лише типи, для яких є хендлер: ключ у сирому dict -> (пріоритет, тип)
+        self.content_routes = {
+            raw_key: (rank, kind)
+            for rank, (kind, raw_key, _) in enumerate(CONTENT_TYPES)
+            if kind in self.message_handlers or kind == "text" and self.text_matcher
+        }
+
+    def match_content(self, message_data):
+        routes = self.content_routes
+        best = None
+        for key in message_data:
+            route = routes.get(key)
+            if route is not None and message_data[key] and (best is None or route[0] < best[0]):
+                best = route
+        return best[1] if best is not None else None
 
     async def handle_callback_query(self, update):
         callback_query = TelegramCallbackQuery(update["callback_query"])
-        for handler, allowed_data in self.callback_handlers:
-            if allowed_data is None or callback_query.data in allowed_data:
-                await handler(callback_query)
+        for _, handler, codec in self.callback_router.match(callback_query.data):
+            if codec is not None:
+                try:
+                    callback_query.values = codec.unpack(callback_query.data)
+                except ValueError as e:
+                    logger.warning(f"Невірні callback дані: {e}")
+                    continue
+            await self._call_handler(handler, callback_query)
 
     def pay_pre(self, currency, prices):
         def decorator(func):
@@ -280,15 +524,12 @@ class TelegramPollingBot:
         return decorator
 
     async def ok_pay(self, query_data):
-        url = f"{self.api_url}answerPreCheckoutQuery"
         payload = {"pre_checkout_query_id": query_data.id, "ok": True}
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"Платіж підтверджено: {data}")
-                else:
-                    logger.error(f"Error: Received status code {response.status}")
+        status, data = await self.api_request("answerPreCheckoutQuery", payload)
+        if status == 200:
+            logger.info(f"Платіж підтверджено: {data}")
+        else:
+            logger.error(f"Error: Received status code {status}")
 
     def successful_payment(self, currency, prices):
         def decorator(func):
@@ -297,8 +538,7 @@ class TelegramPollingBot:
             return func
         return decorator
 
-    async def send_message(self, chat_id, text, parse_mode=None, callback=None, reply_keyboard=None):
-        url = f"{self.api_url}sendMessage"
+    def message_payload(self, chat_id, text, parse_mode=None, callback=None, reply_keyboard=None):
         reply_markup = keyboard_create(callback, reply_keyboard)
         payload = {
             "chat_id": chat_id,
@@ -308,16 +548,29 @@ class TelegramPollingBot:
             payload["parse_mode"] = parse_mode
         if reply_markup:
             payload["reply_markup"] = reply_markup
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("result", {})
-                logger.error(f"Ошибка отправки сообщения: {response.status}")
-                return None
-
-    async def send_pay(self, user_id, title, description, payload, currency, prices, in_support=True, provider_token=None, photo_url=None, photo_size=None, photo_width=None, photo_height=None):
-        url = f"{self.api_url}sendInvoice"
+        return payload
+
+    async def send_message(self, chat_id, text, parse_mode=None, callback=None, reply_keyboard=None,
+                           idempotency_key=None):
+        payload = self.message_payload(chat_id, text, parse_mode, callback, reply_keyboard)
+        if self.outbox is not None:
+            # З outbox повертається ключ запису, а не відповідь Telegram
+            return await self.outbox.enqueue(self, "sendMessage", payload, key=idempotency_key)
+        status, data = await self.api_request("sendMessage", payload)
+        if status == 200:
+            return data.get("result", {})
+        logger.error(f"Ошибка отправки сообщения: {status}")
+        return None
+
+    async def broadcast(self, chat_ids, text, parse_mode=None, callback=None, reply_keyboard=None,
+                        name="broadcast", concurrency=20, on_progress=None, report_every=10.0):
+        payload = self.message_payload(None, text, parse_mode, callback, reply_keyboard)
+        del payload["chat_id"]
+        sender = Broadcast(self, name=name, concurrency=concurrency, on_progress=on_progress, report_every=report_every)
+        return await sender.run(chat_ids, payload=payload)
+
+    async def send_pay(self, user_id, title, description, payload, currency, prices, in_support=True, provider_token=None, photo_url=None, photo_size=None, photo_width=None, photo_height=None,
+                       idempotency_key=None):
         Prices = [{"label": prices[0], "amount": prices[1]}]
         if in_support:
             description_original = description + " For support/core bot Flastel."
@@ -349,174 +602,165 @@ class TelegramPollingBot:
                 "photo_height": photo_height
             })
 
+        if self.outbox is not None:
+            return await self.outbox.enqueue(self, "sendInvoice", payload_data, key=idempotency_key)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload_data) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        invoice_data = json.loads(json.dumps(data.get("result", {})), object_hook=lambda d: SimpleNamespace(**d))
-                        return invoice_data
-                    else:
-                        logging.error(f"Error: Received status code {response.status}")
-                        return None
+            status, data = await self.api_request("sendInvoice", payload_data, namespace=True)
+            if status == 200:
+                return getattr(data, "result", SimpleNamespace())
+            else:
+                logging.error(f"Error: Received status code {status}")
+                return None
         except Exception as e:
             logging.error(f"Exception occurred: {str(e)}")
             return None
 
-    def timer(self, data: List[str], moon: List[int], time: List[str]):
+    def timer(self, data: List[str] = None, moon: List[int] = None, time: List[str] = None,
+              cron: str = None, every: float = None, name: str = None):
+        schedule = make_schedule(data, moon, time, cron, every)
         def decorator(func: Callable):
-            self.timers.append((data, moon, time, func))
+            self.scheduler.add(name or func.__qualname__, schedule, func)
             return func
         return decorator
 
-    def logic_handler(self, condition: Callable, range: int = None, audit: int = 1):
+    def logic_handler(self, condition: Callable, range: int = None, audit: int = 1,
+                      timeout: float = 30, coalesce: bool = True):
         def decorator(func: Callable):
-            self.logic_handlers.append((condition, func, range, audit))
+            self.logic_handlers.append(LogicWatcher(condition, func, range, audit, timeout, coalesce))
             return func
         return decorator
 
     async def check_timers(self):
-        while True:
-            now = datetime.now()
-            for data, moon, time, func in self.timers:
-                for t in time:
-                    scheduled_time = now.replace(hour=int(t.split(':')[0]), minute=int(t.split(':')[1]), second=0, microsecond=0)
-                    if scheduled_time <= now < scheduled_time + timedelta(seconds=60):
-                        await func()
-            await asyncio.sleep(60)
+        # Час наступного запуску зберігається поруч з offset'ом, щоб рестарт не пропускав таймери
+        self.scheduler.store = self.checkpointer.store
+        await self.scheduler.run()
 
     async def check_logic_handlers(self):
-        while True:
-            for condition, func, range_seconds, audit_seconds in self.logic_handlers:
-                if await condition():
-                    await func()
-                    await asyncio.sleep(range_seconds)
-                else:
-                    await asyncio.sleep(audit_seconds)
-
-    def command(self, commands, caps_ignore=True):
+        # Кожен обробник має власну задачу, тож повільна умова не затримує інших
+        await asyncio.gather(*(watcher.run() for watcher in self.logic_handlers))
+
+    def command(self, commands, caps_ignore=True, quoted=False):
+        # quoted=True: аргументи в лапках ("/find \"new york\"") приходять одним елементом
         def decorator(func):
             for command in commands:
-                if caps_ignore:
-                    self.commands[command.lower()] = func
-                    self.commands[command.upper()] = func
-                else:
-                    self.commands[command] = func
+                self.router.add(command, func, case_sensitive=not caps_ignore, quoted=quoted)
                 logger.info(f"Команда зареєстрована: {command}")
             return func
         return decorator
 
-    def command_with_params(self, commands, params, caps_ignore=True):
+    def command_with_params(self, commands, params, caps_ignore=True, quoted=False):
         def decorator(func):
             for command in commands:
-                if caps_ignore:
-                    self.param_commands[command.lower()] = (func, params)
-                    self.param_commands[command.upper()] = (func, params)
-                else:
-                    self.param_commands[command] = (func, params)
+                self.router.add_params(command, params, func, case_sensitive=not caps_ignore, quoted=quoted)
             return func
         return decorator
 
+    def register_content(self, kind, func):
+        self.message_handlers[kind] = func
+        self.rebuild_content_routes()
+
     def message_photo(self):
         def decorator(func):
-            self.message_handlers["photo"] = func
+            self.register_content("photo", func)
             logger.info("Фото хендлер зареєстровано")
             return func
         return decorator
 
     def message_video(self):
         def decorator(func):
-            self.message_handlers["video"] = func
+            self.register_content("video", func)
             logger.info("Відео хендлер зареєстровано")
             return func
         return decorator
 
     def message_document(self):
         def decorator(func):
-            self.message_handlers["document"] = func
+            self.register_content("document", func)
             logger.info("Документ хендлер зареєстровано")
             return func
         return decorator
 
     def message_audio(self):
         def decorator(func):
-            self.message_handlers["audio"] = func
+            self.register_content("audio", func)
             logger.info("Аудіо хендлер зареєстровано")
             return func
         return decorator
 
     def message_voice(self):
         def decorator(func):
-            self.message_handlers["voice"] = func
+            self.register_content("voice", func)
             logger.info("Голосовий хендлер зареєстровано")
             return func
         return decorator
 
     def message_contact(self):
         def decorator(func):
-            self.message_handlers["contact"] = func
+            self.register_content("contact", func)
             logger.info("Контакт хендлер зареєстровано")
             return func
         return decorator
 
     def message_sticker(self):
         def decorator(func):
-            self.message_handlers["sticker"] = func
+            self.register_content("sticker", func)
             logger.info("Стікери хендлер зареєстровано")
             return func
         return decorator
 
     def message_location(self):
         def decorator(func):
-            self.message_handlers["location"] = func
+            self.register_content("location", func)
             logger.info("Хендлер для місцезнаходження зареєстровано")
             return func
         return decorator
 
     def message_venue(self):
         def decorator(func):
-            self.message_handlers["venue"] = func
+            self.register_content("venue", func)
             logger.info("Хендлер для місця зареєстровано")
             return func
         return decorator
 
     def message_poll(self):
         def decorator(func):
-            self.message_handlers["poll"] = func
+            self.register_content("poll", func)
             logger.info("Хендлер для опитувань зареєстровано")
             return func
         return decorator
 
     def message_dice(self):
         def decorator(func):
-            self.message_handlers["dice"] = func
+            self.register_content("dice", func)
             logger.info("Хендлер для кубиків зареєстровано")
             return func
         return decorator
 
     def message_web_app_data(self):
         def decorator(func):
-            self.message_handlers["web_app_data"] = func
+            self.register_content("web_app_data", func)
             logger.info("Хендлер для даних веб-додатків зареєстровано")
             return func
         return decorator
 
     def message_game(self):
         def decorator(func):
-            self.message_handlers["game"] = func
+            self.register_content("game", func)
             logger.info("Хендлер для ігор зареєстровано")
             return func
         return decorator
 
-    def message_text(self, messages_txt, caps_ignore=False):
+    def message_text(self, messages_txt=None, caps_ignore=False, mode="exact"):
+        # mode: "exact" — уся фраза, "prefix" — початок тексту, "regex" — регулярний вираз
         def decorator(func):
-            for message_txt in messages_txt:
-                if caps_ignore:
-                    self.message_handlers[message_txt.lower()] = func
-                    self.message_handlers[message_txt.upper()] = func
-                else:
-                    self.message_handlers[message_txt] = func
+            if messages_txt is None:
+                # Без фраз — обробник для будь-якого тексту, який не зловили інші
+                self.message_handlers["text"] = func
+                logger.info("Текстовий хендлер для всіх повідомлень зареєстровано")
+            for message_txt in messages_txt or ():
+                self.text_matcher.add(message_txt, func, mode=mode, caps_ignore=caps_ignore)
                 logger.info(f"Текстовий хандлер зареєстрована: {message_txt}")
+            self.rebuild_content_routes()
             return func
         return decorator
 
@@ -528,14 +772,15 @@ class TelegramPollingBot:
         return decorator
 
     def message_callback_query(self, callback_data=None):
+        # callback_data: None — усі кнопки; "page:*" — за префіксом; CallbackData — розпакування в .values
         def decorator(func):
-            self.callback_handlers.append((func, callback_data))
+            self.callback_router.add(func, callback_data)
             return func
         return decorator
 
     def message_auto_delete_timer_changed(self):
         def decorator(func):
-            self.message_handlers["auto_delete_timer_changed"] = func
+            self.register_content("auto_delete_timer_changed", func)
             logger.info("Хендлер для зміни таймера авто-видалення зареєстровано")
             return func
         return decorator
@@ -543,7 +788,6 @@ class TelegramPollingBot:
     async def ban_user(self, chat_id, user_id, until_time=None):
         until_date = self.convert_time(until_time) if until_time else None
 
-        url = f"{self.api_url}banChatMember"
         payload = {
             "chat_id": chat_id,
             "user_id": user_id,
@@ -551,31 +795,28 @@ class TelegramPollingBot:
         if until_date:
             payload["until_date"] = until_date
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    logger.info(f"Користувача {user_id} було заблоковано в чаті {chat_id} до {until_date}")
-                    return True
-                else:
-                    logger.error(f"Не вдалося заблокувати користувача {user_id} в чаті {chat_id}: {response.status}")
-                    return False
+        status, _ = await self.api_request("banChatMember", payload)
+        if status == 200:
+            logger.info(f"Користувача {user_id} було заблоковано в чаті {chat_id} до {until_date}")
+            return True
+        else:
+            logger.error(f"Не вдалося заблокувати користувача {user_id} в чаті {chat_id}: {status}")
+            return False
 
 
     async def unban_user(self, chat_id, user_id):
-        url = f"{self.api_url}unbanChatMember"
         payload = {
             "chat_id": chat_id,
             "user_id": user_id,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    logger.info(f"Користувача {user_id} було розблоковано в чаті {chat_id}")
-                    return True
-                else:
-                    logger.error(f"Не вдалося розблокувати користувача {user_id} в чаті {chat_id}: {response.status}")
-                    return False
+        status, _ = await self.api_request("unbanChatMember", payload)
+        if status == 200:
+            logger.info(f"Користувача {user_id} було розблоковано в чаті {chat_id}")
+            return True
+        else:
+            logger.error(f"Не вдалося розблокувати користувача {user_id} в чаті {chat_id}: {status}")
+            return False
 
     async def user_set_permissions(self, chat_id, user_id, 
                               can_send_messages=True, 
@@ -593,7 +834,6 @@ class TelegramPollingBot:
         
         until_date = self.convert_time(until_time) if until_time else None
         
-        url = f"{self.api_url}restrictChatMember"
         permissions = {
             "can_send_messages": can_send_messages,
             "can_send_media_messages": can_send_media_messages,
@@ -616,14 +856,13 @@ class TelegramPollingBot:
         if until_date:
             payload["until_date"] = until_date
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    logger.info(f"Налаштовано права для користувача {user_id} в чаті {chat_id}")
-                    return True
-                else:
-                    logger.error(f"Не вдалося налаштувати права для користувача {user_id} в чаті {chat_id}: {response.status}")
-                    return False
+        status, _ = await self.api_request("restrictChatMember", payload)
+        if status == 200:
+            logger.info(f"Налаштовано права для користувача {user_id} в чаті {chat_id}")
+            return True
+        else:
+            logger.error(f"Не вдалося налаштувати права для користувача {user_id} в чаті {chat_id}: {status}")
+            return False
 
     async def apply_temporary_restrictions(self, chat_id, user_id, 
                                             can_send_messages=False, 
@@ -631,7 +870,6 @@ class TelegramPollingBot:
                                             until_time=None):
         until_date = self.convert_time(until_time) if until_time else None
 
-        url = f"{self.api_url}restrictChatMember"
         permissions = {
             "can_send_messages": can_send_messages,
             "can_send_media_messages": can_send_media_messages,
@@ -645,14 +883,13 @@ class TelegramPollingBot:
         if until_date:
             payload["until_date"] = until_date  # Додаємо дату, до якої діють обмеження
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    logger.info(f"Тимчасові обмеження накладено на користувача {user_id} в чаті {chat_id} до {until_date}")
-                    return True
-                else:
-                    logger.error(f"Не вдалося накласти обмеження на користувача {user_id} в чаті {chat_id}: {response.status}")
-                    return False
+        status, _ = await self.api_request("restrictChatMember", payload)
+        if status == 200:
+            logger.info(f"Тимчасові обмеження накладено на користувача {user_id} в чаті {chat_id} до {until_date}")
+            return True
+        else:
+            logger.error(f"Не вдалося накласти обмеження на користувача {user_id} в чаті {chat_id}: {status}")
+            return False
 
     async def admin_set_permissions(self, chat_id, user_id,
                                     can_manage_chat=True,
@@ -666,7 +903,6 @@ class TelegramPollingBot:
                                     until_time=None):
         until_date = self.convert_time(until_time) if until_time else None
 
-        url = f"{self.api_url}promoteChatMember"
         payload = {
             "chat_id": chat_id,
             "user_id": user_id,
@@ -682,14 +918,13 @@ class TelegramPollingBot:
         if until_date:
             payload["until_date"] = until_date
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    logger.info(f"Користувач {user_id} отримав права адміністратора в чаті {chat_id} до {until_date}")
-                    return True
-                else:
-                    logger.error(f"Не вдалося призначити адміністратора {user_id} в чаті {chat_id}: {response.status}")
-                    return False
+        status, _ = await self.api_request("promoteChatMember", payload)
+        if status == 200:
+            logger.info(f"Користувач {user_id} отримав права адміністратора в чаті {chat_id} до {until_date}")
+            return True
+        else:
+            logger.error(f"Не вдалося призначити адміністратора {user_id} в чаті {chat_id}: {status}")
+            return False
 class TelegramBot:
     def __init__(self, data):
         self.id = data['id']
@@ -702,490 +937,612 @@ class TelegramBot:
         self.can_connect_to_business = data['can_connect_to_business']
         self.has_main_web_app = data['has_main_web_app']
 
-class TelegramMessage:
-    def __init__(self, message_data):
-        # Mandatory fields
-        self.chat_id = message_data["chat"]["id"]
-        self.message_id = message_data.get("message_id", None)
-        self.text = message_data.get("text", "")
-        self.from_user = TelegramUser(message_data.get("from", {}))
-        
-        # Optional fields
-        self.message_thread_id = message_data.get("message_thread_id", None)
-        self.sender_chat = TelegramChat(message_data.get("sender_chat", {}))
-        self.sender_boost_count = message_data.get("sender_boost_count", None)
-        self.sender_business_bot = TelegramUser(message_data.get("sender_business_bot", {}))
-        self.date = message_data.get("date", None)
-        self.business_connection_id = message_data.get("business_connection_id", "")
-        self.forward_origin = TelegramMessageOrigin(message_data.get("forward_origin", {}))
-        self.is_topic_message = message_data.get("is_topic_message", False)
-        self.is_automatic_forward = message_data.get("is_automatic_forward", False)
-        self.reply_to_message = TelegramMessage(message_data.get("reply_to_message", {})) if "reply_to_message" in message_data else None
-        self.external_reply = ExternalReplyInfo(message_data.get("external_reply", {}))
-        self.quote = TextQuote(message_data.get("quote", {}))
-        self.reply_to_story = Story(message_data.get("reply_to_story", {}))
-        self.via_bot = TelegramUser(message_data.get("via_bot", {}))
-        self.edit_date = message_data.get("edit_date", None)
-        self.has_protected_content = message_data.get("has_protected_content", False)
-        self.is_from_offline = message_data.get("is_from_offline", False)
-        self.media_group_id = message_data.get("media_group_id", None)
-        self.author_signature = message_data.get("author_signature", None)
-        self.entities = [MessageEntity(e) for e in message_data.get("entities", [])]
-        self.link_preview_options = LinkPreviewOptions(message_data.get("link_preview_options", {}))
-        self.effect_id = message_data.get("effect_id", None)
-        
-        # Media
-        self.photo = [TelegramPhoto(p) for p in message_data.get("photo", [])]
-        self.sticker = TelegramSticker(message_data.get("sticker", {})) if "sticker" in message_data else None
-        self.animation = TelegramAnimation(message_data.get("animation", {})) if "animation" in message_data else None
-        self.audio = TelegramAudio(message_data.get("audio", {})) if "audio" in message_data else None
-        self.document = TelegramDocument(message_data.get("document", {})) if "document" in message_data else None
-        self.video = TelegramVideo(message_data.get("video", {})) if "video" in message_data else None
-        self.video_note = TelegramVideoNote(message_data.get("video_note", {})) if "video_note" in message_data else None
-        self.voice = TelegramVoice(message_data.get("voice", {})) if "voice" in message_data else None
-        
-        # Other content
-        self.caption = message_data.get("caption", None)
-        self.caption_entities = [MessageEntity(e) for e in message_data.get("caption_entities", [])]
-        self.show_caption_above_media = message_data.get("show_caption_above_media", False)
-        self.has_media_spoiler = message_data.get("has_media_spoiler", False)
-        self.contact = TelegramContact(message_data.get("contact", {})) if "contact" in message_data else None
-        self.dice = TelegramDice(message_data.get("dice", {})) if "dice" in message_data else None
-        self.game = TelegramGame(message_data.get("game", {})) if "game" in message_data else None
-        self.poll = TelegramPoll(message_data.get("poll", {})) if "poll" in message_data else None
-        self.venue = TelegramVenue(message_data.get("venue", {})) if "venue" in message_data else None
-        self.location = TelegramLocation(message_data.get("location", {})) if "location" in message_data else None
-        
-        # Chat-related service messages
-        self.new_chat_members = [TelegramUser(u) for u in message_data.get("new_chat_members", [])]
-        self.left_chat_member = TelegramUser(message_data.get("left_chat_member", {})) if "left_chat_member" in message_data else None
-        self.new_chat_title = message_data.get("new_chat_title", None)
-        self.new_chat_photo = [TelegramPhoto(p) for p in message_data.get("new_chat_photo", [])]
-        self.delete_chat_photo = message_data.get("delete_chat_photo", False)
-        self.group_chat_created = message_data.get("group_chat_created", False)
-        self.supergroup_chat_created = message_data.get("supergroup_chat_created", False)
-        self.channel_chat_created = message_data.get("channel_chat_created", False)
-        self.message_auto_delete_timer_changed = MessageAutoDeleteTimerChanged(message_data.get("message_auto_delete_timer_changed", {}))
-        self.migrate_to_chat_id = message_data.get("migrate_to_chat_id", None)
-        self.migrate_from_chat_id = message_data.get("migrate_from_chat_id", None)
-        self.pinned_message = TelegramMessage(message_data.get("pinned_message", {})) if "pinned_message" in message_data else None
-
-        # Payment messages
-        self.invoice = TelegramInvoice(message_data.get("invoice", {})) if "invoice" in message_data else None
-        self.successful_payment = TelegramSuccessfulPayment(message_data.get("successful_payment", {})) if "successful_payment" in message_data else None
-        self.refunded_payment = TelegramRefundedPayment(message_data.get("refunded_payment", {})) if "refunded_payment" in message_data else None
-        
-        # Special service messages
-        self.users_shared = UsersShared(message_data.get("users_shared", {})) if "users_shared" in message_data else None
-        self.chat_shared = ChatShared(message_data.get("chat_shared", {})) if "chat_shared" in message_data else None
-        self.connected_website = message_data.get("connected_website", None)
-        self.write_access_allowed = WriteAccessAllowed(message_data.get("write_access_allowed", {})) if "write_access_allowed" in message_data else None
-        self.passport_data = TelegramPassportData(message_data.get("passport_data", {})) if "passport_data" in message_data else None
-        self.proximity_alert_triggered = ProximityAlertTriggered(message_data.get("proximity_alert_triggered", {}))
-        self.boost_added = ChatBoostAdded(message_data.get("boost_added", {})) if "boost_added" in message_data else None
-        self.chat_background_set = ChatBackground(message_data.get("chat_background_set", {})) if "chat_background_set" in message_data else None
-        
-        # Forum topics
-        self.forum_topic_created = ForumTopicCreated(message_data.get("forum_topic_created", {})) if "forum_topic_created" in message_data else None
-        self.forum_topic_edited = ForumTopicEdited(message_data.get("forum_topic_edited", {})) if "forum_topic_edited" in message_data else None
-        self.forum_topic_closed = ForumTopicClosed(message_data.get("forum_topic_closed", {})) if "forum_topic_closed" in message_data else None
-        self.forum_topic_reopened = ForumTopicReopened(message_data.get("forum_topic_reopened", {})) if "forum_topic_reopened" in message_data else None
-        self.general_forum_topic_hidden = GeneralForumTopicHidden(message_data.get("general_forum_topic_hidden", {})) if "general_forum_topic_hidden" in message_data else None
-        self.general_forum_topic_unhidden = GeneralForumTopicUnhidden(message_data.get("general_forum_topic_unhidden", {})) if "general_forum_topic_unhidden" in message_data else None
-
-        # Giveaways
-        self.giveaway_created = GiveawayCreated(message_data.get("giveaway_created", {})) if "giveaway_created" in message_data else None
-        self.giveaway = Giveaway(message_data.get("giveaway", {})) if "giveaway" in message_data else None
-        self.giveaway_winners = GiveawayWinners(message_data.get("giveaway_winners", {})) if "giveaway_winners" in message_data else None
-        self.giveaway_completed = GiveawayCompleted(message_data.get("giveaway_completed", {})) if "giveaway_completed" in message_data else None
-        
-        # Video chats
-        self.video_chat_scheduled = VideoChatScheduled(message_data.get("video_chat_scheduled", {})) if "video_chat_scheduled" in message_data else None
-        self.video_chat_started = VideoChatStarted(message_data.get("video_chat_started", {})) if "video_chat_started" in message_data else None
-        self.video_chat_ended = VideoChatEnded(message_data.get("video_chat_ended", {})) if "video_chat_ended" in message_data else None
-        self.video_chat_participants_invited = VideoChatParticipantsInvited(message_data.get("video_chat_participants_invited", {})) if "video_chat_participants_invited" in message_data else None
-        
-        # Web App data
-        self.web_app_data = WebAppData(message_data.get("web_app_data", {})) if "web_app_data" in message_data else None
-        
-        # Request data
-        self.request = TelegramRequest(message_data.get("request", {})) if "request" in message_data else None
-
-class MessageAutoDeleteTimerChanged:
-    def __init__(self, data):
-        self.time = data.get("time", 0)  # час у секундах
-
-class TelegramMessageOrigin:
-    def __init__(self, origin_data):
-        self.message_id = origin_data.get("message_id", None)
-        self.forward_from_user = TelegramUser(origin_data.get("forward_from", {})) if "forward_from" in origin_data else None
-        self.forward_from_chat = TelegramChat(origin_data.get("forward_from_chat", {})) if "forward_from_chat" in origin_data else None
-        self.forward_from_message_id = origin_data.get("forward_from_message_id", None)
-        self.forward_signature = origin_data.get("forward_signature", None)
-        self.forward_sender_name = origin_data.get("forward_sender_name", None)
-        self.forward_date = origin_data.get("forward_date", None)
-
-class MessageEntity:
-    def __init__(self, entity_data):
-        self.type = entity_data.get("type", None)
-        self.offset = entity_data.get("offset", 0)
-        self.length = entity_data.get("length", 0)
-        self.url = entity_data.get("url", None)
-        self.user = TelegramUser(entity_data.get("user", {})) if "user" in entity_data else None
-        self.language = entity_data.get("language", None)
-        self.custom_emoji_id = entity_data.get("custom_emoji_id", None)
-
-class TelegramChat:
-    def __init__(self, chat_data):
-        self.id = chat_data.get("id", None)
-        self.type = chat_data.get("type", None)
-        self.title = chat_data.get("title", None)
-        self.username = chat_data.get("username", None)
-        self.first_name = chat_data.get("first_name", None)
-        self.last_name = chat_data.get("last_name", None)
-        self.is_forum = chat_data.get("is_forum", False)
-        self.photo = TelegramChatPhoto(chat_data.get("photo", {})) if "photo" in chat_data else None
-        self.bio = chat_data.get("bio", None)
-        self.has_private_forwards = chat_data.get("has_private_forwards", False)
-        self.has_restricted_voice_and_video_messages = chat_data.get("has_restricted_voice_and_video_messages", False)
-        self.join_to_send_messages = chat_data.get("join_to_send_messages", False)
-        self.join_by_request = chat_data.get("join_by_request", False)
-        self.description = chat_data.get("description", None)
-        self.invite_link = chat_data.get("invite_link", None)
-        self.pinned_message = TelegramMessage(chat_data.get("pinned_message", {})) if "pinned_message" in chat_data else None
-        self.permissions = TelegramChatPermissions(chat_data.get("permissions", {})) if "permissions" in chat_data else None
-        self.slow_mode_delay = chat_data.get("slow_mode_delay", None)
-        self.message_auto_delete_time = chat_data.get("message_auto_delete_time", None)
-        self.has_aggressive_anti_spam_enabled = chat_data.get("has_aggressive_anti_spam_enabled", False)
-        self.has_hidden_members = chat_data.get("has_hidden_members", False)
-        self.has_protected_content = chat_data.get("has_protected_content", False)
-
-class TelegramChat:
-    def __init__(self, chat_data):
-        self.id = chat_data.get("id", None)
-        self.type = chat_data.get("type", None)
-        self.title = chat_data.get("title", None)
-        self.username = chat_data.get("username", None)
-        self.first_name = chat_data.get("first_name", None)
-        self.last_name = chat_data.get("last_name", None)
-        self.is_forum = chat_data.get("is_forum", False)
-        self.photo = TelegramChatPhoto(chat_data.get("photo", {})) if "photo" in chat_data else None
-        self.bio = chat_data.get("bio", None)
-        self.has_private_forwards = chat_data.get("has_private_forwards", False)
-        self.has_restricted_voice_and_video_messages = chat_data.get("has_restricted_voice_and_video_messages", False)
-        self.join_to_send_messages = chat_data.get("join_to_send_messages", False)
-        self.join_by_request = chat_data.get("join_by_request", False)
-        self.description = chat_data.get("description", None)
-        self.invite_link = chat_data.get("invite_link", None)
-        self.pinned_message = TelegramMessage(chat_data.get("pinned_message", {})) if "pinned_message" in chat_data else None
-        self.permissions = TelegramChatPermissions(chat_data.get("permissions", {})) if "permissions" in chat_data else None
-        self.slow_mode_delay = chat_data.get("slow_mode_delay", None)
-        self.message_auto_delete_time = chat_data.get("message_auto_delete_time", None)
-        self.has_aggressive_anti_spam_enabled = chat_data.get("has_aggressive_anti_spam_enabled", False)
-        self.has_hidden_members = chat_data.get("has_hidden_members", False)
-        self.has_protected_content = chat_data.get("has_protected_content", False)
-
-class TelegramChatPhoto:
-    def __init__(self, photo_data):
-        self.small_file_id = photo_data.get("small_file_id", None)
-        self.small_file_unique_id = photo_data.get("small_file_unique_id", None)
-        self.big_file_id = photo_data.get("big_file_id", None)
-        self.big_file_unique_id = photo_data.get("big_file_unique_id", None)
-
-class TelegramUser:
-    def __init__(self, user_data):
-        self.id = user_data.get("id", None)
-        self.is_bot = user_data.get("is_bot", False)
-        self.first_name = user_data.get("first_name", "")
-        self.last_name = user_data.get("last_name", None)
-        self.username = user_data.get("username", None)
-        self.language_code = user_data.get("language_code", None)
-        self.is_premium = user_data.get("is_premium", False)
-        self.added_to_attachment_menu = user_data.get("added_to_attachment_menu", False)
-        self.can_join_groups = user_data.get("can_join_groups", True)
-        self.can_read_all_group_messages = user_data.get("can_read_all_group_messages", False)
-        self.supports_inline_queries = user_data.get("supports_inline_queries", False)
-
-        self.all_name = f"{self.first_name} {self.last_name}".strip()
-
-class ExternalReplyInfo:
-    def __init__(self, data):
-        self.reply_id = data.get("reply_id")
-        self.external_source = data.get("external_source")
-        self.timestamp = data.get("timestamp")
-
-class TextQuote:
-    def __init__(self, data):
-        self.quote_text = data.get("quote_text")
-        self.author = data.get("author")
-        self.timestamp = data.get("timestamp")
-
-class Story:
-    def __init__(self, data):
-        self.story_id = data.get("story_id")
-        self.author = data.get("author")
-        self.timestamp = data.get("timestamp")
+class _Field:
+    __slots__ = ("key", "default", "name")
+
+    def __init__(self, key=None, default=None):
+        self.key = key
+        self.default = default
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        if self.key is None:
+            self.key = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        cache = obj._cache
+        if cache is not None and self.name in cache:
+            return cache[self.name]
+        return obj._data.get(self.key, self.default)
+
+    def __set__(self, obj, value):
+        if obj._cache is None:
+            obj._cache = {}
+        obj._cache[self.name] = value
+
+class _Object(_Field):
+    __slots__ = ("cls", "always")
+
+    # always=True: об'єкт створюється навіть коли ключа немає (як було раніше)
+    def __init__(self, cls, key=None, always=False):
+        super().__init__(key)
+        self.cls = cls
+        self.always = always
+
+    def build(self, data):
+        if data is None and not self.always:
+            return None
+        return self.cls(data or {})
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        cache = obj._cache
+        if cache is None:
+            cache = obj._cache = {}
+        elif self.name in cache:
+            return cache[self.name]
+        if isinstance(self.cls, str):
+            # Для типу без власного класу моделі повертаємо сам словник з відповіді
+            self.cls = globals().get(self.cls, dict)
+        value = cache[self.name] = self.build(obj._data.get(self.key))
+        return value
+
+class _List(_Object):
+    __slots__ = ()
+
+    def build(self, data):
+        return [self.cls(item) for item in data or ()]
+
+class LazyModel:
+    # Вкладені об'єкти будуються лише при першому зверненні до атрибута;
+    # __dict__ лишає змогу додавати моделям власні атрибути, як до переходу на __slots__
+    __slots__ = ("_data", "_cache", "__dict__")
 
-class LinkPreviewOptions:
     def __init__(self, data):
-        self.preview_enabled = data.get("preview_enabled", False)
-        self.url = data.get("url")
-        self.title = data.get("title")
-        self.description = data.get("description")
-
-class TelegramVoice:
-    def __init__(self, voice_data):
-        self.file_id = voice_data["file_id"]
-        self.file_unique_id = voice_data["file_unique_id"]
-        self.duration = voice_data["duration"]
-        self.mime_type = voice_data.get("mime_type")
-        self.file_size = voice_data.get("file_size")
-
-class TelegramAudio:
-    def __init__(self, audio_data):
-        self.file_id = audio_data.get("file_id", None)
-        self.file_unique_id = audio_data.get("file_unique_id", None)
-        self.duration = audio_data.get("duration", None)
-        self.performer = audio_data.get("performer", None)
-        self.title = audio_data.get("title", None)
-        self.mime_type = audio_data.get("mime_type", None)
-        self.file_size = audio_data.get("file_size", None)
-        self.thumb = TelegramPhoto(audio_data.get("thumb", {})) if "thumb" in audio_data else None
-
-class TelegramDocument:
-    def __init__(self, document_data):
-        self.file_id = document_data.get("file_id", None)
-        self.file_unique_id = document_data.get("file_unique_id", None)
-        self.thumb = TelegramPhoto(document_data.get("thumb", {})) if "thumb" in document_data else None
-        self.file_name = document_data.get("file_name", None)
-        self.mime_type = document_data.get("mime_type", None)
-        self.file_size = document_data.get("file_size", None)
-
-class TelegramVideo:
-    def __init__(self, video_data):
-        self.file_id = video_data["file_id"]
-        self.file_unique_id = video_data["file_unique_id"]
-        self.width = video_data["width"]
-        self.height = video_data["height"]
-        self.duration = video_data["duration"]
-        self.mime_type = video_data.get("mime_type")
-        self.file_size = video_data.get("file_size")
-
-class TelegramAnimation:
-    def __init__(self, animation_data):
-        self.file_id = animation_data.get("file_id", None)
-        self.file_unique_id = animation_data.get("file_unique_id", None)
-        self.width = animation_data.get("width", None)
-        self.height = animation_data.get("height", None)
-        self.duration = animation_data.get("duration", None)
-        self.thumb = TelegramPhoto(animation_data.get("thumb", {})) if "thumb" in animation_data else None
-        self.file_name = animation_data.get("file_name", None)
-        self.mime_type = animation_data.get("mime_type", None)
-        self.file_size = animation_data.get("file_size", None)
-
-class TelegramPhoto:
-    def __init__(self, photo_data):
-        self.file_id = photo_data.get("file_id", None)
-        self.file_unique_id = photo_data.get("file_unique_id", None)
-        self.width = photo_data.get("width", None)
-        self.height = photo_data.get("height", None)
-        self.file_size = photo_data.get("file_size", None)
-
-class TelegramSticker:
-    def __init__(self, sticker_data):
-        self.file_id = sticker_data.get("file_id", None)
-        self.file_unique_id = sticker_data.get("file_unique_id", None)
-        self.width = sticker_data.get("width", None)
-        self.height = sticker_data.get("height", None)
-        self.is_animated = sticker_data.get("is_animated", False)
-        self.is_video = sticker_data.get("is_video", False)
-        self.thumb = TelegramPhoto(sticker_data.get("thumb", {})) if "thumb" in sticker_data else None
-        self.emoji = sticker_data.get("emoji", None)
-        self.set_name = sticker_data.get("set_name", None)
-        self.mask_position = sticker_data.get("mask_position", None)
-        self.file_size = sticker_data.get("file_size", None)
-
-class TelegramLocation:
-    def __init__(self, location_data):
-        self.longitude = location_data.get("longitude", None)
-        self.latitude = location_data.get("latitude", None)
-        self.horizontal_accuracy = location_data.get("horizontal_accuracy", None)
-        self.live_period = location_data.get("live_period", None)
-        self.heading = location_data.get("heading", None)
-        self.proximity_alert_radius = location_data.get("proximity_alert_radius", None)
-
-class TelegramMaskPosition:
-    def __init__(self, mask_data):
-        self.point = mask_data.get("point", None)
-        self.x_shift = mask_data.get("x_shift", 0.0)
-        self.y_shift = mask_data.get("y_shift", 0.0)
-        self.scale = mask_data.get("scale", 1.0)
-
-class TelegramContact:
-    def __init__(self, contact_data):
-        self.phone_number = contact_data.get("phone_number", None)
-        self.first_name = contact_data.get("first_name", None)
-        self.last_name = contact_data.get("last_name", None)
-        self.user_id = contact_data.get("user_id", None)
-        self.vcard = contact_data.get("vcard", None)  # Візитна картка (якщо є)
-
-class TelegramPoll:
-    def __init__(self, poll_data):
-        self.id = poll_data.get("id", None)
-        self.question = poll_data.get("question", None)
-        self.options = [TelegramPollOption(option) for option in poll_data.get("options", [])]
-        self.is_closed = poll_data.get("is_closed", False)
-
-class TelegramPollOption:
-    def __init__(self, option_data):
-        self.text = option_data.get("text", None)
-        self.voter_count = option_data.get("voter_count", 0)
-
-class TelegramGame:
-    def __init__(self, game_data):
-        self.title = game_data.get("title", None)
-        self.description = game_data.get("description", None)
-        self.photo = [TelegramPhoto(photo) for photo in game_data.get("photo", [])]
-        self.text = game_data.get("text", None)
-        self.text_entities = [TelegramMessageEntity(entity) for entity in game_data.get("text_entities", [])]
-        self.animation = TelegramAnimation(game_data.get("animation", {})) if "animation" in game_data else None
-
-class TelegramVenue:
-    def __init__(self, venue_data):
-        self.location = TelegramLocation(venue_data.get("location", {}))
-        self.title = venue_data.get("title", None)
-        self.address = venue_data.get("address", None)
-        self.foursquare_id = venue_data.get("foursquare_id", None)
-        self.foursquare_type = venue_data.get("foursquare_type", None)
-
-class WebAppData:
-    def __init__(self, web_app_data):
-        self.data = web_app_data.get("data", None)
-        self.button_text = web_app_data.get("button_text", None)
-
-class TelegramPAY:
-    def __init__(self, pay_data):
-        self.id = pay_data["id"]
-        self.currency = pay_data["currency"]
-        self.total_amount = pay_data["total_amount"]
-        self.payment_method = pay_data.get("payment_method", "unknown")
-
-class TelegramSuccessfulPayment:
-    def __init__(self, payment_data):
-        self.chat_id = payment_data.get("chat", {}).get("id", None)
-        self.currency = payment_data.get("currency", None)
-        self.total_amount = payment_data.get("total_amount", None)
-        self.invoice_payload = payment_data.get("invoice_payload", None)
-        self.shipping_option_id = payment_data.get("shipping_option_id", None)
-        self.order_info = payment_data.get("order_info", None)
-        self.telegram_payment_charge_id = payment_data.get("telegram_payment_charge_id", None)
-        self.provider_payment_charge_id = payment_data.get("provider_payment_charge_id", None)
-
-class TelegramRefundedPayment:
-    def __init__(self, refunded_data):
-        self.payment_id = refunded_data.get("payment_id", None)
-        self.amount = refunded_data.get("amount", None)
-        self.currency = refunded_data.get("currency", None)
-        self.reason = refunded_data.get("reason", None)
-
-class UsersShared:
-    def __init__(self, shared_data):
-        self.user_ids = shared_data.get("user_ids", [])
-
-class ChatShared:
-    def __init__(self, chat_data):
-        self.chat_id = chat_data.get("chat_id", None)
-        self.shared_by_user = chat_data.get("shared_by_user", None)
-
-class WriteAccessAllowed:
-    def __init__(self, access_data):
-        self.is_allowed = access_data.get("is_allowed", False)
-
-class TelegramPassportData:
-    def __init__(self, passport_data):
-        self.data = passport_data.get("data", None)
-        self.credentials = passport_data.get("credentials", None)
-
-class ProximityAlertTriggered:
-    def __init__(self, alert_data):
-        self.traveler = TelegramUser(alert_data.get("traveler", {}))
-        self.watcher = TelegramUser(alert_data.get("watcher", {}))
-        self.distance = alert_data.get("distance", None)
-
-class ChatBoostAdded:
-    def __init__(self, boost_data):
-        self.boosted_by = TelegramUser(boost_data.get("boosted_by", {}))
-        self.boost_level = boost_data.get("boost_level", None)
-
-class ChatBackground:
-    def __init__(self, background_data):
-        self.image = background_data.get("image", None)
-        self.color = background_data.get("color", None)
-
-class ForumTopicCreated:
-    def __init__(self, topic_data):
-        self.title = topic_data.get("title", None)
-        self.creator = TelegramUser(topic_data.get("creator", {}))
-
-class ForumTopicEdited:
-    def __init__(self, topic_data):
-        self.title = topic_data.get("title", None)
-        self.edited_by = TelegramUser(topic_data.get("edited_by", {}))
-
-class ForumTopicClosed:
-    def __init__(self, topic_data):
-        self.closed_by = TelegramUser(topic_data.get("closed_by", {}))
-
-class ForumTopicReopened:
-    def __init__(self, topic_data):
-        self.reopened_by = TelegramUser(topic_data.get("reopened_by", {}))
-
-class GeneralForumTopicHidden:
-    def __init__(self, topic_data):
-        self.hidden_by = TelegramUser(topic_data.get("hidden_by", {}))
-
-class GeneralForumTopicUnhidden:
-    def __init__(self, topic_data):
-        self.unhidden_by = TelegramUser(topic_data.get("unhidden_by", {}))
-
-class GiveawayCreated:
-    def __init__(self, giveaway_data):
-        self.title = giveaway_data.get("title", None)
-        self.created_by = TelegramUser(giveaway_data.get("created_by", {}))
-
-class Giveaway:
-    def __init__(self, giveaway_data):
-        self.title = giveaway_data.get("title", None)
-        self.description = giveaway_data.get("description", None)
-
-class GiveawayWinners:
-    def __init__(self, winners_data):
-        self.winner_ids = winners_data.get("winner_ids", [])
-
-class GiveawayCompleted:
-    def __init__(self, giveaway_data):
-        self.completed_by = TelegramUser(giveaway_data.get("completed_by", {}))
-
-class VideoChatScheduled:
-    def __init__(self, chat_data):
-        self.start_time = chat_data.get("start_time", None)
-        self.scheduled_by = TelegramUser(chat_data.get("scheduled_by", {}))
-
-class VideoChatStarted:
-    def __init__(self, chat_data):
-        self.started_by = TelegramUser(chat_data.get("started_by", {}))
-
-class VideoChatEnded:
-    def __init__(self, chat_data):
-        self.ended_by = TelegramUser(chat_data.get("ended_by", {}))
-        self.duration = chat_data.get("duration", None)
-
-class VideoChatParticipantsInvited:
-    def __init__(self, chat_data):
-        self.invitees = [TelegramUser(user) for user in chat_data.get("invitees", [])]
-
-class TelegramRequest:
-    def __init__(self, request_data):
-        self.request_id = request_data.get("request_id", None)
-        self.user = TelegramUser(request_data.get("user", {}))
-        self.data = request_data.get("data", None)
+        self._data = data
+        self._cache = None
+
+class TelegramMessage(LazyModel):
+    __slots__ = ()
+
+    @property
+    def chat_id(self):
+        return self._data["chat"]["id"]
+
+    # Mandatory fields
+    message_id = _Field()
+    text = _Field(default="")
+    # Заповнюються роутером команд: "/start@bot a b" -> command="start", args=["a", "b"]
+    command = _Field(default=None)
+    args = _Field(default=())
+    # Результат re.search для message_text(mode="regex")
+    match = _Field(default=None)
+    from_user = _Object("TelegramUser", "from", always=True)
+    chat = _Object("TelegramChat", always=True)
+
+    # Optional fields
+    message_thread_id = _Field()
+    sender_chat = _Object("TelegramChat", always=True)
+    sender_boost_count = _Field()
+    sender_business_bot = _Object("TelegramUser", always=True)
+    date = _Field()
+    business_connection_id = _Field(default="")
+    forward_origin = _Object("TelegramMessageOrigin", always=True)
+    is_topic_message = _Field(default=False)
+    is_automatic_forward = _Field(default=False)
+    reply_to_message = _Object("TelegramMessage")
+    external_reply = _Object("ExternalReplyInfo", always=True)
+    quote = _Object("TextQuote", always=True)
+    reply_to_story = _Object("Story", always=True)
+    via_bot = _Object("TelegramUser", always=True)
+    edit_date = _Field()
+    has_protected_content = _Field(default=False)
+    is_from_offline = _Field(default=False)
+    media_group_id = _Field()
+    author_signature = _Field()
+    entities = _List("MessageEntity")
+    link_preview_options = _Object("LinkPreviewOptions", always=True)
+    effect_id = _Field()
+
+    # Media
+    photo = _List("TelegramPhoto")
+    sticker = _Object("TelegramSticker")
+    animation = _Object("TelegramAnimation")
+    audio = _Object("TelegramAudio")
+    document = _Object("TelegramDocument")
+    video = _Object("TelegramVideo")
+    video_note = _Object("TelegramVideoNote")
+    voice = _Object("TelegramVoice")
+
+    # Other content
+    caption = _Field()
+    caption_entities = _List("MessageEntity")
+    show_caption_above_media = _Field(default=False)
+    has_media_spoiler = _Field(default=False)
+    contact = _Object("TelegramContact")
+    dice = _Object("TelegramDice")
+    game = _Object("TelegramGame")
+    poll = _Object("TelegramPoll")
+    venue = _Object("TelegramVenue")
+    location = _Object("TelegramLocation")
+
+    # Chat-related service messages
+    new_chat_members = _List("TelegramUser")
+    left_chat_member = _Object("TelegramUser")
+    new_chat_title = _Field()
+    new_chat_photo = _List("TelegramPhoto")
+    delete_chat_photo = _Field(default=False)
+    group_chat_created = _Field(default=False)
+    supergroup_chat_created = _Field(default=False)
+    channel_chat_created = _Field(default=False)
+    message_auto_delete_timer_changed = _Object("MessageAutoDeleteTimerChanged", always=True)
+    migrate_to_chat_id = _Field()
+    migrate_from_chat_id = _Field()
+    pinned_message = _Object("TelegramMessage")
+
+    # Payment messages
+    invoice = _Object("TelegramInvoice")
+    successful_payment = _Object("TelegramSuccessfulPayment")
+    refunded_payment = _Object("TelegramRefundedPayment")
+
+    # Special service messages
+    users_shared = _Object("UsersShared")
+    chat_shared = _Object("ChatShared")
+    connected_website = _Field()
+    write_access_allowed = _Object("WriteAccessAllowed")
+    passport_data = _Object("TelegramPassportData")
+    proximity_alert_triggered = _Object("ProximityAlertTriggered", always=True)
+    boost_added = _Object("ChatBoostAdded")
+    chat_background_set = _Object("ChatBackground")
+
+    # Forum topics
+    forum_topic_created = _Object("ForumTopicCreated")
+    forum_topic_edited = _Object("ForumTopicEdited")
+    forum_topic_closed = _Object("ForumTopicClosed")
+    forum_topic_reopened = _Object("ForumTopicReopened")
+    general_forum_topic_hidden = _Object("GeneralForumTopicHidden")
+    general_forum_topic_unhidden = _Object("GeneralForumTopicUnhidden")
+
+    # Giveaways
+    giveaway_created = _Object("GiveawayCreated")
+    giveaway = _Object("Giveaway")
+    giveaway_winners = _Object("GiveawayWinners")
+    giveaway_completed = _Object("GiveawayCompleted")
+
+    # Video chats
+    video_chat_scheduled = _Object("VideoChatScheduled")
+    video_chat_started = _Object("VideoChatStarted")
+    video_chat_ended = _Object("VideoChatEnded")
+    video_chat_participants_invited = _Object("VideoChatParticipantsInvited")
+
+    # Web App data
+    web_app_data = _Object("WebAppData")
+
+    # Request data
+    request = _Object("TelegramRequest")
+
+class MessageAutoDeleteTimerChanged(LazyModel):
+    __slots__ = ()
+    time = _Field(default=0)  # час у секундах
+
+class TelegramMessageOrigin(LazyModel):
+    __slots__ = ()
+    message_id = _Field()
+    forward_from_user = _Object("TelegramUser", "forward_from")
+    forward_from_chat = _Object("TelegramChat")
+    forward_from_message_id = _Field()
+    forward_signature = _Field()
+    forward_sender_name = _Field()
+    forward_date = _Field()
+
+class MessageEntity(LazyModel):
+    __slots__ = ()
+    type = _Field()
+    offset = _Field(default=0)
+    length = _Field(default=0)
+    url = _Field()
+    user = _Object("TelegramUser")
+    language = _Field()
+    custom_emoji_id = _Field()
+
+class TelegramChat(LazyModel):
+    __slots__ = ()
+    id = _Field()
+    type = _Field()
+    title = _Field()
+    username = _Field()
+    first_name = _Field()
+    last_name = _Field()
+    is_forum = _Field(default=False)
+    photo = _Object("TelegramChatPhoto")
+    bio = _Field()
+    has_private_forwards = _Field(default=False)
+    has_restricted_voice_and_video_messages = _Field(default=False)
+    join_to_send_messages = _Field(default=False)
+    join_by_request = _Field(default=False)
+    description = _Field()
+    invite_link = _Field()
+    pinned_message = _Object("TelegramMessage")
+    permissions = _Object("TelegramChatPermissions")
+    slow_mode_delay = _Field()
+    message_auto_delete_time = _Field()
+    has_aggressive_anti_spam_enabled = _Field(default=False)
+    has_hidden_members = _Field(default=False)
+    has_protected_content = _Field(default=False)
+
+class TelegramChatPermissions(LazyModel):
+    __slots__ = ()
+    can_send_messages = _Field(default=False)
+    can_send_audios = _Field(default=False)
+    can_send_documents = _Field(default=False)
+    can_send_photos = _Field(default=False)
+    can_send_videos = _Field(default=False)
+    can_send_video_notes = _Field(default=False)
+    can_send_voice_notes = _Field(default=False)
+    can_send_polls = _Field(default=False)
+    can_send_other_messages = _Field(default=False)
+    can_add_web_page_previews = _Field(default=False)
+    can_change_info = _Field(default=False)
+    can_invite_users = _Field(default=False)
+    can_pin_messages = _Field(default=False)
+    can_manage_topics = _Field(default=False)
+
+class TelegramChatPhoto(LazyModel):
+    __slots__ = ()
+    small_file_id = _Field()
+    small_file_unique_id = _Field()
+    big_file_id = _Field()
+    big_file_unique_id = _Field()
+
+class TelegramUser(LazyModel):
+    __slots__ = ()
+    id = _Field()
+    is_bot = _Field(default=False)
+    first_name = _Field(default="")
+    last_name = _Field()
+    username = _Field()
+    language_code = _Field()
+    is_premium = _Field(default=False)
+    added_to_attachment_menu = _Field(default=False)
+    can_join_groups = _Field(default=True)
+    can_read_all_group_messages = _Field(default=False)
+    supports_inline_queries = _Field(default=False)
+
+    @property
+    def all_name(self):
+        return f"{self.first_name} {self.last_name}".strip()
+
+class ExternalReplyInfo(LazyModel):
+    __slots__ = ()
+    reply_id = _Field()
+    external_source = _Field()
+    timestamp = _Field()
+
+class TextQuote(LazyModel):
+    __slots__ = ()
+    quote_text = _Field()
+    author = _Field()
+    timestamp = _Field()
+
+class Story(LazyModel):
+    __slots__ = ()
+    story_id = _Field()
+    author = _Field()
+    timestamp = _Field()
+
+class LinkPreviewOptions(LazyModel):
+    __slots__ = ()
+    preview_enabled = _Field(default=False)
+    url = _Field()
+    title = _Field()
+    description = _Field()
+
+class TelegramVoice(LazyModel):
+    __slots__ = ()
+    file_id = _Field()
+    file_unique_id = _Field()
+    duration = _Field()
+    mime_type = _Field()
+    file_size = _Field()
+
+class TelegramAudio(LazyModel):
+    __slots__ = ()
+    file_id = _Field()
+    file_unique_id = _Field()
+    duration = _Field()
+    performer = _Field()
+    title = _Field()
+    mime_type = _Field()
+    file_size = _Field()
+    thumb = _Object("TelegramPhoto")
+
+class TelegramDocument(LazyModel):
+    __slots__ = ()
+    file_id = _Field()
+    file_unique_id = _Field()
+    thumb = _Object("TelegramPhoto")
+    file_name = _Field()
+    mime_type = _Field()
+    file_size = _Field()
+
+class TelegramVideo(LazyModel):
+    __slots__ = ()
+    file_id = _Field()
+    file_unique_id = _Field()
+    width = _Field()
+    height = _Field()
+    duration = _Field()
+    mime_type = _Field()
+    file_size = _Field()
+
+class TelegramVideoNote(LazyModel):
+    __slots__ = ()
+    file_id = _Field()
+    file_unique_id = _Field()
+    length = _Field()
+    duration = _Field()
+    thumb = _Object("TelegramPhoto", "thumbnail")
+    file_size = _Field()
+
+class TelegramAnimation(LazyModel):
+    __slots__ = ()
+    file_id = _Field()
+    file_unique_id = _Field()
+    width = _Field()
+    height = _Field()
+    duration = _Field()
+    thumb = _Object("TelegramPhoto")
+    file_name = _Field()
+    mime_type = _Field()
+    file_size = _Field()
+
+class TelegramPhoto(LazyModel):
+    __slots__ = ()
+    file_id = _Field()
+    file_unique_id = _Field()
+    width = _Field()
+    height = _Field()
+    file_size = _Field()
+
+class TelegramSticker(LazyModel):
+    __slots__ = ()
+    file_id = _Field()
+    file_unique_id = _Field()
+    width = _Field()
+    height = _Field()
+    is_animated = _Field(default=False)
+    is_video = _Field(default=False)
+    thumb = _Object("TelegramPhoto")
+    emoji = _Field()
+    set_name = _Field()
+    mask_position = _Field()
+    file_size = _Field()
+
+class TelegramLocation(LazyModel):
+    __slots__ = ()
+    longitude = _Field()
+    latitude = _Field()
+    horizontal_accuracy = _Field()
+    live_period = _Field()
+    heading = _Field()
+    proximity_alert_radius = _Field()
+
+class TelegramMaskPosition(LazyModel):
+    __slots__ = ()
+    point = _Field()
+    x_shift = _Field(default=0.0)
+    y_shift = _Field(default=0.0)
+    scale = _Field(default=1.0)
+
+class TelegramContact(LazyModel):
+    __slots__ = ()
+    phone_number = _Field()
+    first_name = _Field()
+    last_name = _Field()
+    user_id = _Field()
+    vcard = _Field()  # Візитна картка (якщо є)
+
+class TelegramDice(LazyModel):
+    __slots__ = ()
+    emoji = _Field()
+    value = _Field()
+
+class TelegramPoll(LazyModel):
+    __slots__ = ()
+    id = _Field()
+    question = _Field()
+    options = _List("TelegramPollOption")
+    is_closed = _Field(default=False)
+
+class TelegramPollOption(LazyModel):
+    __slots__ = ()
+    text = _Field()
+    voter_count = _Field(default=0)
+
+class TelegramGame(LazyModel):
+    __slots__ = ()
+    title = _Field()
+    description = _Field()
+    photo = _List("TelegramPhoto")
+    text = _Field()
+    text_entities = _List("MessageEntity")
+    animation = _Object("TelegramAnimation")
+
+class TelegramVenue(LazyModel):
+    __slots__ = ()
+    location = _Object("TelegramLocation", always=True)
+    title = _Field()
+    address = _Field()
+    foursquare_id = _Field()
+    foursquare_type = _Field()
+
+class WebAppData(LazyModel):
+    __slots__ = ()
+    data = _Field()
+    button_text = _Field()
+
+class TelegramCallbackQuery(LazyModel):
+    __slots__ = ()
+
+    @property
+    def chat_id(self):
+        return self._data.get("message", {}).get("chat", {}).get("id")
+
+    id = _Field()
+    from_user = _Object("TelegramUser", "from", always=True)
+    message = _Object("TelegramMessage")
+    inline_message_id = _Field()
+    chat_instance = _Field()
+    data = _Field()
+    game_short_name = _Field()
+    # Заповнюється роутером, якщо обробник зареєстровано з CallbackData
+    values = _Field(default=None)
+
+class TelegramPAY(LazyModel):
+    __slots__ = ()
+    id = _Field()
+    currency = _Field()
+    total_amount = _Field()
+    payment_method = _Field(default="unknown")
+
+class TelegramInvoice(LazyModel):
+    __slots__ = ()
+    title = _Field()
+    description = _Field()
+    start_parameter = _Field()
+    currency = _Field()
+    total_amount = _Field()
+
+class TelegramSuccessfulPayment(LazyModel):
+    __slots__ = ()
+
+    @property
+    def chat_id(self):
+        return self._data.get("chat", {}).get("id", None)
+
+    currency = _Field()
+    total_amount = _Field()
+    invoice_payload = _Field()
+    shipping_option_id = _Field()
+    order_info = _Field()
+    telegram_payment_charge_id = _Field()
+    provider_payment_charge_id = _Field()
+
+class TelegramRefundedPayment(LazyModel):
+    __slots__ = ()
+    payment_id = _Field()
+    amount = _Field()
+    currency = _Field()
+    reason = _Field()
+
+class UsersShared(LazyModel):
+    __slots__ = ()
+
+    @property
+    def user_ids(self):
+        return self._data.get("user_ids", [])
+
+class ChatShared(LazyModel):
+    __slots__ = ()
+    chat_id = _Field()
+    shared_by_user = _Field()
+
+class WriteAccessAllowed(LazyModel):
+    __slots__ = ()
+    is_allowed = _Field(default=False)
+
+class TelegramPassportData(LazyModel):
+    __slots__ = ()
+    data = _Field()
+    credentials = _Field()
+
+class ProximityAlertTriggered(LazyModel):
+    __slots__ = ()
+    traveler = _Object("TelegramUser", always=True)
+    watcher = _Object("TelegramUser", always=True)
+    distance = _Field()
+
+class ChatBoostAdded(LazyModel):
+    __slots__ = ()
+    boosted_by = _Object("TelegramUser", always=True)
+    boost_level = _Field()
+
+class ChatBackground(LazyModel):
+    __slots__ = ()
+    image = _Field()
+    color = _Field()
+
+class ForumTopicCreated(LazyModel):
+    __slots__ = ()
+    title = _Field()
+    creator = _Object("TelegramUser", always=True)
+
+class ForumTopicEdited(LazyModel):
+    __slots__ = ()
+    title = _Field()
+    edited_by = _Object("TelegramUser", always=True)
+
+class ForumTopicClosed(LazyModel):
+    __slots__ = ()
+    closed_by = _Object("TelegramUser", always=True)
+
+class ForumTopicReopened(LazyModel):
+    __slots__ = ()
+    reopened_by = _Object("TelegramUser", always=True)
+
+class GeneralForumTopicHidden(LazyModel):
+    __slots__ = ()
+    hidden_by = _Object("TelegramUser", always=True)
+
+class GeneralForumTopicUnhidden(LazyModel):
+    __slots__ = ()
+    unhidden_by = _Object("TelegramUser", always=True)
+
+class GiveawayCreated(LazyModel):
+    __slots__ = ()
+    title = _Field()
+    created_by = _Object("TelegramUser", always=True)
+
+class Giveaway(LazyModel):
+    __slots__ = ()
+    title = _Field()
+    description = _Field()
+
+class GiveawayWinners(LazyModel):
+    __slots__ = ()
+
+    @property
+    def winner_ids(self):
+        return self._data.get("winner_ids", [])
+
+class GiveawayCompleted(LazyModel):
+    __slots__ = ()
+    completed_by = _Object("TelegramUser", always=True)
+
+class VideoChatScheduled(LazyModel):
+    __slots__ = ()
+    start_time = _Field()
+    scheduled_by = _Object("TelegramUser", always=True)
+
+class VideoChatStarted(LazyModel):
+    __slots__ = ()
+    started_by = _Object("TelegramUser", always=True)
+
+class VideoChatEnded(LazyModel):
+    __slots__ = ()
+    ended_by = _Object("TelegramUser", always=True)
+    duration = _Field()
+
+class VideoChatParticipantsInvited(LazyModel):
+    __slots__ = ()
+    invitees = _List("TelegramUser")
+
+class TelegramRequest(LazyModel):
+    __slots__ = ()
+    request_id = _Field()
+    user = _Object("TelegramUser", always=True)
+    data = _Field()
@@ -0,0 +1,62 @@
+import random
+from .metrics_func import registry
+
+class RetryPolicy:
+    def __init__(self, first_delay=0.5, base_delay=1.0, factor=2.0, max_delay=300.0, jitter=0.5):
+        self.first_delay = first_delay
+        self.base_delay = base_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.attempt = 0
+        self.delay = 0.0
+        self.last_status = None
+        self.retries_total = 0
+
+    def _backoff(self, first):
+        if self.attempt == 1:
+            return first
+        delay = min(self.max_delay, self.base_delay * self.factor ** (self.attempt - 2))
+        # Jitter, щоб кілька ботів не перепідключались одночасно
+        return random.uniform(delay * (1 - self.jitter), delay)
+
+    def next_delay(self, status=None, retry_after=None):
+        self.attempt += 1
+        self.retries_total += 1
+        self.last_status = status
+        if retry_after is not None:
+            # 429: Telegram сам каже, скільки чекати
+            delay = float(retry_after)
+        elif status is None:
+            # Мережева помилка: перша спроба майже одразу
+            delay = self._backoff(self.first_delay)
+        elif status >= 500:
+            delay = self._backoff(self.base_delay)
+        elif status == 429:
+            delay = self._backoff(self.base_delay)
+        else:
+            # 401/404 тощо — невірний токен або конфлікт; часті спроби не допоможуть
+            delay = max(self.max_delay / 10, self._backoff(self.base_delay))
+        self.delay = min(delay, self.max_delay) if retry_after is None else delay
+        return self.delay
+
+    def reset(self):
+        self.attempt = 0
+        self.delay = 0.0
+        self.last_status = None
+
+    def export(self, bot_id, registry=registry):
+        registry.gauge("flastel_retry_attempt", "Номер поточної спроби перепідключення", ("bot",)).set_function(
+            lambda: self.attempt, bot=bot_id)
+        registry.gauge("flastel_retry_delay_seconds", "Пауза перед поточною спробою", ("bot",)).set_function(
+            lambda: self.delay, bot=bot_id)
+        registry.counter("flastel_retries_total", "Усі спроби перепідключення", ("bot",)).set_function(
+            lambda: self.retries_total, bot=bot_id)
+
+    def state(self):
+        return {
+            "attempt": self.attempt,
+            "delay": self.delay,
+            "last_status": self.last_status,
+            "retries_total": self.retries_total,
+        }
@@ -0,0 +1,442 @@
+import re
+import shlex
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+class CommandRoute:
+    __slots__ = ("name", "func", "params", "quoted")
+
+    def __init__(self, name):
+        self.name = name
+        self.func = None
+        self.params = {}
+        self.quoted = False
+
+def split_args(text, quoted=False):
+    if not text:
+        return []
+    if quoted:
+        # Лише для маршрутів з quoted=True: shlex прибирає лапки й зворотні скісні риски
+        try:
+            return shlex.split(text)
+        except ValueError:
+            # Незакриті лапки — ділимо просто по пробілах
+            pass
+    return text.split()
+
+class CommandRouter:
+    def __init__(self, username=None):
+        self.username = username.lower() if username else None
+        self.routes = {}
+        self.exact_routes = {}
+
+    def set_username(self, username):
+        self.username = username.lower() if username else None
+
+    def _route(self, command, case_sensitive):
+        name = command.lstrip("/")
+        routes = self.exact_routes if case_sensitive else self.routes
+        key = name if case_sensitive else name.lower()
+        route = routes.get(key)
+        if route is None:
+            route = routes[key] = CommandRoute(key)
+        return route
+
+    def add(self, command, func, case_sensitive=False, quoted=False):
+        route = self._route(command, case_sensitive)
+        route.func = func
+        route.quoted = route.quoted or quoted
+
+    def add_params(self, command, params, func, case_sensitive=False, quoted=False):
+        route = self._route(command, case_sensitive)
+        route.quoted = route.quoted or quoted
+        for param in params:
+            route.params[param] = func
+
+    def parse(self, text):
+        # "/start@MyBot arg1 arg2" -> ("start", "MyBot", "arg1 arg2")
+        parts = text[1:].split(None, 1)
+        if not parts:
+            return "", "", ""
+        name, _, mention = parts[0].partition("@")
+        return name, mention, parts[1] if len(parts) > 1 else ""
+
+    def match(self, text):
+        name, mention, rest = self.parse(text)
+        if mention and self.username is not None and mention.lower() != self.username:
+            # Команда адресована іншому боту в групі
+            return None
+        # Та сама команда може бути зареєстрована і з урахуванням регістру, і без — беремо обидва маршрути
+        routes = []
+        route = self.exact_routes.get(name) if self.exact_routes else None
+        if route is not None:
+            routes.append(route)
+        route = self.routes.get(name.lower())
+        if route is not None:
+            routes.append(route)
+        if not routes:
+            return None
+        parsed = {}
+        for route in routes:
+            if route.quoted not in parsed:
+                parsed[route.quoted] = split_args(rest, route.quoted)
+        # Перший аргумент, для якого є обробник з параметрами; інакше — звичайний обробник
+        for position in range(max(len(args) for args in parsed.values())):
+            for route in routes:
+                args = parsed[route.quoted]
+                func = route.params.get(args[position]) if position < len(args) else None
+                if func is not None:
+                    return route.name, func, args, True
+        for route in routes:
+            if route.func is not None:
+                return route.name, route.func, parsed[route.quoted], False
+        return None
+
+def group_refs(node, found=None):
+    # Номери груп, на які посилаються \1, (?P=name) і (?(1)...), у порядку появи в шаблоні
+    if found is None:
+        found = []
+    if isinstance(node, sre_parse.SubPattern):
+        for op, value in node:
+            name = str(op)
+            if name.startswith("GROUPREF_EXISTS"):
+                found.append(value[0])
+            elif name.startswith("GROUPREF"):
+                found.append(value)
+            group_refs(value, found)
+    elif isinstance(node, (list, tuple)):
+        for item in node:
+            group_refs(item, found)
+    return found
+
+OCTDIGITS = "01234567"
+
+def name_group_refs(pattern, prefix, refs, groupindex):
+    # У спільному виразі номери груп зсуваються, а \N записує лише два знаки,
+    # тож групи, на які посилаються за номером, стають іменованими
+    names = {number: name for name, number in groupindex.items()}
+    for number in refs:
+        names.setdefault(number, f"{prefix}{number}")
+    out = []
+    group = 0
+    index = 0
+    length = len(pattern)
+    in_class = False
+    while index < length:
+        char = pattern[index]
+        if char == "\\":
+            digit = pattern[index + 1:index + 2]
+            if in_class or not digit or digit not in "123456789":
+                out.append(pattern[index:index + 2])
+                index += 2
+                continue
+            end = index + 2
+            if end < length and pattern[end].isdigit():
+                if digit in OCTDIGITS and pattern[end] in OCTDIGITS and end + 1 < length and pattern[end + 1] in OCTDIGITS:
+                    # \123 — вісімковий код символу, а не посилання
+                    out.append(pattern[index:end + 2])
+                    index = end + 2
+                    continue
+                end += 1
+            name = names.get(int(pattern[index + 1:end]))
+            out.append(f"(?P={name})" if name is not None else pattern[index:end])
+            index = end
+        elif in_class:
+            in_class = char != "]"
+            out.append(char)
+            index += 1
+        elif char == "[":
+            in_class = True
+            end = index + 1
+            # "]" одразу після "[" або "[^" — звичайний символ
+            if pattern.startswith("^", end):
+                end += 1
+            if pattern.startswith("]", end):
+                end += 1
+            out.append(pattern[index:end])
+            index = end
+        elif char == "(":
+            if pattern.startswith("(?(", index):
+                close = pattern.find(")", index)
+                ref = pattern[index + 3:close]
+                name = names.get(int(ref)) if ref.isdigit() else None
+                out.append(f"(?({name})" if name is not None else pattern[index:close + 1])
+                index = close + 1
+            elif pattern.startswith("(?P<", index):
+                group += 1
+                out.append(char)
+                index += 1
+            elif pattern.startswith("(?", index):
+                out.append(char)
+                index += 1
+            else:
+                group += 1
+                out.append(f"(?P<{names[group]}>" if group in refs and group not in groupindex.values() else char)
+                index += 1
+        else:
+            out.append(char)
+            index += 1
+    return "".join(out)
+
+DEFAULT_FLAGS = re.compile("").flags
+
+class TextMatcher:
+    def __init__(self):
+        self.exact = {}
+        self.folded = {}
+        self.prefixes = []
+        self.patterns = []
+        self._trie = None
+        self._regex = None
+        self._regex_built = False
+        self._top = None
+        self._top_index = None
+        self._chunks = None
+        self._separate = None
+
+    def __len__(self):
+        return len(self.exact) + len(self.folded) + len(self.prefixes) + len(self.patterns)
+
+    def add(self, phrase, func, mode="exact", caps_ignore=False):
+        if mode == "exact":
+            if caps_ignore:
+                self.folded[phrase.casefold()] = func
+            else:
+                self.exact[phrase] = func
+        elif mode == "prefix":
+            self.prefixes.append((phrase.casefold() if caps_ignore else phrase, caps_ignore, func))
+            self._trie = None
+        elif mode == "regex":
+            # Компілюємо одразу, щоб помилка в шаблоні була видна під час реєстрації
+            re.compile(phrase, re.IGNORECASE if caps_ignore else 0)
+            self.patterns.append((phrase, caps_ignore, func))
+            self._regex_built = False
+        else:
+            raise ValueError(f"Невідомий режим тексту: {mode}")
+
+    def _build_trie(self):
+        # Два префіксні дерева: з урахуванням регістру і без; кінець фрази — ключ None
+        trie = ({}, {})
+        for phrase, caps_ignore, func in self.prefixes:
+            node = trie[caps_ignore]
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node.setdefault(None, func)
+        self._trie = trie
+        return trie
+
+    def _combinable(self, pattern, order, names):
+        # Текст шаблону для спільного виразу або None, якщо його доведеться перевіряти окремо
+        plain = re.compile(pattern)
+        if plain.flags != DEFAULT_FLAGS:
+            # Глобальний прапорець на кшталт (?i) чи (?x) діяв би на весь спільний вираз
+            return None
+        refs = group_refs(sre_parse.parse(pattern))
+        source = pattern
+        if refs:
+            source = name_group_refs(pattern, f"_ref{order}_", set(refs), plain.groupindex)
+            try:
+                rewritten = re.compile(source)
+            except re.error:
+                return None
+            # Перевіряємо, що посилання ведуть на ті самі групи, що й у вихідному шаблоні
+            if rewritten.groups != plain.groups or group_refs(sre_parse.parse(source)) != refs:
+                return None
+            plain = rewritten
+        if names.intersection(plain.groupindex):
+            return None
+        names.update(plain.groupindex)
+        return source
+
+    def _marked(self, parts):
+        # Вираз, де кожна частина — група-маркер, і таблиця: номер групи -> номер частини
+        index = [None]
+        for number, (source, groups) in enumerate(parts):
+            index.append(number)
+            # Власні групи частини йдуть у нумерації одразу за маркером
+            index.extend([None] * groups)
+        return re.compile("|".join(f"({source})" for source, _ in parts)), index
+
+    def _build_regex(self):
+        entries = []
+        separate = []
+        names = set()
+        for order, (pattern, caps_ignore, func) in enumerate(self.patterns):
+            compiled = re.compile(pattern, re.IGNORECASE if caps_ignore else 0)
+            source = self._combinable(pattern, order, names)
+            if source is None:
+                separate.append((compiled, func, order))
+            else:
+                entries.append((f"(?i:{source})" if caps_ignore else f"(?:{source})", compiled, func, order))
+        self._regex = None
+        self._chunks = []
+        if entries:
+            # Без груп re виносить спільні префікси альтернатив, тож промах відсіюється за один швидкий прохід
+            self._regex = re.compile("|".join(entry[0] for entry in entries))
+            # Один вираз з тисячами груп-маркерів повільний, тож маркери дворівневі: спершу частина, потім шаблон у ній
+            size = int(len(entries) ** 0.5) + 1
+            chunks = [entries[start:start + size] for start in range(0, len(entries), size)]
+            self._top, self._top_index = self._marked(
+                [("|".join(entry[0] for entry in chunk), sum(entry[1].groups for entry in chunk)) for chunk in chunks])
+            for chunk in chunks:
+                regex, index = self._marked([(entry[0], entry[1].groups) for entry in chunk])
+                self._chunks.append((regex, index, chunk))
+        self._separate = separate
+        self._regex_built = True
+
+    def _match_prefix(self, text, node):
+        found = node.get(None)
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            # Найдовший префікс перемагає
+            found = node.get(None, found)
+        return found
+
+    def match(self, text):
+        func = self.exact.get(text)
+        if func is None and self.folded:
+            func = self.folded.get(text.casefold())
+        if func is not None:
+            return func, None
+        if self.prefixes:
+            trie = self._trie or self._build_trie()
+            func = self._match_prefix(text, trie[False])
+            if func is None and trie[True]:
+                func = self._match_prefix(text.casefold(), trie[True])
+            if func is not None:
+                return func, None
+        if self.patterns:
+            if not self._regex_built:
+                self._build_regex()
+            # Пріоритет для всіх шаблонів: найлівіший збіг, а на одній позиції — раніше зареєстрований
+            best = None
+            hit = self._regex.search(text) if self._regex is not None else None
+            if hit is not None:
+                start = hit.start()
+                # m.lastindex — номер групи-маркера, що спрацювала першою серед альтернатив
+                regex, index, chunk = self._chunks[self._top_index[self._top.match(text, start).lastindex]]
+                _, pattern, func, order = chunk[index[regex.match(text, start).lastindex]]
+                # Повторний match лише в цій позиції дає об'єкт з номерами груп самого шаблону
+                best = (start, order, func, pattern.match(text, start))
+            for pattern, func, order in self._separate:
+                found = pattern.search(text)
+                if found is not None and (best is None or (found.start(), order) < best[:2]):
+                    best = (found.start(), order, func, found)
+            if best is not None:
+                return best[2], best[3]
+        return None
+
+CALLBACK_DATA_LIMIT = 64
+DIGITS36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+def to_base36(value):
+    if value == 0:
+        return "0"
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    digits = []
+    while value:
+        value, rest = divmod(value, 36)
+        digits.append(DIGITS36[rest])
+    return sign + "".join(reversed(digits))
+
+class CallbackData:
+    # CallbackData("item", id=int, action=str).pack(id=1234, action="buy") -> "item:ya:buy"
+    def __init__(self, prefix, sep=":", **fields):
+        if sep in prefix:
+            raise ValueError(f"Префікс не може містити '{sep}'")
+        self.prefix = prefix
+        self.sep = sep
+        self.fields = fields
+
+    @property
+    def pattern(self):
+        return f"{self.prefix}{self.sep}*"
+
+    def _encode(self, name, kind, value):
+        if value is None:
+            return ""
+        if kind is bool:
+            return "1" if value else "0"
+        if kind is int:
+            # Числа в base36 — коротші за десяткові приблизно на третину
+            return to_base36(int(value))
+        value = str(value)
+        if self.sep in value:
+            raise ValueError(f"Поле {name} не може містити '{self.sep}'")
+        return value
+
+    def _decode(self, kind, value):
+        if value == "":
+            return None
+        if kind is bool:
+            return value == "1"
+        if kind is int:
+            return int(value, 36)
+        return kind(value)
+
+    def pack(self, **values):
+        parts = [self.prefix]
+        for name, kind in self.fields.items():
+            parts.append(self._encode(name, kind, values.get(name)))
+        data = self.sep.join(parts)
+        if len(data.encode()) > CALLBACK_DATA_LIMIT:
+            raise ValueError(f"callback_data довша за {CALLBACK_DATA_LIMIT} байти: {data}")
+        return data
+
+    def unpack(self, data):
+        parts = data.split(self.sep)
+        if parts[0] != self.prefix or len(parts) != len(self.fields) + 1:
+            raise ValueError(f"callback_data не відповідає {self.prefix}: {data}")
+        return {name: self._decode(kind, value)
+                for (name, kind), value in zip(self.fields.items(), parts[1:])}
+
+class CallbackRouter:
+    def __init__(self):
+        self.exact = {}
+        self.trie = {}
+        self.any = []
+        self._order = 0
+
+    def _next(self):
+        self._order += 1
+        return self._order
+
+    def add(self, func, callback_data=None):
+        if callback_data is None:
+            self.any.append((self._next(), func, None))
+            return
+        if isinstance(callback_data, (str, CallbackData)):
+            callback_data = [callback_data]
+        for data in callback_data:
+            codec = None
+            if isinstance(data, CallbackData):
+                codec, data = data, data.pattern
+            entry = (self._next(), func, codec)
+            if data.endswith("*"):
+                node = self.trie
+                for char in data[:-1]:
+                    node = node.setdefault(char, {})
+                node.setdefault(None, []).append(entry)
+            else:
+                self.exact.setdefault(data, []).append(entry)
+
+    def match(self, data):
+        # Усі відповідні обробники в порядку реєстрації: точні, префіксні та загальні
+        found = list(self.exact.get(data, ())) if data is not None else []
+        if data is not None and self.trie:
+            node = self.trie
+            found.extend(node.get(None, ()))
+            for char in data:
+                node = node.get(char)
+                if node is None:
+                    break
+                found.extend(node.get(None, ()))
+        found.extend(self.any)
+        if len(found) > 1:
+            found.sort(key=lambda entry: entry[0])
+        return found
@@ -0,0 +1,272 @@
+import time
+import zlib
+import heapq
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+def _parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"Невірний крок cron: {field}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Значення cron поза межами {low}-{high}: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CalendarSchedule:
+    # Спільна основа для timer(data, moon, time) та cron: дні й години перевіряються окремо
+    def __init__(self, times, days=None, months=None, weekdays=None, day_or=False):
+        self.times = sorted(set(times))
+        self.days = set(days) if days else None
+        self.months = set(months) if months else None
+        self.weekdays = set(weekdays) if weekdays else None
+        self.day_or = day_or
+        if not self.times:
+            raise ValueError("Розклад без жодного часу запуску")
+
+    def _day_matches(self, day):
+        if self.months is not None and day.month not in self.months:
+            return False
+        day_ok = self.days is None or day.day in self.days
+        weekday_ok = self.weekdays is None or day.weekday() in self.weekdays
+        if self.day_or:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        moment = moment.replace(second=0, microsecond=0)
+        current = (moment.hour, moment.minute)
+        day = moment.date()
+        # 29 лютого може бути лише раз на чотири роки
+        for _ in range(366 * 5):
+            if self._day_matches(day):
+                for hour, minute in self.times:
+                    if day != moment.date() or (hour, minute) > current:
+                        return datetime(day.year, day.month, day.day, hour, minute)
+            day += timedelta(days=1)
+        raise ValueError("Розклад ніколи не спрацює")
+
+    def fingerprint(self):
+        # Сховища зберігають лише цілі числа, тому опис розкладу стискається до crc32
+        parts = (self.times, sorted(self.days or ()), sorted(self.months or ()), sorted(self.weekdays or ()), self.day_or)
+        return zlib.crc32(repr(("calendar",) + parts).encode())
+
+class CronSchedule(CalendarSchedule):
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron має містити 5 полів: {expression}")
+        minutes, hours, days, months, weekdays = (
+            _parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_RANGES)
+        )
+        # У cron неділя — 0 або 7, у Python понеділок — 0
+        weekdays = {(day - 1) % 7 for day in weekdays}
+        restricted_days = fields[2] != '*'
+        restricted_weekdays = fields[4] != '*'
+        super().__init__(
+            [(hour, minute) for hour in hours for minute in minutes],
+            days=days if restricted_days else None,
+            months=months if fields[3] != '*' else None,
+            weekdays=weekdays if restricted_weekdays else None,
+            day_or=restricted_days and restricted_weekdays,
+        )
+        self.expression = expression
+
+class IntervalSchedule:
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise ValueError("Інтервал має бути додатним")
+        self.seconds = seconds
+
+    def next_after(self, moment):
+        return moment + timedelta(seconds=self.seconds)
+
+    def fingerprint(self):
+        return zlib.crc32(repr(("interval", float(self.seconds))).encode())
+
+def make_schedule(data=None, moon=None, time=None, cron=None, every=None):
+    if cron is not None:
+        return CronSchedule(cron)
+    if every is not None:
+        return IntervalSchedule(every.total_seconds() if isinstance(every, timedelta) else every)
+    if not time:
+        raise ValueError("Потрібно вказати time, cron або every")
+    times = [tuple(int(part) for part in t.split(':')) for t in time]
+    return CalendarSchedule(times, days=[int(day) for day in data or ()], months=moon)
+
+class TimerJob:
+    __slots__ = ("name", "schedule", "func", "next_run", "task")
+
+    def __init__(self, name, schedule, func):
+        self.name = name
+        self.schedule = schedule
+        self.func = func
+        self.next_run = None
+        self.task = None
+
+class TimerScheduler:
+    def __init__(self, store=None, prefix="timer:", max_sleep=300.0):
+        self.store = store
+        self.prefix = prefix
+        self.max_sleep = max_sleep
+        self.jobs = {}
+        self._heap = []
+        self._counter = 0
+        self._wakeup = None
+        self._running = set()
+
+    def add(self, name, schedule, func):
+        if name in self.jobs:
+            raise ValueError(f"Таймер {name} вже зареєстровано")
+        job = self.jobs[name] = TimerJob(name, schedule, func)
+        if self._wakeup is not None:
+            self._push(job, self._next_run(job, time.time()))
+            self._wakeup.set()
+        return job
+
+    def _push(self, job, next_run):
+        job.next_run = next_run
+        self._counter += 1
+        heapq.heappush(self._heap, (next_run, self._counter, job))
+
+    def _next_run(self, job, after):
+        return job.schedule.next_after(datetime.fromtimestamp(after)).timestamp()
+
+    def _load(self, job):
+        if self.store is None:
+            return 0, 0
+        key = self.prefix + job.name
+        return self.store.load(key), self.store.load(key + ":schedule")
+
+    def _save(self, job, next_run):
+        if self.store is not None:
+            key = self.prefix + job.name
+            self.store.save(key + ":schedule", job.schedule.fingerprint())
+            self.store.save(key, int(next_run))
+
+    async def _restore(self):
+        loop = asyncio.get_running_loop()
+        now = time.time()
+        for job in self.jobs.values():
+            try:
+                saved, fingerprint = await loop.run_in_executor(None, self._load, job)
+            except Exception as e:
+                logger.error(f"Не вдалося прочитати час таймера {job.name}: {e}")
+                saved = 0
+            else:
+                if saved and fingerprint != job.schedule.fingerprint():
+                    # Розклад змінився після збереження — старий час запуску до нього не стосується
+                    logger.info(f"Розклад таймера {job.name} змінено, збережений час відкинуто")
+                    saved = 0
+            # Пропущений під час простою запуск виконується одразу, але лише раз
+            self._push(job, saved if saved else self._next_run(job, now))
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        await self._restore()
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                now = time.time()
+                if not self._heap or self._heap[0][0] > now:
+                    delay = self._heap[0][0] - now if self._heap else self.max_sleep
+                    # Сон обмежено, щоб переведення годинника не зсунуло розклад надовго
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, self.max_sleep))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                due, _, job = heapq.heappop(self._heap)
+                next_run = self._next_run(job, max(due, now))
+                self._push(job, next_run)
+                self._fire(job)
+                try:
+                    await loop.run_in_executor(None, self._save, job, next_run)
+                except Exception as e:
+                    logger.error(f"Не вдалося зберегти час таймера {job.name}: {e}")
+        finally:
+            self._wakeup = None
+            self._heap.clear()
+
+    def _fire(self, job):
+        if job.task is not None and not job.task.done():
+            logger.warning(f"Таймер {job.name} ще виконується, запуск пропущено")
+            return
+        job.task = asyncio.create_task(self._run_job(job))
+        self._running.add(job.task)
+        job.task.add_done_callback(self._running.discard)
+
+    async def _run_job(self, job):
+        try:
+            await job.func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Помилка в таймері {job.name}: {e}")
+
+    async def close(self):
+        tasks = list(self._running)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+class LogicWatcher:
+    def __init__(self, condition, func, range=None, audit=1, timeout=30, coalesce=True):
+        self.condition = condition
+        self.func = func
+        self.range = audit if range is None else range
+        self.audit = audit
+        self.timeout = timeout
+        self.coalesce = coalesce
+        self.name = getattr(func, "__qualname__", repr(func))
+        self.skipped = 0
+
+    async def _check(self):
+        try:
+            return await asyncio.wait_for(self.condition(), self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Умова {self.name} не відповіла за {self.timeout} с")
+        except Exception as e:
+            logger.exception(f"Помилка в умові {self.name}: {e}")
+        return False
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        while True:
+            delay = self.audit
+            if await self._check():
+                try:
+                    await self.func()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.exception(f"Помилка в обробнику {self.name}: {e}")
+                delay = self.range
+            # Власний ритм: відлік від запланованого моменту, а не від кінця перевірки
+            next_at += delay
+            now = loop.time()
+            if next_at < now and self.coalesce and delay > 0:
+                # Умова повільніша за інтервал — пропущені перевірки зливаються в одну
+                missed = int((now - next_at) // delay) + 1
+                self.skipped += missed
+                next_at += missed * delay
+            await asyncio.sleep(max(0.0, next_at - now))
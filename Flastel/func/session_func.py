@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+def create_connector(limit=100, limit_per_host=0, dns_cache_ttl=300, keepalive_timeout=30):
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=dns_cache_ttl,
+        keepalive_timeout=keepalive_timeout,
+    )
+
+class SessionManager:
+    def __init__(self, connector_limit=100, dns_cache_ttl=300, keepalive_timeout=30, connector=None, session=None):
+        self.connector_limit = connector_limit
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.connector = connector
+        self.session = session
+        # Чужу сесію/конектор (наприклад, спільні для кількох ботів) не закриваємо
+        self.owner = session is None
+        self.connector_owner = connector is None
+        self._lock = None
+
+    @property
+    def closed(self):
+        return self.session is None or self.session.closed
+
+    async def open(self):
+        if not self.closed:
+            return self.session
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.closed:
+                connector = self.connector
+                if connector is None or connector.closed:
+                    connector = create_connector(
+                        limit=self.connector_limit,
+                        dns_cache_ttl=self.dns_cache_ttl,
+                        keepalive_timeout=self.keepalive_timeout,
+                    )
+                    self.connector_owner = True
+                self.session = aiohttp.ClientSession(
+                    connector=connector,
+                    connector_owner=self.connector_owner,
+                )
+                self.owner = True
+                logger.debug(f"HTTP сесію відкрито (limit={self.connector_limit}, dns_ttl={self.dns_cache_ttl})")
+        return self.session
+
+    async def get(self):
+        if self.closed:
+            return await self.open()
+        return self.session
+
+    async def close(self):
+        session, self.session = self.session, None
+        if session is not None and self.owner and not session.closed:
+            await session.close()
+            logger.debug("HTTP сесію закрито")
@@ -0,0 +1,443 @@
+import os
+import time
+import atexit
+import signal
+import asyncio
+import logging
+import importlib
+import threading
+import multiprocessing
+from .session_func import SessionManager
+from .dispatch_func import UpdateDispatcher
+from .checkpoint_func import OffsetCheckpointer
+
+logger = logging.getLogger(__name__)
+
+def load_target(path):
+    # "package.module:bot" -> бот або BotHost, створений під час імпорту модуля
+    module, _, attr = path.partition(":")
+    obj = importlib.import_module(module)
+    for name in (attr or "bot").split("."):
+        obj = getattr(obj, name)
+    return obj
+
+def target_bots(obj):
+    if isinstance(obj, (list, tuple)):
+        return list(obj)
+    return list(obj.bots) if hasattr(obj, "polling_bots") else [obj]
+
+def bot_id(bot):
+    return bot.bot_token.split(':')[0]
+
+def _reader(conn, loop, receive):
+    # conn.recv() блокує, тож читаємо в окремому потоці й передаємо в цикл подій
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            message = None
+        try:
+            loop.call_soon_threadsafe(receive, message)
+        except RuntimeError:
+            return
+        if message is None:
+            return
+
+class _ShardWorker:
+    def __init__(self, conn, bots, index, processes, workers, max_pending):
+        self.conn = conn
+        self.bots = {bot_id(bot): bot for bot in bots}
+        self.index = index
+        self.processes = processes
+        self.dispatcher = UpdateDispatcher(workers=workers, max_pending=max_pending)
+        self._acks = []
+        self._stopped = None
+        self._loop = None
+
+    def _prepare(self, bot, sessions, limiters):
+        # Після fork у воркері лишилися копії сесії, черги й потоків батьківського процесу
+        old = bot.http
+        http = sessions.get(id(old))
+        if http is None:
+            http = sessions[id(old)] = SessionManager(connector_limit=old.connector_limit, dns_cache_ttl=old.dns_cache_ttl,
+                                                      keepalive_timeout=old.keepalive_timeout)
+        bot.http = http
+        bot.dispatcher = self.dispatcher
+        bot.watchdog = None
+        # offset веде лише батьківський процес; порожній checkpointer воркера нічого не запише
+        old = bot.checkpointer
+        bot.checkpointer = OffsetCheckpointer(old.store, key=old.key, interval=old.interval, every=old.every)
+        if bot.outbox is not None:
+            bot.outbox.after_fork()
+        bucket = getattr(bot.limiter, "global_bucket", None)
+        if bucket is not None and id(bot.limiter) not in limiters:
+            # Чати поділені між процесами, а загальний ліміт бота — ні
+            limiters.add(id(bot.limiter))
+            bucket.rate /= self.processes
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self.dispatcher.start()
+        sessions = {}
+        limiters = set()
+        for bot in self.bots.values():
+            self._prepare(bot, sessions, limiters)
+        for bot in self.bots.values():
+            try:
+                await bot.identify()
+            except Exception as e:
+                logger.warning(f"Шард {self.index}: не вдалося отримати getMe: {e}")
+        threading.Thread(target=_reader, args=(self.conn, self._loop, self._receive), daemon=True).start()
+        await self._stopped.wait()
+        await self.dispatcher.close()
+        self._flush()
+        for http in sessions.values():
+            await http.close()
+
+    def _receive(self, message):
+        if message is None:
+            self._stopped.set()
+            return
+        for seq, bot, name, args, key in message:
+            if not self.dispatcher.submit_nowait(key, self._run, seq, bot, name, args, group=bot):
+                logger.error(f"Шард {self.index}: черга переповнена, оновлення {seq} пропущено")
+                self._ack(seq)
+
+    async def _run(self, seq, bot, name, args):
+        try:
+            target = self.bots.get(bot)
+            if target is None:
+                logger.error(f"Шард {self.index}: бот {bot} не зареєстрований у воркері")
+            else:
+                await getattr(target, name)(*args)
+        finally:
+            self._ack(seq)
+
+    def _ack(self, seq):
+        self._acks.append(seq)
+        if len(self._acks) == 1:
+            # Підтвердження за одну ітерацію циклу йдуть одним повідомленням
+            self._loop.call_soon(self._flush)
+
+    def _flush(self):
+        acks, self._acks = self._acks, []
+        if acks:
+            try:
+                self.conn.send(acks)
+            except OSError as e:
+                logger.error(f"Шард {self.index}: батьківський процес недоступний: {e}")
+
+def _worker_main(conn, target, index, processes, workers, max_pending, inherited=()):
+    # Ctrl+C отримує вся група процесів; зупинкою воркерів керує батьківський процес
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for other in inherited:
+        other.close()
+    if isinstance(target, str):
+        target = load_target(target)
+    worker = _ShardWorker(conn, target_bots(target), index, processes, workers, max_pending)
+    asyncio.run(worker.run())
+
+def _template_main(control, bots, processes, workers, max_pending, inherited=()):
+    # Копія батьківського процесу до відкриття сесій і запуску потоків; усі воркери форкаються з неї,
+    # тож і перезапущений воркер не успадкує живих з'єднань, пулів і checkpointer
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for other in inherited:
+        other.close()
+    context = multiprocessing.get_context("fork")
+    children = {}
+    timeout = 0.0
+    while True:
+        try:
+            request = control.recv()
+        except (EOFError, OSError):
+            # Батьківський процес завершився без close()
+            break
+        if request[0] == "stop":
+            timeout = request[1]
+            break
+        _, index, conn = request
+        process = context.Process(target=_worker_main, name=f"flastel-shard-{index}", daemon=True,
+                                  args=(conn, bots, index, processes, workers, max_pending, (control,)))
+        process.start()
+        conn.close()
+        children[index] = process
+        # Прибирає завершені процеси, які вже замінено
+        multiprocessing.active_children()
+    deadline = time.monotonic() + timeout
+    for index, process in children.items():
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            logger.warning(f"Шард {index}: не завершився за {timeout} с, зупиняємо примусово")
+            process.terminate()
+            process.join()
+
+class _Shard:
+    __slots__ = ("index", "process", "conn", "outgoing", "in_flight", "reader")
+
+    def __init__(self, index):
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.outgoing = []
+        self.in_flight = set()
+        self.reader = None
+
+class ShardedDispatcher:
+    def __init__(self, processes=None, workers=8, max_pending=1000, group_pending=None, target=None, start_method=None):
+        self.processes = processes or os.cpu_count() or 1
+        # workers — паралельні обробники всередині кожного процесу
+        self.workers = workers
+        self.max_pending = max_pending
+        self.group_pending = group_pending
+        # Для spawn воркер імпортує ботів сам: "module:attr"; fork успадковує їх від батьківського процесу
+        self.target = target
+        if start_method is None:
+            start_method = "fork" if target is None and "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        if start_method != "fork" and target is None:
+            raise ValueError("Для start_method='spawn' потрібен target='module:attr'")
+        self.start_method = start_method
+        self.pending = 0
+        self.restarts = 0
+        self.bots = {}
+        self._groups = {}
+        self._in_flight = {}
+        self._shards = []
+        self._seq = 0
+        self._next = 0
+        self._flush_handle = None
+        self._loop = None
+        self._space = None
+        self._idle = None
+        self._closing = False
+        self._template = None
+        self._control = None
+
+    @property
+    def started(self):
+        return bool(self._shards)
+
+    def attach(self, bot):
+        # Бота треба зареєструвати до start(): fork копіює лише тих, хто вже є
+        self.bots[bot_id(bot)] = bot
+        bot.dispatcher = self
+        if bot.outbox is not None and bot.outbox.poll_interval is None:
+            # Воркери пишуть у outbox напряму, а доставляє батьківський процес
+            bot.outbox.poll_interval = 1.0
+        return bot
+
+    def _start_template(self):
+        context = multiprocessing.get_context("fork")
+        control, child_control = context.Pipe()
+        # Не daemon: daemon-процес не може мати дочірніх
+        self._template = context.Process(
+            target=_template_main, name="flastel-shard-template",
+            args=(child_control, list(self.bots.values()), self.processes, self.workers, self.max_pending, (control,)),
+        )
+        self._template.start()
+        child_control.close()
+        self._control = control
+        # multiprocessing при виході чекає не-daemon процеси; без цього шаблон чекав би команди вічно
+        atexit.register(control.close)
+
+    def _spawn(self, shard):
+        context = multiprocessing.get_context(self.start_method)
+        parent_conn, child_conn = context.Pipe()
+        process = None
+        if self._template is not None:
+            try:
+                self._control.send(("spawn", shard.index, child_conn))
+            except OSError as e:
+                logger.error(f"Шард {shard.index}: процес-шаблон недоступний, воркер не запущено: {e}")
+                child_conn.close()
+                parent_conn.close()
+                shard.conn = None
+                return
+        else:
+            process = context.Process(
+                target=_worker_main, name=f"flastel-shard-{shard.index}", daemon=True,
+                args=(child_conn, self.target, shard.index, self.processes, self.workers, self.max_pending),
+            )
+            process.start()
+        # Інакше EOF не прийде, коли воркер завершиться
+        child_conn.close()
+        shard.process = process
+        shard.conn = parent_conn
+        shard.reader = threading.Thread(target=_reader, args=(parent_conn, self._loop, lambda message: self._receive(shard, message)),
+                                        name=f"flastel-shard-reader-{shard.index}", daemon=True)
+        shard.reader.start()
+
+    def start(self):
+        if self._shards:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closing = False
+        self._shards = [_Shard(index) for index in range(self.processes)]
+        if self.start_method == "fork":
+            self._start_template()
+        for shard in self._shards:
+            self._spawn(shard)
+        logger.info(f"Запущено {self.processes} процесів-шардів ({self.start_method})")
+
+    @property
+    def full(self):
+        return self.pending >= self.max_pending
+
+    def has_space(self, group=None):
+        if self.pending >= self.max_pending:
+            return False
+        if self.group_pending is not None and self._groups.get(group, 0) >= self.group_pending:
+            return False
+        return True
+
+    def depth(self, group=None):
+        if group is None:
+            return self.pending
+        return self._groups.get(group, 0)
+
+    async def submit(self, key, func, *args, group=None):
+        while not self.has_space(group):
+            self._space.clear()
+            await self._space.wait()
+        self._enqueue(key, func, args, group)
+
+    def submit_nowait(self, key, func, *args, group=None):
+        if not self.has_space(group):
+            return False
+        self._enqueue(key, func, args, group)
+        return True
+
+    def shard_for(self, key):
+        if key is None:
+            # Без чату порядок не важливий — розкладаємо по колу
+            self._next = (self._next + 1) % len(self._shards)
+            return self._shards[self._next]
+        # Той самий чат завжди в тому самому процесі, тож порядок у чаті зберігається
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _enqueue(self, key, func, args, group):
+        self._seq += 1
+        shard = self.shard_for(key)
+        self._in_flight[self._seq] = (shard, group, args)
+        shard.in_flight.add(self._seq)
+        # Функцію не передати між процесами — воркер викликає однойменний метод своєї копії бота
+        name = func.__name__
+        if name == "_run_update":
+            # offset фіксує _complete батьківського процесу, воркер лише обробляє оновлення
+            name = "process_update"
+        shard.outgoing.append((self._seq, bot_id(group), name, args, key))
+        self._groups[group] = self._groups.get(group, 0) + 1
+        self.pending += 1
+        self._idle.clear()
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_soon(self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        for shard in self._shards:
+            if shard.outgoing:
+                batch, shard.outgoing = shard.outgoing, []
+                if shard.conn is None:
+                    # Воркер не вдалося перезапустити: як і при падінні, оновлення вважаються обробленими
+                    logger.error(f"Шард {shard.index}: воркера немає, пропущено {len(batch)} оновлень")
+                    for entry in batch:
+                        self._complete(entry[0])
+                    continue
+                try:
+                    shard.conn.send(batch)
+                except OSError as e:
+                    # Оновлення лишаються в in_flight і завершаться, коли reader побачить EOF
+                    logger.error(f"Шард {shard.index}: не вдалося передати {len(batch)} оновлень: {e}")
+
+    def _complete(self, seq):
+        entry = self._in_flight.pop(seq, None)
+        if entry is None:
+            return
+        shard, group, args = entry
+        shard.in_flight.discard(seq)
+        # Обробник відпрацював у воркері; offset фіксує checkpointer батьківського процесу
+        group.checkpointer.done(args[0]["update_id"])
+        count = self._groups[group] - 1
+        if count:
+            self._groups[group] = count
+        else:
+            del self._groups[group]
+        self.pending -= 1
+        self._space.set()
+        if not self.pending:
+            self._idle.set()
+
+    def _receive(self, shard, message):
+        if message is None:
+            self._on_exit(shard)
+            return
+        for seq in message:
+            self._complete(seq)
+
+    def _on_exit(self, shard):
+        if self._closing:
+            return
+        lost = list(shard.in_flight)
+        logger.error(f"Шард {shard.index}: процес несподівано завершився, втрачено {len(lost)} оновлень; перезапуск")
+        # Як і помилка в обробнику: оновлення вважаються обробленими, щоб offset не застряг
+        for seq in lost:
+            self._complete(seq)
+        shard.conn.close()
+        shard.conn = None
+        self.restarts += 1
+        self._spawn(shard)
+
+    async def join(self):
+        if self._idle is not None:
+            await self._idle.wait()
+
+    def _stop_processes(self, shards, timeout):
+        deadline = time.monotonic() + timeout
+        template, self._template = self._template, None
+        if template is not None:
+            control, self._control = self._control, None
+            atexit.unregister(control.close)
+            try:
+                # Воркери — дочірні процеси шаблону, тож чекає їх і зупиняє він
+                control.send(("stop", timeout))
+            except OSError:
+                pass
+            template.join(timeout + 5.0)
+            if template.is_alive():
+                template.terminate()
+                template.join()
+            control.close()
+        for shard in shards:
+            if shard.process is not None:
+                shard.process.join(max(0.0, deadline - time.monotonic()))
+                if shard.process.is_alive():
+                    logger.warning(f"Шард {shard.index}: не завершився за {timeout} с, зупиняємо примусово")
+                    shard.process.terminate()
+                    shard.process.join()
+            if shard.reader is not None:
+                shard.reader.join()
+            if shard.conn is not None:
+                shard.conn.close()
+
+    async def close(self, wait=True, timeout=30.0):
+        if wait:
+            await self.join()
+        if not self._shards:
+            return
+        self._closing = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush()
+        shards, self._shards = self._shards, []
+        for shard in shards:
+            if shard.conn is None:
+                continue
+            try:
+                shard.conn.send(None)
+            except OSError:
+                pass
+        await self._loop.run_in_executor(None, self._stop_processes, shards, timeout)
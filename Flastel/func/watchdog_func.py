@@ -0,0 +1,101 @@
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from .metrics_func import registry, get_lag_monitor
+
+logger = logging.getLogger(__name__)
+
+def coroutine_stack(coro):
+    # Task.get_stack() для призупиненої корутини дає лише один кадр, тож йдемо ланцюжком await
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append((frame, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return "".join(traceback.StackSummary.extract(frames).format())
+
+class LoopWatchdog:
+    def __init__(self, stall_threshold=0.5, slow_handler=1.0, registry=registry):
+        self.stall_threshold = stall_threshold
+        self.slow_handler = slow_handler
+        self.monitor = get_lag_monitor()
+        self.stalls = registry.counter("flastel_loop_stalls_total", "Блокування циклу подій")
+        self.stall_seconds = registry.histogram("flastel_loop_stall_seconds", "Тривалість блокувань циклу подій",
+                                                buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+        self.slow_handlers = registry.counter("flastel_slow_handlers_total", "Обробники, довші за поріг",
+                                              ("handler",))
+        self.users = 0
+        self._loop = None
+        self._loop_thread = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        self.users += 1
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self.monitor.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="flastel-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        self.users -= 1
+        if self.users > 0 or self._thread is None:
+            return
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        await self._loop.run_in_executor(None, thread.join)
+        await self.monitor.stop()
+
+    def _loop_stack(self):
+        frame = sys._current_frames().get(self._loop_thread)
+        return "".join(traceback.format_stack(frame)) if frame is not None else ""
+
+    def _run(self):
+        # Окремий потік: помічає, що цикл подій не відповідає, навіть коли той повністю заблокований
+        stall_after = self.monitor.interval + self.stall_threshold
+        stalled = 0.0
+        while not self._stop.wait(self.monitor.interval):
+            age = time.monotonic() - self.monitor.beat
+            if age > stall_after:
+                if not stalled:
+                    self.stalls.inc()
+                    logger.warning(f"Цикл подій заблоковано вже {age:.2f} с, стек:\n{self._loop_stack()}")
+                stalled = age
+            elif stalled:
+                self.stall_seconds.observe(stalled)
+                logger.warning(f"Цикл подій відновився після блокування ~{stalled:.2f} с")
+                stalled = 0.0
+
+    def watch(self, name):
+        task = asyncio.current_task()
+        return self._loop.call_later(self.slow_handler, self._report_slow, name, task)
+
+    def finish(self, handle, name, elapsed):
+        handle.cancel()
+        if elapsed >= self.slow_handler:
+            self.slow_handlers.inc(handler=name)
+            logger.warning(f"Обробник {name} виконувався {elapsed:.2f} с")
+
+    def _report_slow(self, name, task):
+        if task is None or task.done():
+            return
+        stack = coroutine_stack(task.get_coro())
+        logger.warning(f"Обробник {name} виконується довше за {self.slow_handler} с, стек:\n{stack}")
+
+_watchdog = None
+
+def get_watchdog():
+    # Один потік-сторож на процес, навіть якщо ботів кілька
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = LoopWatchdog()
+    return _watchdog
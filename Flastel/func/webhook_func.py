@@ -1,7 +1,19 @@
+import hmac
+import asyncio
 import logging
+import secrets
 import aiohttp
-import json
+from aiohttp import web
 from types import SimpleNamespace
+from .codec_func import codec, JSON_HEADERS, DECODE_ERRORS
+from .media_func import FileIdCache, send_media
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# Токен для функцій надсилання нижче: webhook_func.bot_token = "..."
+bot_token = None
+api_base = "https://api.telegram.org"
+file_id_cache = FileIdCache()
 
 def keyboard_create(callback=None, reply_keyboard=None):
     reply_markup = None
@@ -23,19 +35,23 @@ def keyboard_create(callback=None, reply_keyboard=None):
 
     return reply_markup
 
-async def set_webhook(host, bot_token):
-    url = f"https://api.telegram.org/bot{token}/setWebhook"
-    webhook_url = f"{host}/{token}"
+async def set_webhook(host, bot_token, secret_token=None, server=None, allowed_updates=None):
+    url = f"{server or api_base}/bot{bot_token}/setWebhook"
+    webhook_url = f"{host}/{bot_token}"
 
     payload = {
         "url": webhook_url
     }
+    if secret_token:
+        payload["secret_token"] = secret_token
+    if allowed_updates is not None:
+        payload["allowed_updates"] = allowed_updates
 
     try:
         async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
+            async with session.post(url, data=codec.dumps(payload), headers=JSON_HEADERS) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = codec.loads(await response.read())
                     if data.get("ok"):
                         logging.info("Webhook set successfully.")
                         return data
@@ -50,7 +66,7 @@ async def set_webhook(host, bot_token):
         return None
 
 async def send_message(user_id, message_text, parse_mode=None, callback=None, reply_keyboard=None):
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    url = f"{api_base}/bot{bot_token}/sendMessage"
     reply_markup = keyboard_create(callback, reply_keyboard)
     payload = {
         "chat_id": user_id,
@@ -63,11 +79,10 @@ async def send_message(user_id, message_text, parse_mode=None, callback=None, re
     
     try:
         async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
+            async with session.post(url, data=codec.dumps(payload), headers=JSON_HEADERS) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    message = json.loads(json.dumps(data.get("result", {})), object_hook=lambda d: SimpleNamespace(**d))
-                    return message
+                    data = codec.loads_namespace(await response.read())
+                    return getattr(data, "result", SimpleNamespace())
                 else:
                     logging.error(f"Error: Received status code {response.status}")
                     return None
@@ -75,159 +90,43 @@ async def send_message(user_id, message_text, parse_mode=None, callback=None, re
         logging.error(f"Exception occurred: {str(e)}")
         return None
 
-async def send_photo(user_id, photo_path, caption=None, parse_mode=None, callback=None, reply_keyboard=None):
-    url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
-    
-    reply_markup = keyboard_create(callback, reply_keyboard)
-    payload = {
-        "chat_id": user_id,
+async def _send_media(method, field, user_id, path, caption=None, parse_mode=None, callback=None, reply_keyboard=None):
+    url = f"{api_base}/bot{bot_token}/{method}"
+
+    fields = {
+        "chat_id": str(user_id),
         "caption": caption,
-        "parse_mode": parse_mode
+        "parse_mode": parse_mode,
+        "reply_markup": keyboard_create(callback, reply_keyboard),
     }
 
-    if reply_markup:
-        payload["reply_markup"] = reply_markup
-
     try:
         async with aiohttp.ClientSession() as session:
-            with open(photo_path, 'rb') as photo:
-                form_data = aiohttp.FormData()
-                form_data.add_field('photo', photo, filename=photo_path)
-                form_data.add_field('chat_id', str(user_id))
-                if caption:
-                    form_data.add_field('caption', caption)
-                if parse_mode:
-                    form_data.add_field('parse_mode', parse_mode)
-
-                async with session.post(url, data=form_data) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        message = json.loads(json.dumps(data.get("result", {})), object_hook=lambda d: SimpleNamespace(**d))
-                        return message
-                    else:
-                        logging.error(f"Error: Received status code {response.status}")
-                        return None
+            status, data = await send_media(session, url, field, path, fields, file_id_cache,
+                                            cache_prefix=str(bot_token).split(":")[0])
+            if status == 200:
+                return getattr(data, "result", SimpleNamespace())
+            else:
+                logging.error(f"Error: Received status code {status}")
+                return None
     except Exception as e:
         logging.error(f"Exception occurred: {str(e)}")
         return None
 
+async def send_photo(user_id, photo_path, caption=None, parse_mode=None, callback=None, reply_keyboard=None):
+    return await _send_media("sendPhoto", "photo", user_id, photo_path, caption, parse_mode, callback, reply_keyboard)
 
 async def send_document(user_id, document_path, caption=None, parse_mode=None, callback=None, reply_keyboard=None):
-    url = f"https://api.telegram.org/bot{bot_token}/sendDocument"
-    
-    reply_markup = keyboard_create(callback, reply_keyboard)
-    payload = {
-        "chat_id": user_id,
-        "caption": caption,
-        "parse_mode": parse_mode
-    }
-
-    if reply_markup:
-        payload["reply_markup"] = reply_markup
-
-    try:
-        async with aiohttp.ClientSession() as session:
-            with open(document_path, 'rb') as document:
-                form_data = aiohttp.FormData()
-                form_data.add_field('document', document, filename=document_path)
-                form_data.add_field('chat_id', str(user_id))
-                if caption:
-                    form_data.add_field('caption', caption)
-                if parse_mode:
-                    form_data.add_field('parse_mode', parse_mode)
-
-                async with session.post(url, data=form_data) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        message = json.loads(json.dumps(data.get("result", {})), object_hook=lambda d: SimpleNamespace(**d))
-                        return message
-                    else:
-                        logging.error(f"Error: Received status code {response.status}")
-                        return None
-    except Exception as e:
-        logging.error(f"Exception occurred: {str(e)}")
-        return None
-
+    return await _send_media("sendDocument", "document", user_id, document_path, caption, parse_mode, callback, reply_keyboard)
 
 async def send_audio(user_id, audio_path, caption=None, parse_mode=None, callback=None, reply_keyboard=None):
-    url = f"https://api.telegram.org/bot{bot_token}/sendAudio"
-    
-    reply_markup = keyboard_create(callback, reply_keyboard)
-    payload = {
-        "chat_id": user_id,
-        "caption": caption,
-        "parse_mode": parse_mode
-    }
-
-    if reply_markup:
-        payload["reply_markup"] = reply_markup
-
-    try:
-        async with aiohttp.ClientSession() as session:
-            # Асинхронне відкриття та відправка аудіо файлу
-            with open(audio_path, 'rb') as audio:
-                form_data = aiohttp.FormData()
-                form_data.add_field('audio', audio, filename=audio_path)
-                form_data.add_field('chat_id', str(user_id))
-                if caption:
-                    form_data.add_field('caption', caption)
-                if parse_mode:
-                    form_data.add_field('parse_mode', parse_mode)
-
-                # Відправка запиту
-                async with session.post(url, data=form_data) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        message = json.loads(json.dumps(data.get("result", {})), object_hook=lambda d: SimpleNamespace(**d))
-                        return message
-                    else:
-                        logging.error(f"Error: Received status code {response.status}")
-                        return None
-    except Exception as e:
-        logging.error(f"Exception occurred: {str(e)}")
-        return None
-
+    return await _send_media("sendAudio", "audio", user_id, audio_path, caption, parse_mode, callback, reply_keyboard)
 
 async def send_video(user_id, video_path, caption=None, parse_mode=None, callback=None, reply_keyboard=None):
-    url = f"https://api.telegram.org/bot{bot_token}/sendVideo"
-    
-    reply_markup = keyboard_create(callback, reply_keyboard)
-    payload = {
-        "chat_id": user_id,
-        "caption": caption,
-        "parse_mode": parse_mode
-    }
-
-    if reply_markup:
-        payload["reply_markup"] = reply_markup
-
-    try:
-        async with aiohttp.ClientSession() as session:
-            # Асинхронне відкриття та відправка відео файлу
-            with open(video_path, 'rb') as video:
-                form_data = aiohttp.FormData()
-                form_data.add_field('video', video, filename=video_path)
-                form_data.add_field('chat_id', str(user_id))
-                if caption:
-                    form_data.add_field('caption', caption)
-                if parse_mode:
-                    form_data.add_field('parse_mode', parse_mode)
-
-                # Відправка запиту
-                async with session.post(url, data=form_data) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        message = json.loads(json.dumps(data.get("result", {})), object_hook=lambda d: SimpleNamespace(**d))
-                        return message
-                    else:
-                        logging.error(f"Error: Received status code {response.status}")
-                        return None
-    except Exception as e:
-        logging.error(f"Exception occurred: {str(e)}")
-        return None
+    return await _send_media("sendVideo", "video", user_id, video_path, caption, parse_mode, callback, reply_keyboard)
 
 async def send_invoice(user_id, title, description, payload, currency, prices, provider_token=None, photo_url=None, photo_size=None, photo_width=None, photo_height=None):
-    url = f"https://api.telegram.org/bot{bot_token}/sendInvoice"
+    url = f"{api_base}/bot{bot_token}/sendInvoice"
     
     description_original = description + " For support FlasTele."
     description = description_original
@@ -264,11 +163,10 @@ async def send_invoice(user_id, title, description, payload, currency, prices, p
 
     try:
         async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload_data) as response:
+            async with session.post(url, data=codec.dumps(payload_data), headers=JSON_HEADERS) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    invoice_data = json.loads(json.dumps(data.get("result", {})), object_hook=lambda d: SimpleNamespace(**d))
-                    return invoice_data
+                    data = codec.loads_namespace(await response.read())
+                    return getattr(data, "result", SimpleNamespace())
                 else:
                     logging.error(f"Error: Received status code {response.status}")
                     return None
@@ -276,3 +174,69 @@ async def send_invoice(user_id, title, description, payload, currency, prices, p
         logging.error(f"Exception occurred: {str(e)}")
         return None 
 #
+
+
+class WebhookServer:
+    def __init__(self, host="0.0.0.0", port=8080, base_url=None, path_prefix=""):
+        self.host = host
+        self.port = port
+        # Публічна адреса сайту; якщо задана — webhook реєструється автоматично
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.path_prefix = path_prefix.rstrip("/")
+        self.bots = {}
+        self.runner = None
+
+    def register(self, bot, secret_token=None):
+        # Сам секрет має сенс, лише коли webhook реєструє цей сервер: інакше Telegram про нього не знає
+        secret = secret_token or (secrets.token_urlsafe(32) if self.base_url else None)
+        self.bots[bot.bot_token] = (bot, secret)
+        return secret
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_post(f"{self.path_prefix}/{{token}}", self.handle_update)
+        return app
+
+    async def handle_update(self, request):
+        entry = self.bots.get(request.match_info["token"])
+        if entry is None:
+            return web.Response(status=404)
+        bot, secret = entry
+        if secret and not hmac.compare_digest(request.headers.get(SECRET_HEADER, ""), secret):
+            logging.warning("Webhook: невірний secret token")
+            return web.Response(status=403)
+        try:
+            update = codec.loads(await request.read())
+        except DECODE_ERRORS:
+            return web.Response(status=400)
+        # Та сама черга і ті самі політики, що й у polling; хендлери Telegram не чекає
+        await bot.feed_update(update)
+        return web.Response()
+
+    async def start(self):
+        for bot, secret in self.bots.values():
+            await bot.startup()
+            if self.base_url:
+                await bot.identify()
+                await set_webhook(f"{self.base_url}{self.path_prefix}", bot.bot_token, secret_token=secret,
+                                  server=bot.api_base, allowed_updates=bot.allowed_updates())
+        self.runner = web.AppRunner(self.make_app())
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        logging.info(f"Webhook сервер запущено на {self.host}:{self.port} ({len(self.bots)} ботів)")
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+        for bot, _ in self.bots.values():
+            await bot.shutdown()
+        await file_id_cache.flush()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
@@ -0,0 +1,63 @@
+import os
+import sys
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Flastel import TelegramPollingBot
+from Flastel.func.host_func import BotHost
+
+def make_bot(i):
+    bot = TelegramPollingBot(f"{100000 + i}:token")
+
+    @bot.command(commands=["/start"])
+    async def start_command(message):
+        await bot.send_message(message.chat_id, "hi")
+
+    @bot.message_photo()
+    async def photo(message):
+        pass
+
+    return bot
+
+async def standalone(n):
+    tracemalloc.start()
+    base = tracemalloc.take_snapshot()
+    bots = [make_bot(i) for i in range(n)]
+    for bot in bots:
+        await bot.startup()
+    used = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(base, "filename"))
+    tracemalloc.stop()
+    for bot in bots:
+        await bot.shutdown()
+    return used
+
+async def hosted(n):
+    tracemalloc.start()
+    base = tracemalloc.take_snapshot()
+    host = BotHost(webhook_host="127.0.0.1", webhook_port=0)
+    for i in range(n):
+        host.add_webhook(make_bot(i))
+    await host.start()
+    used = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(base, "filename"))
+    tracemalloc.stop()
+    await host.stop()
+    return used
+
+async def main():
+    parser = argparse.ArgumentParser(description="Пам'ять на одного додаткового бота")
+    parser.add_argument("--bots", type=int, default=50)
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp())
+
+    for name, scenario in (("standalone", standalone), ("BotHost", hosted)):
+        one = await scenario(1)
+        many = await scenario(args.bots)
+        per_bot = (many - one) / (args.bots - 1)
+        print(f"{name:>10}: {many / 1024:8.1f} KiB для {args.bots} ботів, {per_bot / 1024:6.1f} KiB на кожного додаткового")
+
+if __name__ == "__main__":
+    asyncio.run(main())
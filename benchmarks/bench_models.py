@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Flastel.func.polling_func import TelegramMessage
+from eager_models import TelegramMessage as EagerTelegramMessage
+
+def make_messages(n):
+    messages = []
+    for i in range(n):
+        chat = {"id": i % 1000, "type": "private", "first_name": "User"}
+        user = {"id": i % 1000, "is_bot": False, "first_name": "User", "last_name": "Test", "language_code": "uk"}
+        message = {"message_id": i, "date": 1700000000, "chat": chat, "from": user}
+        kind = i % 4
+        if kind == 0:
+            message["text"] = "/start"
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": 6}]
+        elif kind == 1:
+            message["text"] = "hello there"
+        elif kind == 2:
+            message["photo"] = [{"file_id": "a", "file_unique_id": "b", "width": 90, "height": 90}] * 3
+            message["caption"] = "photo"
+        else:
+            message["text"] = "reply"
+            message["reply_to_message"] = {"message_id": i - 1, "date": 1700000000, "chat": chat, "from": user, "text": "hi"}
+        messages.append(message)
+    return messages
+
+def parse(messages, model):
+    for data in messages:
+        message = model(data)
+        message.text
+        message.chat_id
+        message.from_user.all_name
+
+def measure(name, model, messages):
+    start = time.perf_counter()
+    parse(messages, model)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    kept = [model(data) for data in messages[:10000]]
+    for message in kept:
+        message.from_user.all_name
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {len(messages) / elapsed:,.0f} updates/s, {size / len(kept):,.0f} B per message")
+
+def main():
+    parser = argparse.ArgumentParser(description="Швидкість розбору TelegramMessage")
+    parser.add_argument("--updates", type=int, default=100000)
+    args = parser.parse_args()
+    messages = make_messages(args.updates)
+    # eager — моделі до переходу на LazyModel, lazy — поточні
+    measure("eager", EagerTelegramMessage, messages)
+    measure("lazy", TelegramMessage, messages)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import time
+import asyncio
+import argparse
+from aiohttp import web
+
+# Легка заміна api.telegram.org для бенчмарків: віддає синтетичні оновлення і приймає відправку
+MIX = ("command", "text", "photo", "callback", "pre_checkout", "payment")
+
+def make_update(update_id, kind, chats=1000):
+    chat_id = update_id % chats + 1
+    chat = {"id": chat_id, "type": "private", "first_name": "User"}
+    user = {"id": chat_id, "is_bot": False, "first_name": "User", "last_name": "Bench", "language_code": "uk"}
+    message = {"message_id": update_id, "date": int(time.time()), "chat": chat, "from": user}
+    if kind == "command":
+        message["text"] = "/start"
+        message["entities"] = [{"type": "bot_command", "offset": 0, "length": 6}]
+    elif kind == "text":
+        message["text"] = "hello there"
+    elif kind == "photo":
+        message["photo"] = [{"file_id": f"p{update_id}", "file_unique_id": f"u{update_id}", "width": 90, "height": 90}]
+        message["caption"] = "photo"
+    elif kind == "callback":
+        return {"update_id": update_id, "callback_query": {
+            "id": str(update_id), "from": user, "chat_instance": str(chat_id), "data": "page:1",
+            "message": dict(message, text="menu"),
+        }}
+    elif kind == "pre_checkout":
+        return {"update_id": update_id, "pre_checkout_query": {
+            "id": str(update_id), "from": user, "currency": "XTR", "total_amount": 10, "invoice_payload": "bench",
+        }}
+    elif kind == "payment":
+        message["successful_payment"] = {
+            "currency": "XTR", "total_amount": 10, "invoice_payload": "bench",
+            "telegram_payment_charge_id": f"c{update_id}", "provider_payment_charge_id": f"p{update_id}",
+        }
+    return {"update_id": update_id, "message": message}
+
+class FakeTelegramAPI:
+    def __init__(self, total=10000, batch=100, latency=0.0, mix=MIX, chats=1000):
+        self.total = total
+        self.batch = batch
+        self.latency = latency
+        self.mix = mix
+        self.chats = chats
+        self.sends = 0
+        self.calls = {}
+        self.first_send = None
+        self.last_send = None
+        self.runner = None
+        self.port = None
+
+    def updates(self, offset, limit):
+        start = max(offset, 1)
+        end = min(start + limit, self.total + 1)
+        sent_at = time.time()
+        result = []
+        for update_id in range(start, end):
+            update = make_update(update_id, self.mix[update_id % len(self.mix)], self.chats)
+            # Час видачі, щоб бенчмарк порахував затримку до кінця обробки
+            update["bench_sent_at"] = sent_at
+            result.append(update)
+        return result
+
+    async def handle(self, request):
+        method = request.match_info["method"]
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if method == "getUpdates":
+            query = await request.json() if request.can_read_body else request.query
+            offset = int(query.get("offset") or 0)
+            limit = min(int(query.get("limit") or self.batch), self.batch)
+            result = self.updates(offset, limit)
+            if not result:
+                # Оновлень більше немає — імітуємо коротке long polling очікування
+                await asyncio.sleep(0.1)
+            return web.json_response({"ok": True, "result": result})
+        if method == "getMe":
+            return web.json_response({"ok": True, "result": {
+                "id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot",
+                "can_join_groups": True, "can_read_all_group_messages": False, "supports_inline_queries": False,
+                "can_connect_to_business": False, "has_main_web_app": False,
+            }})
+        if request.can_read_body:
+            await request.read()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        now = time.perf_counter()
+        self.sends += 1
+        if self.first_send is None:
+            self.first_send = now
+        self.last_send = now
+        return web.json_response({"ok": True, "result": {"message_id": self.sends, "date": int(time.time()),
+                                                         "chat": {"id": 1, "type": "private"}}})
+
+    async def handle_stats(self, request):
+        elapsed = (self.last_send - self.first_send) if self.sends > 1 else 0.0
+        return web.json_response({"sends": self.sends, "sends_per_s": self.sends / elapsed if elapsed else 0.0,
+                                  "calls": self.calls})
+
+    async def handle_reset(self, request):
+        self.sends = 0
+        self.calls = {}
+        self.first_send = self.last_send = None
+        self.total = int(request.query.get("total", self.total))
+        return web.json_response({"ok": True})
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_get("/stats", self.handle_stats)
+        app.router.add_post("/reset", self.handle_reset)
+        app.router.add_route("*", "/bot{token}/{method}", self.handle)
+        return app
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.runner = web.AppRunner(self.make_app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{self.port}"
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+async def serve(args):
+    api = FakeTelegramAPI(total=args.updates, batch=args.batch, latency=args.latency)
+    base = await api.start(args.host, args.port)
+    print(base, flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Фейковий Telegram Bot API для бенчмарків")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--updates", type=int, default=10000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="затримка відповіді на sendMessage тощо, с")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
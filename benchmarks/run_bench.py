@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import logging
+import argparse
+import aiohttp
+import psutil
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from Flastel import TelegramPollingBot, WebhookServer
+from Flastel.func.checkpoint_func import FileCheckpointStore
+from Flastel.func.webhook_func import SECRET_HEADER
+from fake_api import MIX, make_update
+
+TOKEN = "123456:bench"
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def start_fake(updates, latency):
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.join(BENCH_DIR, "fake_api.py"),
+        "--updates", str(updates), "--latency", str(latency),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    base = (await process.stdout.readline()).decode().strip()
+    return process, base
+
+async def fake_stats(session, base):
+    async with session.get(f"{base}/stats") as response:
+        return await response.json()
+
+def make_bot(api_base, checkpoint_path, args):
+    bot = TelegramPollingBot(TOKEN, api_base=api_base, rate_limit=args.rate_limit, workers=args.workers,
+                             max_pending=args.max_pending, checkpoint_store=FileCheckpointStore(checkpoint_path))
+
+    @bot.command(commands=["/start"])
+    async def start_command(message):
+        await bot.send_message(message.chat_id, "hi")
+
+    @bot.message_text()
+    async def echo(message):
+        await bot.send_message(message.chat_id, message.text)
+
+    @bot.message_photo()
+    async def photo(message):
+        pass
+
+    @bot.message_callback_query(["page:*"])
+    async def page(query):
+        pass
+
+    @bot.pay_pre(currency="XTR", prices=[10])
+    async def pre_checkout(query):
+        await bot.ok_pay(query)
+
+    @bot.successful_payment(currency="XTR", prices=[10])
+    async def payment(payment_data):
+        pass
+
+    return bot
+
+class Recorder:
+    def __init__(self, bot, total):
+        self.total = total
+        self.latencies = []
+        self.done = asyncio.Event()
+        self.first = None
+        self.last = None
+        process_update = bot.process_update
+
+        async def timed(update, offset=0):
+            try:
+                await process_update(update, offset)
+            finally:
+                now = time.time()
+                if self.first is None:
+                    self.first = time.perf_counter()
+                self.last = time.perf_counter()
+                self.latencies.append(now - update["bench_sent_at"])
+                if len(self.latencies) >= self.total:
+                    self.done.set()
+
+        # Обгортка над екземпляром: і polling, і webhook викликають self.process_update
+        bot.process_update = timed
+
+    def result(self):
+        elapsed = (self.last - self.first) if self.first is not None else 0.0
+        return {
+            "updates": len(self.latencies),
+            "updates_per_s": len(self.latencies) / elapsed if elapsed else 0.0,
+            "latency_p50_ms": percentile(self.latencies, 0.50) * 1000,
+            "latency_p99_ms": percentile(self.latencies, 0.99) * 1000,
+        }
+
+async def run_polling(args, base, checkpoint_path):
+    bot = make_bot(base, checkpoint_path, args)
+    recorder = Recorder(bot, args.updates)
+    task = asyncio.create_task(bot.run_polling())
+    await asyncio.wait_for(recorder.done.wait(), args.timeout)
+    bot.stop()
+    await asyncio.wait_for(task, args.timeout)
+    return recorder.result()
+
+async def post_updates(session, url, headers, queue):
+    while True:
+        update = await queue.get()
+        if update is None:
+            return
+        update["bench_sent_at"] = time.time()
+        while True:
+            async with session.post(url, json=update, headers=headers) as response:
+                if response.status != 503:
+                    break
+            # Черга бота переповнена — як і Telegram, повторюємо пізніше
+            await asyncio.sleep(0.005)
+
+async def run_webhook(args, base, checkpoint_path):
+    bot = make_bot(base, checkpoint_path, args)
+    recorder = Recorder(bot, args.updates)
+    port = free_port()
+    server = WebhookServer(host="127.0.0.1", port=port)
+    headers = {SECRET_HEADER: server.register(bot)}
+    await server.start()
+    queue = asyncio.Queue(maxsize=args.connections * 2)
+    url = f"http://127.0.0.1:{port}/{TOKEN}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            senders = [asyncio.create_task(post_updates(session, url, headers, queue)) for _ in range(args.connections)]
+            for update_id in range(1, args.updates + 1):
+                await queue.put(make_update(update_id, MIX[update_id % len(MIX)]))
+            for _ in senders:
+                await queue.put(None)
+            await asyncio.gather(*senders)
+            await asyncio.wait_for(recorder.done.wait(), args.timeout)
+    finally:
+        await server.stop()
+    return recorder.result()
+
+SCENARIOS = {"polling": run_polling, "webhook": run_webhook}
+
+async def run_scenario(name, args, checkpoint_path):
+    fake, base = await start_fake(args.updates, args.latency)
+    process = psutil.Process(os.getpid())
+    rss_before = process.memory_info().rss
+    try:
+        result = await SCENARIOS[name](args, base, checkpoint_path)
+        async with aiohttp.ClientSession() as session:
+            stats = await fake_stats(session, base)
+    finally:
+        fake.terminate()
+        await fake.wait()
+    rss_after = process.memory_info().rss
+    result["sends"] = stats["sends"]
+    result["sends_per_s"] = stats["sends_per_s"]
+    result["rss_per_10k_updates_kb"] = max(0, rss_after - rss_before) / 1024 / (args.updates / 10000)
+    return result
+
+def report(name, result):
+    print(f"{name:8} {result['updates_per_s']:10,.0f} upd/s | p50 {result['latency_p50_ms']:7.2f} ms | "
+          f"p99 {result['latency_p99_ms']:7.2f} ms | {result['sends_per_s']:9,.0f} sends/s | "
+          f"{result['rss_per_10k_updates_kb']:8,.0f} KiB RSS / 10k")
+
+async def main(args):
+    # Логи обробки кожного оновлення спотворили б вимірювання
+    logging.disable(logging.CRITICAL)
+    checkpoint_path = os.path.join(BENCH_DIR, ".bench_checkpoint.json")
+    results = {}
+    try:
+        for name in args.scenarios:
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+            results[name] = await run_scenario(name, args, checkpoint_path)
+            report(name, results[name])
+    finally:
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Бенчмарк Flastel з фейковим Bot API")
+    parser.add_argument("scenarios", nargs="*", help=f"{', '.join(SCENARIOS)}; за замовчуванням усі")
+    parser.add_argument("--updates", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.0, help="затримка фейкового API на відправку, с")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--max-pending", type=int, default=100)
+    parser.add_argument("--connections", type=int, default=32, help="паралельні webhook з'єднання")
+    parser.add_argument("--rate-limit", action="store_true", help="увімкнути ліміти Telegram на відправку")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--json", help="зберегти результати у файл для порівняння між релізами")
+    args = parser.parse_args()
+    args.scenarios = args.scenarios or list(SCENARIOS)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"невідомий сценарій: {name}")
+    return args
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
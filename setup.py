@@ -18,6 +18,10 @@ setup(
     'requests>=2.25.1',
     'aiohttp>=3.8.6'
   ],
+  extras_require={
+    'orjson': ['orjson>=3.6'],
+    'msgspec': ['msgspec>=0.18'],
+  },
   keywords='Telegram Bot API ',
   project_urls={
     'GitHub': 'https://github.com/DepyXa'
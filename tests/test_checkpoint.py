@@ -0,0 +1,42 @@
+import asyncio
+
+from Flastel.func.checkpoint_func import FileCheckpointStore, OffsetCheckpointer, SqliteCheckpointStore
+
+def test_offset_waits_for_oldest_unfinished_update(tmp_path):
+    async def scenario():
+        checkpointer = OffsetCheckpointer(FileCheckpointStore(str(tmp_path / "offset.json")))
+        for update_id in (10, 11, 12):
+            checkpointer.begin(update_id)
+        checkpointer.done(11)
+        checkpointer.done(12)
+        await checkpointer.flush()
+        # 10 ще обробляється — після перезапуску його треба отримати знову
+        assert checkpointer.committed == 10
+        checkpointer.done(10)
+        await checkpointer.close()
+        return checkpointer.committed
+
+    assert asyncio.run(scenario()) == 13
+
+def test_offset_restored_after_restart(tmp_path):
+    for store_factory in (lambda: FileCheckpointStore(str(tmp_path / "offset.json")),
+                          lambda: SqliteCheckpointStore(str(tmp_path / "offset.db"))):
+        async def run_once(update_ids):
+            checkpointer = OffsetCheckpointer(store_factory())
+            offset = await checkpointer.load_async()
+            for update_id in update_ids:
+                checkpointer.begin(update_id)
+                checkpointer.done(update_id)
+            await checkpointer.close()
+            return offset
+
+        assert asyncio.run(run_once([5, 6])) == 0
+        assert asyncio.run(run_once([7])) == 7
+        assert asyncio.run(run_once([])) == 8
+
+def test_file_store_keeps_other_keys(tmp_path):
+    path = str(tmp_path / "offset.json")
+    FileCheckpointStore(path).save("bot1", 5)
+    FileCheckpointStore(path).save("bot2", 9)
+    store = FileCheckpointStore(path)
+    assert (store.load("bot1"), store.load("bot2"), store.load("missing")) == (5, 9, 0)
@@ -0,0 +1,58 @@
+import asyncio
+
+from Flastel.func.dispatch_func import UpdateDispatcher, update_chat_key
+
+def test_same_chat_runs_in_order_other_chats_in_parallel():
+    async def scenario():
+        dispatcher = UpdateDispatcher(workers=4)
+        dispatcher.start()
+        log = []
+        running = {"now": 0, "max": 0}
+
+        async def handle(chat, n):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            log.append((chat, n, "start"))
+            await asyncio.sleep(0.01)
+            log.append((chat, n, "end"))
+            running["now"] -= 1
+
+        for n in range(3):
+            for chat in (1, 2):
+                await dispatcher.submit(chat, handle, chat, n)
+        await dispatcher.close()
+        return log, running["max"]
+
+    log, parallel = asyncio.run(scenario())
+    for chat in (1, 2):
+        events = [(n, stage) for c, n, stage in log if c == chat]
+        # Наступне оновлення чату починається лише після завершення попереднього
+        assert events == [(n, stage) for n in range(3) for stage in ("start", "end")]
+    assert parallel == 2
+
+def test_max_pending_applies_backpressure():
+    async def scenario():
+        dispatcher = UpdateDispatcher(workers=1, max_pending=2)
+        dispatcher.start()
+        release = asyncio.Event()
+
+        async def handle():
+            await release.wait()
+
+        assert dispatcher.submit_nowait(1, handle)
+        assert dispatcher.submit_nowait(2, handle)
+        assert not dispatcher.submit_nowait(3, handle)
+        blocked = asyncio.ensure_future(dispatcher.submit(3, handle))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        release.set()
+        await asyncio.wait_for(blocked, 1)
+        await dispatcher.close()
+        return dispatcher.pending
+
+    assert asyncio.run(scenario()) == 0
+
+def test_update_chat_key():
+    assert update_chat_key({"message": {"chat": {"id": 5}}}) == 5
+    assert update_chat_key({"callback_query": {"from": {"id": 7}, "message": {"chat": {"id": 9}}}}) == 9
+    assert update_chat_key({"inline_query": {"from": {"id": 7}}}) == 7
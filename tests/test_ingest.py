@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from Flastel import TelegramPollingBot
+from Flastel.func.checkpoint_func import FileCheckpointStore
+from Flastel.func.ingest_func import IngestQueue
+
+def message(update_id):
+    return {"update_id": update_id, "message": {"message_id": update_id, "chat": {"id": 1}}}
+
+def payment(update_id):
+    return {"update_id": update_id, "pre_checkout_query": {"id": str(update_id), "from": {"id": 1}}}
+
+def press(update_id, user=9, data="buy"):
+    return {"update_id": update_id, "callback_query": {"id": str(update_id), "from": {"id": user}, "data": data,
+                                                       "message": {"message_id": 5, "chat": {"id": 1}}}}
+
+async def collect(queue):
+    items = []
+    while queue.qsize():
+        items.append((await queue.get())["update_id"])
+        queue.task_done()
+    await queue.join()
+    return items
+
+def test_drop_oldest_keeps_payments():
+    dropped = []
+
+    async def scenario():
+        queue = IngestQueue(3, "drop_oldest", on_drop=lambda update, reason: dropped.append((update["update_id"], reason)))
+        for update in (payment(1), message(2), message(3), message(4), message(5)):
+            assert await queue.put(update)
+        return await collect(queue)
+
+    assert asyncio.run(scenario()) == [1, 4, 5]
+    assert dropped == [(2, "drop_oldest"), (3, "drop_oldest")]
+
+def test_coalesce_drops_repeated_press_until_taken():
+    dropped = []
+
+    async def scenario():
+        queue = IngestQueue(10, "coalesce", on_drop=lambda update, reason: dropped.append((update["update_id"], reason)))
+        assert await queue.put(press(1))
+        assert not await queue.put(press(2))
+        assert await queue.put(press(3, user=10))
+        assert await queue.put(press(4, data="sell"))
+        first = await queue.get()
+        queue.task_done()
+        # Натискання вже взяли в обробку — наступне знову приймається
+        assert await queue.put(press(5))
+        return [first["update_id"]] + await collect(queue), queue.coalesced
+
+    assert asyncio.run(scenario()) == ([1, 3, 4, 5], 1)
+    assert dropped == [(2, "coalesce")]
+
+def test_block_waits_for_space():
+    async def scenario():
+        queue = IngestQueue(1, "block")
+        await queue.put(message(1))
+        blocked = asyncio.ensure_future(queue.put(message(2)))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        await queue.get()
+        queue.task_done()
+        await asyncio.wait_for(blocked, 1)
+        return await collect(queue)
+
+    assert asyncio.run(scenario()) == [2]
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        IngestQueue(policy="drop_newest")
+
+def test_bot_answers_coalesced_callback(tmp_path):
+    bot = TelegramPollingBot("1:test", ingest_policy="coalesce",
+                             checkpoint_store=FileCheckpointStore(str(tmp_path / "offset.json")))
+    calls = []
+
+    async def api_request(method, payload=None, **kwargs):
+        calls.append((method, payload))
+        return 200, {"ok": True}
+
+    bot.api_request = api_request
+
+    async def scenario():
+        await bot.ingest.put(press(1))
+        await bot.ingest.put(press(2))
+        await asyncio.gather(*bot._answers)
+
+    asyncio.run(scenario())
+    assert calls == [("answerCallbackQuery", {"callback_query_id": "2"})]
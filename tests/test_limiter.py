@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from Flastel.func.limiter_func import SendScheduler, TokenBucket, parse_retry_after
+
+def test_bucket_waits_grow_with_each_reservation():
+    bucket = TokenBucket(rate=2, capacity=1)
+    now = bucket.updated
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == pytest.approx(0.5)
+    assert bucket.reserve(now) == pytest.approx(1.0)
+    # Через секунду обидва зарезервовані токени вже видано, новий чекає ще 0.5 с
+    assert bucket.reserve(now + 1) == pytest.approx(0.5)
+
+def test_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=1, capacity=3)
+    now = bucket.updated
+    for _ in range(3):
+        assert bucket.reserve(now) == 0
+    assert bucket.reserve(now + 10) == 0
+    assert bucket.tokens == pytest.approx(2)
+
+def test_retry_after_blocks_bucket():
+    bucket = TokenBucket(rate=1, capacity=1)
+    now = bucket.updated
+    bucket.block(5, now)
+    assert bucket.reserve(now) == pytest.approx(6)
+
+def test_scheduler_separates_chat_kinds():
+    scheduler = SendScheduler(private_rate=1, group_rate=0.5)
+    assert scheduler.bucket(42).rate == 1
+    assert scheduler.bucket(-100123).rate == 0.5
+    assert scheduler.bucket("@channel").rate == 0.5
+
+def test_scheduler_paces_one_chat_but_not_others():
+    async def scenario():
+        scheduler = SendScheduler(global_rate=1000, private_rate=20)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(scheduler.acquire(1) for _ in range(3)))
+        same_chat = loop.time() - start
+        start = loop.time()
+        await asyncio.gather(*(scheduler.acquire(chat) for chat in (2, 3, 4)))
+        return same_chat, loop.time() - start, scheduler.metrics()
+
+    same_chat, other_chats, metrics = asyncio.run(scenario())
+    assert same_chat >= 0.09
+    assert other_chats < 0.05
+    assert metrics["acquired"] == 6
+
+def test_parse_retry_after():
+    assert parse_retry_after({"ok": False, "parameters": {"retry_after": 3}}) == 3
+    assert parse_retry_after({"ok": False}) is None
@@ -0,0 +1,52 @@
+import asyncio
+
+from Flastel.func.outbox_func import SqliteOutbox
+
+class FakeBot:
+    bot_token = "5:test"
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+
+    async def api_request(self, method, payload=None, **kwargs):
+        if payload["text"] == "bad":
+            return 400, {"ok": False, "description": "Bad Request"}
+        if self.failures:
+            self.failures -= 1
+            return 502, {"ok": False, "description": "Bad Gateway"}
+        self.sent.append((payload["chat_id"], payload["text"]))
+        return 200, {"ok": True}
+
+async def drain(outbox, bot, seconds=0.5):
+    outbox.start(bot)
+    await asyncio.sleep(seconds)
+    await outbox.stop()
+    stats = outbox.stats()
+    outbox.close()
+    return stats
+
+def test_pending_messages_delivered_once_after_restart(tmp_path):
+    path = str(tmp_path / "outbox.db")
+
+    async def scenario():
+        # Процес упав до надсилання: записи лише в базі
+        outbox = SqliteOutbox(path, commit_delay=0)
+        bot = FakeBot()
+        for n in range(3):
+            await outbox.enqueue(bot, "sendMessage", {"chat_id": 1, "text": f"m{n}"})
+        await outbox.enqueue(bot, "sendMessage", {"chat_id": 1, "text": "once"}, key="k1")
+        await outbox.enqueue(bot, "sendMessage", {"chat_id": 1, "text": "once"}, key="k1")
+        await outbox.enqueue(bot, "sendMessage", {"chat_id": 2, "text": "bad"})
+        outbox.close()
+
+        bot = FakeBot(failures=2)
+        stats = await drain(SqliteOutbox(path, commit_delay=0, base_delay=0.01, max_delay=0.02), bot)
+        again = FakeBot()
+        await drain(SqliteOutbox(path, commit_delay=0), again, 0.1)
+        return bot.sent, stats, again.sent
+
+    sent, stats, resent = asyncio.run(scenario())
+    assert sent == [(1, "m0"), (1, "m1"), (1, "m2"), (1, "once")]
+    assert stats == {"pending": 0, "failed": 1, "sent": 4, "retried": 2}
+    assert resent == []
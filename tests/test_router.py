@@ -0,0 +1,67 @@
+from Flastel import TelegramPollingBot
+from Flastel.func.checkpoint_func import FileCheckpointStore
+from Flastel.func.router_func import CommandRouter, TextMatcher
+
+def make_bot(tmp_path):
+    return TelegramPollingBot("1:test", checkpoint_store=FileCheckpointStore(str(tmp_path / "offset.json")))
+
+def test_readme_start_registrations(tmp_path):
+    # Як у README: /start з caps_ignore=False і параметри з caps_ignore за замовчуванням
+    bot = make_bot(tmp_path)
+
+    @bot.command(commands=["/start"], caps_ignore=False)
+    async def start_command(message):
+        pass
+
+    @bot.command_with_params(commands=["/start"], params=["play", "say", "pay"])
+    async def start_command_with_params(message, params):
+        pass
+
+    assert bot.router.match("/start")[1:] == (start_command, [], False)
+    assert bot.router.match("/start play")[1:] == (start_command_with_params, ["play"], True)
+    assert bot.router.match("/start other")[1] is start_command
+    assert bot.router.match("/START play")[1] is start_command_with_params
+    assert bot.router.match("/START") is None
+
+def test_case_sensitive_params_keep_plain_handler():
+    router = CommandRouter()
+    plain = object()
+    with_params = object()
+    router.add_params("/go", ["fast"], with_params, case_sensitive=True)
+    router.add("/go", plain)
+    assert router.match("/go")[1] is plain
+    assert router.match("/GO slow")[1] is plain
+    assert router.match("/go fast")[1] is with_params
+
+def test_regex_leftmost_match_wins():
+    matcher = TextMatcher()
+    matcher.add("world", "world", mode="regex")
+    matcher.add("hello", "hello", mode="regex")
+    matcher.add("(?i)HELLO", "global flag", mode="regex")
+    matcher.add("hel", "hel", mode="regex")
+    assert matcher.match("hello world")[0] == "hello"
+    assert matcher.match("say world")[0] == "world"
+    assert matcher.match("help")[0] == "hel"
+
+def test_regex_many_patterns_keep_groups_and_backrefs():
+    matcher = TextMatcher()
+    for index in range(300):
+        matcher.add(rf"item{index}:(\d+)", index, mode="regex")
+    matcher.add(r"(\w)(\w)\2\1", "palindrome", mode="regex")
+    matcher.add(r"(?P<word>z+)-\1", "named", mode="regex", caps_ignore=True)
+    func, found = matcher.match("take item299:42")
+    assert (func, found.group(1)) == (299, "42")
+    func, found = matcher.match("abba")
+    assert (func, found.groups()) == ("palindrome", ("a", "b"))
+    func, found = matcher.match("ZZ-zz")
+    assert (func, found.group("word")) == ("named", "ZZ")
+    assert matcher.match("abab") is None
+
+def test_args_split_on_whitespace_by_default():
+    router = CommandRouter()
+    router.add("/path", "path")
+    router.add("/find", "find", quoted=True)
+    assert router.match(r'/path C:\Users\me "x y"')[2] == ["C:\\Users\\me", '"x', 'y"']
+    assert router.match('/find "new york" now')[2] == ["new york", "now"]
+    # Незакриті лапки — звичайний поділ по пробілах
+    assert router.match('/find "new york')[2] == ['"new', "york"]
@@ -0,0 +1,53 @@
+import os
+import asyncio
+import multiprocessing
+
+import pytest
+
+from Flastel import TelegramPollingBot
+from Flastel.func.checkpoint_func import FileCheckpointStore
+
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="потрібен fork")
+
+def message(update_id, text):
+    return {"update_id": update_id, "message": {"message_id": update_id, "date": 0, "text": text,
+                                                "chat": {"id": 1, "type": "private"},
+                                                "from": {"id": 1, "is_bot": False, "first_name": "U"}}}
+
+def test_crashed_shard_is_respawned(tmp_path):
+    log = tmp_path / "handled.txt"
+    died = tmp_path / "died"
+    bot = TelegramPollingBot("1:test", shards=1, rate_limit=False,
+                             checkpoint_store=FileCheckpointStore(str(tmp_path / "offset.json")))
+
+    @bot.message_text()
+    async def handle(message):
+        if message.text == "die" and not died.exists():
+            died.touch()
+            os._exit(1)
+        with open(log, "a") as f:
+            f.write(f"{message.text} {os.getpid()}\n")
+
+    async def scenario():
+        dispatcher = bot.dispatcher
+        dispatcher.start()
+        try:
+            for update_id, text in enumerate(("before", "die"), 1):
+                bot.checkpointer.begin(update_id)
+                await dispatcher.submit(1, bot._run_update, message(update_id, text), group=bot)
+            await asyncio.wait_for(dispatcher.join(), 10)
+            bot.checkpointer.begin(3)
+            await dispatcher.submit(1, bot._run_update, message(3, "after"), group=bot)
+            await asyncio.wait_for(dispatcher.join(), 10)
+        finally:
+            await dispatcher.close(wait=False)
+        return dispatcher.restarts, bot.checkpointer.offset
+
+    restarts, offset = asyncio.run(scenario())
+    handled = [line.split() for line in log.read_text().splitlines()]
+    assert restarts == 1
+    assert [text for text, _ in handled] == ["before", "after"]
+    # Новий воркер — інший процес
+    assert handled[0][1] != handled[1][1]
+    # Оновлення з упалого воркера вважається обробленим, offset не застряг
+    assert offset == 4